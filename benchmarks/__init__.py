@@ -0,0 +1,5 @@
+"""Performance benchmarks for SQL generation, fake data and storage.
+
+Run ``python -m benchmarks run`` to time the suite and
+``python -m benchmarks compare <baseline> <current>`` to flag regressions.
+"""
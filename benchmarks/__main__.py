@@ -0,0 +1,88 @@
+"""Command line entry point: ``python -m benchmarks {run,memory,compare}``."""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+# Allow running from the repository root without installing anything.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import memory, runner
+from benchmarks.cases import PROFILES
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="SQL Generator benchmark suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="Run the suite and write a JSON report")
+    run_p.add_argument("--profile", choices=PROFILES, default="quick")
+    run_p.add_argument("-k", "--filter", dest="pattern", help="Glob on case names, e.g. 'ddl.*'")
+    run_p.add_argument("--repeat", type=int, default=5)
+    run_p.add_argument("-o", "--output", help="Report path (default: stdout summary only)")
+    run_p.add_argument("--save-baseline", action="store_true", help="Store the report as the profile baseline")
+    run_p.add_argument("--compare", action="store_true", help="Compare against the stored profile baseline")
+    run_p.add_argument("--threshold", type=float, default=runner.DEFAULT_THRESHOLD)
+
+    mem_p = sub.add_parser("memory", help="Measure peak memory per 100k rows / MB of script against budgets")
+    mem_p.add_argument("--profile", choices=PROFILES, default="quick")
+    mem_p.add_argument("-k", "--filter", dest="pattern", help="Glob on case names, e.g. 'memory.faker*'")
+    mem_p.add_argument("-o", "--output", help="Report path")
+    mem_p.add_argument("--save-baseline", action="store_true", help="Store the report as the profile baseline")
+    mem_p.add_argument("--compare", action="store_true", help="Compare against the stored profile baseline")
+    mem_p.add_argument("--threshold", type=float, default=runner.DEFAULT_THRESHOLD)
+
+    cmp_p = sub.add_parser("compare", help="Compare two JSON reports and flag regressions")
+    cmp_p.add_argument("baseline")
+    cmp_p.add_argument("current")
+    cmp_p.add_argument("--threshold", type=float, default=runner.DEFAULT_THRESHOLD)
+    cmp_p.add_argument("--metric", help="Result field to compare (default: best_s, or peak_per_unit for memory reports)")
+
+    args = parser.parse_args(argv)
+
+    if args.command in ("run", "memory"):
+        if args.command == "run":
+            report = runner.run_suite(args.profile, args.pattern, repeat=args.repeat)
+        else:
+            report = memory.run_memory_suite(args.profile, args.pattern)
+        status = 0
+        if args.command == "memory":
+            failures = memory.budget_failures(report)
+            if failures:
+                print(f"\n{len(failures)} case(s) over memory budget.")
+                status = 1
+        if args.output:
+            runner.save_report(report, args.output)
+        if args.save_baseline:
+            runner.save_report(report, runner.default_baseline_path(args.profile, report["kind"]))
+        if args.compare:
+            baseline_path = runner.default_baseline_path(args.profile, report["kind"])
+            if not os.path.exists(baseline_path):
+                print(f"No baseline at {baseline_path}; run with --save-baseline first.")
+                return 2
+            status = max(status, _report_comparison(
+                runner.load_report(baseline_path), report, args.threshold, runner.default_metric(report)
+            ))
+        return status
+
+    current = runner.load_report(args.current)
+    return _report_comparison(
+        runner.load_report(args.baseline), current, args.threshold, args.metric or runner.default_metric(current)
+    )
+
+
+def _report_comparison(baseline: dict, current: dict, threshold: float, metric: str) -> int:
+    print(runner.format_comparison(baseline, current, metric))
+    regressions = runner.compare_reports(baseline, current, threshold, metric)
+    if not regressions:
+        print(f"\nNo regression above {threshold:.0%}.")
+        return 0
+    print(f"\n{len(regressions)} regression(s) above {threshold:.0%}:")
+    for reg in regressions:
+        print(f"  - {reg.name}: x{reg.ratio:.2f}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
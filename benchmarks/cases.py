@@ -0,0 +1,358 @@
+"""Benchmark case definitions, grouped into size profiles."""
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from benchmarks import fixtures
+from core import dbms_builders, models, rules
+
+PROFILES = ("quick", "full")
+
+# (tables, columns) pairs spanning 10 -> 10k tables and 5 -> 1000 columns.
+_SCHEMA_SIZES = {
+    "quick": [(10, 5), (100, 20), (10, 200)],
+    "full": [(10, 5), (100, 50), (1000, 20), (10000, 5), (10, 1000), (100, 1000)],
+}
+_INSERT_ROWS = {"quick": [1_000, 10_000], "full": [1_000, 10_000, 100_000, 1_000_000]}
+_FAKER_ROWS = {"quick": [100, 1_000], "full": [1_000, 10_000, 100_000]}
+_STORAGE_SIZES = {"quick": [(5, 1_000)], "full": [(5, 1_000), (20, 10_000), (10, 100_000)]}
+_SCRIPT_TABLES = {"quick": [10, 100], "full": [100, 1_000, 5_000]}
+_STORAGE_OPS = 200  # small calls per run for the ops/s cases
+
+
+@dataclass
+class BenchCase:
+    """A single timed operation. ``run`` receives whatever ``setup`` returned."""
+
+    name: str
+    setup: Callable[[], Any]
+    run: Callable[[Any], Any]
+    units: int = 1
+    unit_name: str = "op"
+    params: dict = field(default_factory=dict)
+    teardown: Callable[[Any], None] | None = None
+
+
+def build_cases(profile: str = "quick") -> list[BenchCase]:
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile '{profile}' (expected one of {', '.join(PROFILES)})")
+    cases: list[BenchCase] = []
+    cases.extend(_ddl_cases(profile))
+    cases.extend(_insert_cases(profile))
+    cases.extend(_faker_cases(profile))
+    cases.extend(_storage_cases(profile))
+    cases.extend(_storage_ops_cases())
+    cases.extend(_highlight_cases(profile))
+    return cases
+
+
+def _ddl_cases(profile: str) -> list[BenchCase]:
+    cases = []
+    for n_tables, n_columns in _SCHEMA_SIZES[profile]:
+        params = {"tables": n_tables, "columns": n_columns}
+        setup = lambda t=n_tables, c=n_columns: fixtures.make_project(t, c).tables
+
+        def run_create(tables):
+            for table in tables:
+                dbms_builders.build_create_table_statement(table, "sqlserver")
+
+        def run_crud(tables):
+            for table in tables:
+                dbms_builders.build_crud_procedures(table, "sqlserver", rules.CRUD_ACTIONS)
+
+        cases.append(BenchCase(
+            name=f"ddl.create_table[{n_tables}x{n_columns}]",
+            setup=setup, run=run_create, units=n_tables, unit_name="table", params=params,
+        ))
+        cases.append(BenchCase(
+            name=f"ddl.crud_procedures[{n_tables}x{n_columns}]",
+            setup=setup, run=run_crud, units=n_tables, unit_name="table", params=params,
+        ))
+    return cases
+
+
+def _insert_cases(profile: str) -> list[BenchCase]:
+    cases = []
+    for n_rows in _INSERT_ROWS[profile]:
+        def setup(n=n_rows):
+            state = _TempStorage()
+            from controllers.app_controller import AppController
+            state.controller = AppController(storage=state.storage)
+            state.table = fixtures.make_table("clients", 8, n)
+            return state
+
+        cases.append(BenchCase(
+            name=f"inserts.generate[{n_rows}]",
+            setup=setup,
+            run=lambda s: s.controller._generate_insert_statements(s.table, "sqlserver"),
+            units=n_rows, unit_name="row", params={"rows": n_rows},
+            teardown=lambda s: s.close(),
+        ))
+    return cases
+
+
+def _faker_cases(profile: str) -> list[BenchCase]:
+    try:
+        from core.fake_gen import FakeGenerator
+    except ImportError:
+        # Faker is optional for the benchmark suite; skip those cases.
+        return []
+
+    cases = []
+    for n_rows in _FAKER_ROWS[profile]:
+        def setup(n=n_rows):
+            return FakeGenerator(), fixtures.make_table("clients", 8), n
+
+        cases.append(BenchCase(
+            name=f"faker.generate_rows[{n_rows}]",
+            setup=setup,
+            run=lambda s: s[0].generate_rows(s[1], s[2]),
+            units=n_rows, unit_name="row", params={"rows": n_rows},
+        ))
+
+        def setup_unpooled(n=n_rows):
+            return FakeGenerator(pool_size=0), fixtures.make_table("clients", 8), n
+
+        # One Faker call per cell, for comparison with the pooled default
+        cases.append(BenchCase(
+            name=f"faker.generate_rows_unpooled[{n_rows}]",
+            setup=setup_unpooled,
+            run=lambda s: s[0].generate_rows(s[1], s[2]),
+            units=n_rows, unit_name="row", params={"rows": n_rows},
+        ))
+
+        def setup_numeric(n=n_rows):
+            return FakeGenerator(), _numeric_table(), n
+
+        # Columns that never call Faker: what is left is the per-cell overhead.
+        cases.append(BenchCase(
+            name=f"faker.generate_numeric[{n_rows}]",
+            setup=setup_numeric,
+            run=lambda s: s[0].generate_rows(s[1], s[2]),
+            units=n_rows, unit_name="row", params={"rows": n_rows},
+        ))
+    return cases
+
+
+def _numeric_table() -> models.TableModel:
+    columns = [
+        models.ColumnModel(name="id", sql_type="INT", nullable=False, is_primary_key=True, is_auto_increment=True),
+        models.ColumnModel(name="age", sql_type="INT"),
+        models.ColumnModel(name="annee", sql_type="INT"),
+        models.ColumnModel(name="quantite", sql_type="INT"),
+        models.ColumnModel(name="prix", sql_type="DECIMAL(18,2)"),
+        models.ColumnModel(name="remise", sql_type="FLOAT"),
+        models.ColumnModel(name="actif", sql_type="BIT"),
+        models.ColumnModel(name="cree_le", sql_type="DATETIME"),
+    ]
+    return models.TableModel(name="mesures", columns=columns)
+
+
+def _storage_cases(profile: str) -> list[BenchCase]:
+    cases = []
+    for n_tables, n_rows in _STORAGE_SIZES[profile]:
+        params = {"tables": n_tables, "rows_per_table": n_rows}
+
+        def setup_save(t=n_tables, r=n_rows):
+            state = _TempStorage()
+            state.project = fixtures.make_project(t, 8, r)
+            return state
+
+        def setup_load(t=n_tables, r=n_rows):
+            state = setup_save(t, r)
+            state.storage.save_project(state.project)
+            state.project_id = state.storage.list_projects()[0]["id"]
+            return state
+
+        def run_save(s):
+            # Forget the stored ids so every run is a full write, like a first save.
+            for table in s.project.tables:
+                table.storage_id = None
+            s.storage.save_project(s.project)
+
+        cases.append(BenchCase(
+            name=f"storage.save_project[{n_tables}x{n_rows}]",
+            setup=setup_save, run=run_save,
+            units=n_tables * n_rows, unit_name="row", params=params,
+            teardown=lambda s: s.close(),
+        ))
+        def setup_resave(t=n_tables, r=n_rows):
+            state = setup_save(t, r)
+            state.storage.save_project(state.project)
+            return state
+
+        def run_load(s):
+            project = s.storage.load_project(s.project_id)
+            for table in project.tables:
+                s.storage.load_rows(table)
+
+        def run_load_cold(s):
+            s.storage.project_cache.clear()
+            run_load(s)
+
+        def run_resave_one_row(s):
+            # Typical edit: one cell changed, then saved.
+            table = s.project.tables[0]
+            table.rows[0] = dict(table.rows[0])
+            table.mark_rows_changed(0, 1)
+            s.storage.save_project(s.project)
+
+        cases.append(BenchCase(
+            name=f"storage.load_project[{n_tables}x{n_rows}]",
+            setup=setup_load, run=run_load_cold,
+            units=n_tables * n_rows, unit_name="row", params=params,
+            teardown=lambda s: s.close(),
+        ))
+        cases.append(BenchCase(
+            name=f"storage.load_project_cached[{n_tables}x{n_rows}]",
+            setup=setup_load, run=run_load,
+            units=n_tables * n_rows, unit_name="row", params=params,
+            teardown=lambda s: s.close(),
+        ))
+        cases.append(BenchCase(
+            name=f"storage.open_project[{n_tables}x{n_rows}]",
+            setup=setup_load,
+            run=lambda s: s.storage.load_project(s.project_id),
+            units=n_tables, unit_name="table", params=params,
+            teardown=lambda s: s.close(),
+        ))
+        cases.append(BenchCase(
+            name=f"storage.save_one_row[{n_tables}x{n_rows}]",
+            setup=setup_resave, run=run_resave_one_row, params=params,
+            teardown=lambda s: s.close(),
+        ))
+    return cases
+
+
+def _storage_ops_cases() -> list[BenchCase]:
+    """Many small Storage calls, reported as ops/s (connection and statement overhead)."""
+
+    def setup():
+        state = _TempStorage()
+        state.storage.set_theme("Abyss")
+        state.storage.set_license_key("AAAA-BBBB-CCCC-DDDD-EEEE")
+        state.project = fixtures.make_project(1, 5)
+        return state
+
+    def run_get_theme(s):
+        for _ in range(_STORAGE_OPS):
+            s.storage.get_theme()
+
+    def run_get_license_key(s):
+        for _ in range(_STORAGE_OPS):
+            s.storage.get_license_key()
+
+    def run_set_theme(s):
+        for i in range(_STORAGE_OPS):
+            s.storage.set_theme("Abyss" if i % 2 else "Clair")
+
+    def run_add_history(s):
+        for i in range(_STORAGE_OPS):
+            s.storage.add_history("bench", f"SELECT {i};")
+
+    def run_save_small_project(s):
+        for _ in range(_STORAGE_OPS):
+            s.storage.save_project(s.project)
+
+    ops = [
+        ("storage.ops.get_theme", run_get_theme),
+        ("storage.ops.get_license_key", run_get_license_key),
+        ("storage.ops.set_theme", run_set_theme),
+        ("storage.ops.add_history", run_add_history),
+        ("storage.ops.save_small_project", run_save_small_project),
+    ]
+    return [
+        BenchCase(
+            name=name, setup=setup, run=run, units=_STORAGE_OPS, unit_name="op",
+            params={"ops": _STORAGE_OPS}, teardown=lambda s: s.close(),
+        )
+        for name, run in ops
+    ]
+
+
+def _highlight_cases(profile: str) -> list[BenchCase]:
+    from core.sql_highlight import highlight_ranges, highlight_spans
+
+    cases = []
+    for n_tables in _SCRIPT_TABLES[profile]:
+        def setup(t=n_tables):
+            state = _TempStorage()
+            from controllers.app_controller import AppController
+            controller = AppController(storage=state.storage)
+            controller.current_project = fixtures.make_project(t, 8, 20)
+            actions = ["Database", "Table", "Data (Inserts)"] + rules.CRUD_ACTIONS
+            state.script = controller.build_sql_artifacts(actions)
+            state.blocks = controller.build_sql_blocks(actions)
+            # Same script after editing one row of the middle table
+            table = controller.current_project.tables[t // 2]
+            table.rows[0] = {col.name: "edited" for col in table.columns}
+            state.edited_blocks = controller.build_sql_blocks(actions)
+            return state
+
+        cases.append(BenchCase(
+            name=f"preview.highlight_spans[{n_tables}]",
+            setup=setup,
+            run=lambda s: highlight_spans(s.script),
+            units=n_tables, unit_name="table", params={"tables": n_tables},
+            teardown=lambda s: s.close(),
+        ))
+        cases.append(BenchCase(
+            name=f"preview.index_document[{n_tables}]",
+            setup=setup,
+            run=_index_and_window,
+            units=n_tables, unit_name="table", params={"tables": n_tables},
+            teardown=lambda s: s.close(),
+        ))
+        cases.append(BenchCase(
+            name=f"preview.diff_document[{n_tables}]",
+            setup=setup,
+            run=_diff_and_patch,
+            units=n_tables, unit_name="table", params={"tables": n_tables},
+            teardown=lambda s: s.close(),
+        ))
+        cases.append(BenchCase(
+            name=f"preview.highlight_ranges[{n_tables}]",
+            setup=setup,
+            run=lambda s: highlight_ranges(s.script),
+            units=n_tables, unit_name="table", params={"tables": n_tables},
+            teardown=lambda s: s.close(),
+        ))
+    return cases
+
+
+def _index_and_window(state) -> None:
+    """What the virtual preview does per refresh: index the script, render one window."""
+    from core.preview_document import PreviewDocument
+    document = PreviewDocument.from_text(state.script)
+    middle = document.line_count // 2
+    document.lines(middle - 200, middle + 250)
+
+
+def _diff_and_patch(state) -> None:
+    """What a refresh after a one-row edit costs besides generation: diff the blocks, diff the window."""
+    from difflib import SequenceMatcher
+    from core.preview_document import PreviewDocument, map_line
+    old = PreviewDocument.from_blocks(state.blocks)
+    new = PreviewDocument.from_blocks(state.edited_blocks)
+    new.compare_with(old)
+    top = map_line(new.changes, old.line_count // 2)
+    SequenceMatcher(
+        None, old.lines(top - 200, top + 250).split("\n"), new.lines(top - 200, top + 250).split("\n"), autojunk=False
+    ).get_opcodes()
+
+
+class _TempStorage:
+    """Storage in a throwaway directory so benchmarks never touch the user database."""
+
+    def __init__(self) -> None:
+        from data.storage import Storage
+        self.tmp_dir = tempfile.mkdtemp(prefix="sqlgen_bench_")
+        self.storage = Storage(db_path=os.path.join(self.tmp_dir, "bench.db"))
+
+    def close(self) -> None:
+        self.storage.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
@@ -0,0 +1,56 @@
+"""Synthetic schemas and datasets used by the benchmark cases."""
+from __future__ import annotations
+
+from core import models
+
+# Cycled over the non-PK columns so every formatting branch gets exercised.
+_COLUMN_TEMPLATES: list[tuple[str, str]] = [
+    ("nom", "VARCHAR(100)"),
+    ("email", "VARCHAR(255)"),
+    ("age", "INT"),
+    ("prix", "DECIMAL(18,2)"),
+    ("actif", "BIT"),
+    ("date_creation", "DATETIME"),
+    ("description", "TEXT"),
+    ("ville", "VARCHAR(50)"),
+]
+
+_SAMPLE_VALUES: dict[str, str] = {
+    "VARCHAR(100)": "Dupont",
+    "VARCHAR(255)": "jean.dupont@example.com",
+    "INT": "42",
+    "DECIMAL(18,2)": "129.90",
+    "BIT": "1",
+    "DATETIME": "2026-01-15 10:30:00",
+    "TEXT": "Lorem ipsum dolor sit amet, l'exemple",
+    "VARCHAR(50)": "Paris",
+}
+
+
+def make_table(name: str, n_columns: int, n_rows: int = 0, *, fk_table: str | None = None) -> models.TableModel:
+    """Build a table with an auto-increment PK plus ``n_columns - 1`` typed columns."""
+    columns = [
+        models.ColumnModel(name="id", sql_type="INT", nullable=False, is_primary_key=True, is_auto_increment=True)
+    ]
+    for i in range(max(n_columns - 1, 0)):
+        base, sql_type = _COLUMN_TEMPLATES[i % len(_COLUMN_TEMPLATES)]
+        col_name = base if i < len(_COLUMN_TEMPLATES) else f"{base}_{i}"
+        columns.append(models.ColumnModel(name=col_name, sql_type=sql_type))
+    if fk_table and n_columns > 1:
+        columns[-1].foreign_key_table = fk_table
+        columns[-1].foreign_key_column = "id"
+
+    table = models.TableModel(name=name, columns=columns)
+    if n_rows:
+        template = {c.name: _SAMPLE_VALUES.get(c.sql_type, "x") for c in columns if not c.is_auto_increment}
+        table.rows = [dict(template) for _ in range(n_rows)]
+    return table
+
+
+def make_project(n_tables: int, n_columns: int, n_rows: int = 0, dbms: str = "SQL Server") -> models.DatabaseProject:
+    """Build a project of ``n_tables`` tables, each referencing the previous one."""
+    tables = []
+    for i in range(n_tables):
+        fk = tables[-1].name if tables else None
+        tables.append(make_table(f"table{i + 1}", n_columns, n_rows, fk_table=fk))
+    return models.DatabaseProject(database_name="bench_db", tables=tables, dbms=dbms)
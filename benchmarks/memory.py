@@ -0,0 +1,207 @@
+"""Memory budget cases measured with tracemalloc.
+
+Each case reports its peak allocation normalised per 100k rows or per MB of
+generated script, and fails when that figure exceeds ``budget_per_unit``.
+Reports share the JSON format of the timing suite so regressions are caught
+by the same comparator (metric ``peak_per_unit``).
+"""
+from __future__ import annotations
+
+import fnmatch
+import gc
+import platform
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable
+
+from benchmarks import fixtures
+from benchmarks.cases import _TempStorage
+from core import models, rules
+from core.sql_highlight import highlight_spans
+
+ROWS_UNIT = 100_000
+MB = 1024 * 1024
+
+_ROW_COUNTS = {"quick": [20_000], "full": [100_000, 500_000]}
+_SCRIPT_TABLES = {"quick": [50], "full": [200, 1_000]}
+
+# Bytes allowed per unit, measured on CPython 3.11 with ~1.5x headroom.
+BUDGETS = {
+    "memory.table_rows": 100 * MB,        # per 100k rows of 8 columns
+    "memory.faker_rows": 100 * MB,        # per 100k rows of 8 columns
+    "memory.insert_script": 6 * MB,       # per MB of script
+    "memory.build_sql_artifacts": 4 * MB, # per MB of script
+    "memory.highlight_spans": 12 * MB,    # per MB of script
+}
+
+
+@dataclass
+class MemoryCase:
+    name: str
+    setup: Callable[[], Any]
+    run: Callable[[Any], Any]
+    scale: Callable[[Any, Any], float]  # (state, result) -> number of units
+    unit_name: str
+    budget_per_unit: int
+    params: dict = field(default_factory=dict)
+    teardown: Callable[[Any], None] | None = None
+
+
+def build_memory_cases(profile: str = "quick") -> list[MemoryCase]:
+    cases: list[MemoryCase] = []
+    for n_rows in _ROW_COUNTS[profile]:
+        cases.append(MemoryCase(
+            name=f"memory.table_rows[{n_rows}]",
+            setup=lambda n=n_rows: (fixtures.make_table("clients", 8), n),
+            run=lambda s: distinct_rows(s[0], s[1]),
+            scale=_per_rows, unit_name="100k rows",
+            budget_per_unit=BUDGETS["memory.table_rows"], params={"rows": n_rows},
+        ))
+        cases.extend(_faker_cases(n_rows))
+
+        def setup_inserts(n=n_rows):
+            state = _TempStorage()
+            from controllers.app_controller import AppController
+            state.controller = AppController(storage=state.storage)
+            state.table = fixtures.make_table("clients", 8)
+            state.table.rows = distinct_rows(state.table, n)
+            return state
+
+        cases.append(MemoryCase(
+            name=f"memory.insert_script[{n_rows}]",
+            setup=setup_inserts,
+            run=lambda s: s.controller._generate_insert_statements(s.table, "sqlserver"),
+            scale=_per_script_mb, unit_name="MB script",
+            budget_per_unit=BUDGETS["memory.insert_script"], params={"rows": n_rows},
+            teardown=lambda s: s.close(),
+        ))
+
+    for n_tables in _SCRIPT_TABLES[profile]:
+        def setup_project(t=n_tables):
+            state = _TempStorage()
+            from controllers.app_controller import AppController
+            state.controller = AppController(storage=state.storage)
+            project = fixtures.make_project(t, 8)
+            for table in project.tables:
+                table.rows = distinct_rows(table, 200)
+            state.controller.current_project = project
+            state.actions = ["Database", "Table", "Data (Inserts)"] + rules.CRUD_ACTIONS
+            return state
+
+        def setup_script(t=n_tables):
+            state = setup_project(t)
+            state.script = state.controller.build_sql_artifacts(state.actions)
+            return state
+
+        cases.append(MemoryCase(
+            name=f"memory.build_sql_artifacts[{n_tables}]",
+            setup=setup_project,
+            run=lambda s: s.controller.build_sql_artifacts(s.actions),
+            scale=_per_script_mb, unit_name="MB script",
+            budget_per_unit=BUDGETS["memory.build_sql_artifacts"], params={"tables": n_tables},
+            teardown=lambda s: s.close(),
+        ))
+        cases.append(MemoryCase(
+            name=f"memory.highlight_spans[{n_tables}]",
+            setup=setup_script,
+            run=lambda s: highlight_spans(s.script),
+            scale=lambda s, _result: len(s.script) / MB, unit_name="MB script",
+            budget_per_unit=BUDGETS["memory.highlight_spans"], params={"tables": n_tables},
+            teardown=lambda s: s.close(),
+        ))
+    return cases
+
+
+def distinct_rows(table: models.TableModel, n_rows: int) -> list[dict]:
+    """Rows of unique strings, like Faker output (no interned/shared values)."""
+    cols = [c.name for c in table.columns if not c.is_auto_increment]
+    return [{c: f"{c}_{i}" for c in cols} for i in range(n_rows)]
+
+
+def measure_case(case: MemoryCase) -> dict:
+    state = case.setup()
+    try:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            result = case.run(state)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        units = case.scale(state, result) or 1.0
+        del result
+    finally:
+        if case.teardown:
+            case.teardown(state)
+
+    peak_bytes = peak - base
+    peak_per_unit = peak_bytes / units
+    return {
+        "name": case.name,
+        "params": case.params,
+        "peak_bytes": peak_bytes,
+        "retained_bytes": current - base,
+        "units": round(units, 4),
+        "unit_name": case.unit_name,
+        "peak_per_unit": peak_per_unit,
+        "budget_per_unit": case.budget_per_unit,
+        "within_budget": peak_per_unit <= case.budget_per_unit,
+    }
+
+
+def run_memory_suite(profile: str = "quick", pattern: str | None = None, verbose: bool = True) -> dict:
+    results = []
+    for case in build_memory_cases(profile):
+        if pattern and not fnmatch.fnmatch(case.name, pattern):
+            continue
+        result = measure_case(case)
+        results.append(result)
+        if verbose:
+            print(_format_result(result), flush=True)
+    return {
+        "kind": "memory",
+        "profile": profile,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def budget_failures(report: dict) -> list[dict]:
+    return [r for r in report.get("results", []) if not r.get("within_budget", True)]
+
+
+def _faker_cases(n_rows: int) -> list[MemoryCase]:
+    try:
+        from core.fake_gen import FakeGenerator
+    except ImportError:
+        return []
+    return [MemoryCase(
+        name=f"memory.faker_rows[{n_rows}]",
+        setup=lambda n=n_rows: (FakeGenerator(), fixtures.make_table("clients", 8), n),
+        run=lambda s: s[0].generate_rows(s[1], s[2]),
+        scale=_per_rows, unit_name="100k rows",
+        budget_per_unit=BUDGETS["memory.faker_rows"], params={"rows": n_rows},
+    )]
+
+
+def _per_rows(_state, result) -> float:
+    return len(result) / ROWS_UNIT
+
+
+def _per_script_mb(_state, result) -> float:
+    return len(result) / MB
+
+
+def _format_result(result: dict) -> str:
+    status = "ok" if result["within_budget"] else "OVER BUDGET"
+    return (
+        f"{result['name']:<44} peak {result['peak_bytes'] / MB:>9.1f} MB"
+        f"  {result['peak_per_unit'] / MB:>8.2f} MB/{result['unit_name']}"
+        f" (budget {result['budget_per_unit'] / MB:.0f})  {status}"
+    )
@@ -0,0 +1,157 @@
+"""Timing loop, JSON baselines and regression comparison."""
+from __future__ import annotations
+
+import fnmatch
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from benchmarks.cases import BenchCase, build_cases
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+DEFAULT_THRESHOLD = 0.15  # 15% slower than baseline counts as a regression
+HIGHER_IS_BETTER = {"throughput"}
+
+
+@dataclass
+class Regression:
+    name: str
+    baseline: float
+    current: float
+    higher_is_better: bool = False
+
+    @property
+    def ratio(self) -> float:
+        """How many times worse than the baseline the current result is."""
+        if self.higher_is_better:
+            return self.baseline / self.current if self.current else float("inf")
+        return self.current / self.baseline if self.baseline else float("inf")
+
+
+def run_case(case: BenchCase, repeat: int = 5, min_time: float = 0.2) -> dict:
+    """Time ``case.run`` at least ``repeat`` times (fewer once ``min_time`` is spent on slow cases)."""
+    state = case.setup()
+    timings: list[float] = []
+    try:
+        gc.collect()
+        while len(timings) < repeat:
+            start = time.perf_counter()
+            case.run(state)
+            timings.append(time.perf_counter() - start)
+            # Cases slower than the budget are only worth a couple of samples.
+            if sum(timings) > min_time * repeat and len(timings) >= 2:
+                break
+    finally:
+        if case.teardown:
+            case.teardown(state)
+
+    best = min(timings)
+    return {
+        "name": case.name,
+        "params": case.params,
+        "runs": len(timings),
+        "best_s": best,
+        "median_s": statistics.median(timings),
+        "units": case.units,
+        "unit_name": case.unit_name,
+        "throughput": case.units / best if best > 0 else None,
+    }
+
+
+def run_suite(profile: str = "quick", pattern: str | None = None, repeat: int = 5, verbose: bool = True) -> dict:
+    results = []
+    for case in build_cases(profile):
+        if pattern and not fnmatch.fnmatch(case.name, pattern):
+            continue
+        result = run_case(case, repeat=repeat)
+        results.append(result)
+        if verbose:
+            print(_format_result(result), flush=True)
+    return {
+        "kind": "timing",
+        "profile": profile,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def save_report(report: dict, path: str) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+def load_report(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def default_baseline_path(profile: str, kind: str = "timing") -> str:
+    filename = f"{profile}.json" if kind == "timing" else f"{kind}-{profile}.json"
+    return os.path.join(BASELINE_DIR, filename)
+
+
+def default_metric(report: dict) -> str:
+    return "peak_per_unit" if report.get("kind") == "memory" else "best_s"
+
+
+def compare_reports(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD, metric: str = "best_s") -> list[Regression]:
+    """Return the cases whose ``metric`` grew by more than ``threshold`` relative to the baseline."""
+    base_by_name = {r["name"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for result in current.get("results", []):
+        base = base_by_name.get(result["name"])
+        if base is None or not base.get(metric) or not result.get(metric):
+            continue
+        if metric in HIGHER_IS_BETTER:
+            if result[metric] * (1 + threshold) < base[metric]:
+                regressions.append(Regression(result["name"], base[metric], result[metric], higher_is_better=True))
+        elif result[metric] > base[metric] * (1 + threshold):
+            regressions.append(Regression(result["name"], base[metric], result[metric]))
+    return regressions
+
+
+def format_comparison(baseline: dict, current: dict, metric: str = "best_s") -> str:
+    base_by_name = {r["name"]: r for r in baseline.get("results", [])}
+    lines = [f"{'case':<48} {'baseline':>12} {'current':>12} {'change':>9}"]
+    for result in current.get("results", []):
+        base = base_by_name.get(result["name"])
+        if base is None:
+            lines.append(f"{result['name']:<48} {'-':>12} {_fmt_metric(metric, result[metric]):>12} {'new':>9}")
+            continue
+        change = (result[metric] / base[metric] - 1) * 100 if base[metric] else 0.0
+        lines.append(
+            f"{result['name']:<48} {_fmt_metric(metric, base[metric]):>12} {_fmt_metric(metric, result[metric]):>12} {change:>+8.1f}%"
+        )
+    return "\n".join(lines)
+
+
+def _format_result(result: dict) -> str:
+    rate = ""
+    if result["throughput"]:
+        rate = f"  {result['throughput']:>14,.0f} {result['unit_name']}/s"
+    return f"{result['name']:<48} {_fmt_seconds(result['best_s']):>12} (x{result['runs']}){rate}"
+
+
+def _fmt_metric(metric: str, value: float) -> str:
+    if metric in HIGHER_IS_BETTER:
+        return f"{value:,.0f}/s"
+    if metric.endswith("_s"):
+        return _fmt_seconds(value)
+    return f"{value / (1024 * 1024):.2f} MB"
+
+
+def _fmt_seconds(value: float) -> str:
+    if value < 1e-3:
+        return f"{value * 1e6:.1f} us"
+    if value < 1:
+        return f"{value * 1e3:.2f} ms"
+    return f"{value:.3f} s"
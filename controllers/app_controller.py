@@ -1,16 +1,41 @@
 from __future__ import annotations
 
+import threading
+from dataclasses import astuple
+
+from controllers.journal import ChangeJournal, apply_row_splice, replay
+from controllers.sql_worker import GenerationCancelled
 from core import models, validators
-from data.storage import Storage
+from data.storage import ProjectSnapshot, Storage, project_key
+from data.write_queue import WriteQueue
+from utils import profiling
+
+INSERT_CANCEL_CHECK_ROWS = 1000  # rows between cancellation checks while building INSERTs
 
 
 class AppController:
     """Bridge between UI and core logic."""
 
-    def __init__(self, storage: Storage) -> None:
+    def __init__(self, storage: Storage, writer: WriteQueue | None = None) -> None:
         self.storage = storage
+        # Background writer for saves; None keeps every write synchronous.
+        self.writer = writer
         self.current_project = models.DatabaseProject(database_name="")
         self._cached_machine_code = None
+        self._machine_code_lock = threading.Lock()
+        self._machine_code_thread: threading.Thread | None = None
+        self._activation_thread: threading.Thread | None = None
+        # (license key revision, result) of the last hardware verification
+        self._activation_cache: tuple[int, bool] | None = None
+        # Crash-recovery journal of edits not yet in the saved project
+        self.journal = ChangeJournal()
+        self._journal_epoch = storage.max_journal_epoch() + 1
+        self._journal_dirty = False
+        # Stored project this session may overwrite without asking: the one it
+        # loaded or explicitly saved. None until then (autosave only journals).
+        self._owned_key: str | None = None
+        # Bumped by every row edit and project switch (rows are too big to compare)
+        self.rows_revision = 0
 
     def set_database_name(self, name: str) -> None:
         self.current_project.database_name = name
@@ -21,51 +46,101 @@ class AppController:
     def set_tables(self, tables: list[models.TableModel]) -> None:
         self.current_project.tables = tables
 
-    def build_sql_artifacts(self, actions: list[str]) -> str:
-        """Return concatenated SQL scripts for all tables based on selected actions."""
-        if not self.current_project.tables:
-            return ""
+    def preview_inputs(self, actions: list[str]) -> tuple:
+        """Hashable summary of everything ``build_sql_artifacts(actions)`` depends on."""
+        project = self.current_project
+        return (
+            tuple(actions), project.database_name, project.dbms, self.rows_revision,
+            tuple((id(t), t.name, tuple(astuple(c) for c in t.columns)) for t in project.tables),
+        )
+
+    def preview_snapshot(self, actions: list[str]) -> models.DatabaseProject:
+        """Copy of the current project for generating ``actions`` off the Tk thread.
+
+        Lists are copied; column models and row dicts are shared since the UI
+        replaces them rather than mutating them. Rows are loaded here, on the
+        calling thread, when inserts are requested.
+        """
+        project = self.current_project
+        with_rows = "Data (Inserts)" in actions
+        tables = []
+        for t in project.tables:
+            if with_rows:
+                self.ensure_rows_loaded(t)
+            tables.append(models.TableModel(
+                name=t.name, columns=list(t.columns), rows=list(t.rows) if with_rows else [],
+            ))
+        return models.DatabaseProject(database_name=project.database_name, tables=tables, dbms=project.dbms)
+
+    @profiling.timed("controller.build_sql_artifacts", snapshot=True)
+    def build_sql_artifacts(
+        self, actions: list[str], project: models.DatabaseProject | None = None, cancelled=None
+    ) -> str:
+        """Return concatenated SQL scripts for all tables based on selected actions.
+
+        ``project`` defaults to the current project; pass a ``preview_snapshot``
+        when running on another thread. ``cancelled()`` is polled between
+        tables and insert batches; once true, ``GenerationCancelled`` is raised.
+        """
+        return "\n\n".join(text for _table, text in self.build_sql_blocks(actions, project, cancelled))
+
+    @profiling.timed("controller.build_sql_blocks", snapshot=True)
+    def build_sql_blocks(
+        self, actions: list[str], project: models.DatabaseProject | None = None, cancelled=None
+    ) -> list[tuple[str | None, str]]:
+        """The blocks of ``build_sql_artifacts`` as ``(table name or None, text)``, in order."""
+        project = project or self.current_project
+        if not project.tables:
+            return []
 
         from core import dbms_builders
         
         # Normalize DBMS name from display format to internal format
-        dbms = dbms_builders.normalize_dbms_name(self.current_project.dbms)
-        blocks: list[str] = []
+        dbms = dbms_builders.normalize_dbms_name(project.dbms)
+        blocks: list[tuple[str | None, str]] = []
         
         # Database header (CREATE + USE)
-        if "Database" in actions and self.current_project.database_name.strip():
+        if "Database" in actions and project.database_name.strip():
             db_header = dbms_builders.build_database_header(
-                self.current_project.database_name.strip(), 
+                project.database_name.strip(), 
                 dbms
             )
             if db_header:
-                blocks.append(db_header)
+                blocks.append((None, db_header))
 
-        for table in self.current_project.tables:
-            validation = validators.validate_table(table)
+        for table in project.tables:
+            if cancelled and cancelled():
+                raise GenerationCancelled()
+            with profiling.span("controller.validate", table=table.name):
+                validation = validators.validate_table(table)
             if not validation.is_valid:
-                blocks.append("-- ERRORS for " + table.name + " --\n" + "\n".join(validation.errors))
+                blocks.append((table.name, "-- ERRORS for " + table.name + " --\n" + "\n".join(validation.errors)))
                 continue
 
             # CREATE TABLE (DBMS-specific)
             if "Table" in actions:
-                blocks.append(dbms_builders.build_create_table_statement(table, dbms))
+                with profiling.span("controller.create_table", table=table.name):
+                    blocks.append((table.name, dbms_builders.build_create_table_statement(table, dbms)))
             
             # CRUD Stored Procedures
             proc_actions = [a for a in ["Insert", "GetById", "SelectAll", "Update", "Delete"] if a in actions]
             if proc_actions:
-                procs = dbms_builders.build_crud_procedures(table, dbms, proc_actions)
-                blocks.extend(procs)
+                with profiling.span("controller.procedures", table=table.name):
+                    procs = dbms_builders.build_crud_procedures(table, dbms, proc_actions)
+                blocks.extend((table.name, proc) for proc in procs)
             
             # Add INSERT statements if manual data was entered
+            if "Data (Inserts)" in actions:
+                self.ensure_rows_loaded(table)
             if "Data (Inserts)" in actions and table.rows:
-                insert_sql = self._generate_insert_statements(table, dbms)
+                with profiling.span("controller.inserts", table=table.name, rows=len(table.rows)):
+                    insert_sql = self._generate_insert_statements(table, dbms, cancelled)
                 if insert_sql:
-                    blocks.append(f"-- Données saisies pour {table.name}\n{insert_sql}")
+                    blocks.append((table.name, f"-- Données saisies pour {table.name}\n{insert_sql}"))
 
-        return "\n\n".join([b for b in blocks if b.strip()])
+        return [(name, text) for name, text in blocks if text.strip()]
     
-    def _generate_insert_statements(self, table: models.TableModel, dbms: str) -> str:
+    def _generate_insert_statements(self, table: models.TableModel, dbms: str, cancelled=None) -> str:
         """Generate INSERT statements from manually entered rows."""
         if not table.rows:
             return ""
@@ -78,7 +153,9 @@ class AppController:
             return ""
         
         lines = []
-        for row in table.rows:
+        for i, row in enumerate(table.rows):
+            if cancelled and i % INSERT_CANCEL_CHECK_ROWS == 0 and cancelled():
+                raise GenerationCancelled()
             vals = []
             for col in table.columns:
                 if col.is_auto_increment:
@@ -105,17 +182,174 @@ class AppController:
         
         return sql
 
-    def save_project(self) -> None:
-        self.storage.save_project(self.current_project)
+    def save_project(self, on_done=None) -> None:
+        """Persist the current project, on the writer thread when there is one.
+
+        ``on_done()`` runs on the Tk thread once the data is on disk; failures
+        go to the write queue's error handler. The save also compacts the
+        journal: records it covers are deleted in the same transaction.
+        """
+        # Journal first so a failed save still leaves the edits recoverable.
+        self.flush_journal()
+        self._owned_key = project_key(self.current_project)
+        epoch = self._journal_epoch
+        self._journal_epoch += 1
+        self._journal_dirty = False
+        if self.writer is None:
+            self.storage.save_project(self.current_project, journal_epoch=epoch)
+            self.journal.reset(self.current_project, base_name=project_key(self.current_project))
+            if on_done:
+                on_done()
+            return
+
+        def write(snapshot: ProjectSnapshot) -> ProjectSnapshot:
+            self.storage.save_project(snapshot.project, raise_errors=True, journal_epoch=snapshot.journal_epoch)
+            return snapshot
+
+        def finished(snapshot: ProjectSnapshot) -> None:
+            snapshot.apply()
+            if on_done:
+                on_done()
+
+        self.writer.submit(
+            ("project", self.current_project.database_name.strip()),
+            write, ProjectSnapshot.take(self.current_project, journal_epoch=epoch),
+            merge=ProjectSnapshot.merge, on_done=finished,
+            on_error=lambda _error, snapshot: snapshot.restore(),
+        )
+        self.journal.reset(self.current_project, base_name=project_key(self.current_project))
+
+    def autosave_project(self) -> bool:
+        """Fold the journal into the stored project, only if it is this session's own.
+
+        Never writes under another key: an unnamed or renamed project, or one
+        whose name matches a project that was not loaded, stays in the journal
+        until the user saves it explicitly. Returns whether a save was queued.
+        """
+        if self._owned_key is None or project_key(self.current_project) != self._owned_key:
+            return False
+        self.save_project()
+        return True
+
+    def flush_writes(self) -> None:
+        """Wait for queued background writes (before reading what they write)."""
+        if self.writer is not None:
+            self.writer.flush()
 
     def load_project(self, project_id: int) -> None:
+        self.flush_writes()
         self.current_project = self.storage.load_project(project_id)
+        self._owned_key = project_key(self.current_project)
+        self.rows_revision += 1
+        self._restart_journal()
+
+    def load_project_by_name(self, name: str) -> None:
+        self.flush_writes()
+        self.current_project = self.storage.load_project_by_name(name)
+        self._owned_key = project_key(self.current_project)
+        self.rows_revision += 1
+        self._restart_journal()
+
+    # --- ROW EDITS (journaled) ---
+    def append_rows(self, table: models.TableModel, rows: list[dict]) -> None:
+        self._splice_rows(table, len(table.rows), len(table.rows), rows)
+
+    def replace_row(self, table: models.TableModel, index: int, row: dict) -> None:
+        self._splice_rows(table, index, index + 1, [row])
+
+    def delete_row(self, table: models.TableModel, index: int) -> None:
+        self._splice_rows(table, index, index + 1, [])
+
+    def clear_rows(self, table: models.TableModel) -> None:
+        self._splice_rows(table, 0, len(table.rows), [])
+
+    def _splice_rows(self, table: models.TableModel, start: int, stop: int, rows: list[dict]) -> None:
+        apply_row_splice(table, start, stop, rows)
+        self.rows_revision += 1
+        self.journal.record_rows(table, start, stop, rows)
+        self._journal_dirty = True
+
+    # --- AUTOSAVE / CRASH RECOVERY ---
+    @property
+    def has_unsaved_changes(self) -> bool:
+        return self._journal_dirty
+
+    def flush_journal(self) -> int:
+        """Append records for the edits since the last flush; returns how many."""
+        records = self.journal.collect(self.current_project)
+        if not records:
+            return 0
+        self._journal_dirty = True
+        base_name, epoch = self.journal.base_name, self._journal_epoch
+        if self.writer is None:
+            self.storage.append_journal(base_name, epoch, records)
+        else:
+            self.writer.submit(
+                None, lambda recs: self.storage.append_journal(base_name, epoch, recs, raise_errors=True), records
+            )
+        return len(records)
+
+    def pending_recovery(self) -> list[dict]:
+        """Journal records left by a session that ended before saving."""
+        return self.storage.read_journal()
+
+    def recover_from_journal(self, records: list[dict]) -> None:
+        """Rebuild the unsaved project: stored base project plus the journaled edits."""
+        base_name = records[0]["base_name"] if records else ""
+        project = self.storage.load_project_by_name(base_name) if base_name else models.DatabaseProject(database_name="")
+        self.current_project = replay(project, records, self.storage.load_rows)
+        # Whether the crashed session owned base_name is unknown: stay in the
+        # journal until the user saves explicitly.
+        self._owned_key = None
+        self.rows_revision += 1
+        self.journal.reset(self.current_project, base_name=base_name)
+        self._journal_dirty = True
+
+    def discard_journal(self) -> None:
+        self.storage.clear_journal()
+        self._journal_dirty = False
+
+    def _restart_journal(self) -> None:
+        """A different project is now current: earlier records no longer apply."""
+        if self.writer is None:
+            self.storage.clear_journal()
+        else:
+            self.writer.submit(None, lambda _: self.storage.clear_journal())
+        self._journal_epoch += 1
+        self._journal_dirty = False
+        self.journal.reset(self.current_project, base_name=project_key(self.current_project))
+
+    def ensure_rows_loaded(self, table: models.TableModel) -> None:
+        """Fetch the rows of a table from a loaded project on first access."""
+        if not table.rows_loaded:
+            self.storage.load_rows(table)
 
     def list_projects(self) -> list[dict]:
         return self.storage.list_projects()
 
+    def search_projects(self, query: str = "", limit: int = 50, offset: int = 0, order: str = "updated") -> list[dict]:
+        return self.storage.search_projects(query, limit=limit, offset=offset, order=order)
+
+    def count_projects(self, query: str = "") -> int:
+        return self.storage.count_projects(query)
+
+    def delete_project(self, project_id: int) -> None:
+        self.flush_writes()
+        name = self.storage.delete_project(project_id)
+        if name is not None and name == self._owned_key:
+            # The open project is no longer stored: autosave must not recreate
+            # it, only an explicit save may.
+            self._owned_key = None
+            self._journal_dirty = True
+
     def add_to_history(self, sql_content: str) -> None:
-        self.storage.add_history(self.current_project.database_name, sql_content)
+        project_name = self.current_project.database_name
+        if self.writer is None:
+            self.storage.add_history(project_name, sql_content)
+            return
+        self.writer.submit(
+            None, lambda content: self.storage.add_history(project_name, content, raise_errors=True), sql_content
+        )
 
     def delete_history_entry(self, entry_id: int) -> None:
         self.storage.delete_history_entry(entry_id)
@@ -124,13 +358,25 @@ class AppController:
         self.storage.clear_history()
 
     def get_history(self) -> list[dict]:
+        self.flush_writes()
         return self.storage.get_history()
 
+    def get_history_content(self, entry_id: int) -> str | None:
+        return self.storage.get_history_content(entry_id)
+
+    def search_history(self, query: str) -> list[dict]:
+        return self.storage.search_history(query)
+
     def get_theme(self) -> str:
         return self.storage.get_theme()
 
     def set_theme(self, theme_name: str) -> None:
-        self.storage.set_theme(theme_name)
+        if self.writer is None:
+            self.storage.set_theme(theme_name)
+            return
+        self.writer.submit(
+            ("config", "theme"), lambda name: self.storage.set_theme(name, raise_errors=True), theme_name
+        )
 
     # --- HARDWARE-BASED LICENSE SYSTEM ---
     # Obfuscated secret phrase for license system
@@ -147,32 +393,101 @@ class AppController:
             # Add older secrets here when you change the main SECRET_PHRASE
         ]
 
+    @property
+    def cached_machine_code(self) -> str | None:
+        """Machine code if already resolved, without blocking."""
+        return self._cached_machine_code
+
+    @property
+    def machine_code_pending(self) -> bool:
+        """True while a background machine code lookup is running."""
+        return self._machine_code_thread is not None and self._machine_code_thread.is_alive()
+
+    def prefetch_machine_code(self) -> None:
+        """Resolve the machine code on a background thread (keeps wmic off the UI thread)."""
+        if self._cached_machine_code or self.machine_code_pending:
+            return
+        self._machine_code_thread = threading.Thread(target=self.get_machine_code, name="machine-code", daemon=True)
+        self._machine_code_thread.start()
+
     def get_machine_code(self) -> str:
-        """Get the current machine's hardware code (cached)"""
+        """Get the current machine's hardware code (cached in memory and in storage)"""
         if self._cached_machine_code:
             return self._cached_machine_code
-            
-        try:
-            # Try to import our hardware ID module
-            from utils.hardware_id import generate_machine_code
-            self._cached_machine_code = generate_machine_code()
-            return self._cached_machine_code
-        except Exception:
-            # Fallback if hardware_id module doesn't exist yet
-            return "MACH-FALL-BACKK-CODEE"
+
+        with self._machine_code_lock:
+            if self._cached_machine_code:
+                return self._cached_machine_code
+            try:
+                # Try to import our hardware ID module
+                from utils import hardware_id
+
+                # Cheap path: signed record from a previous launch, checked against stable inputs
+                inputs = hardware_id.stable_inputs()
+                code = hardware_id.read_fingerprint_record(self.storage.get_machine_fingerprint(), inputs)
+                if not code:
+                    code = hardware_id.generate_machine_code()
+                    self.storage.set_machine_fingerprint(hardware_id.make_fingerprint_record(code, inputs))
+                self._cached_machine_code = code
+                return self._cached_machine_code
+            except Exception:
+                # Fallback if hardware_id module doesn't exist yet
+                return "MACH-FALL-BACKK-CODEE"
     
+    @property
+    def activated(self) -> bool:
+        """Cached activation state; only re-verifies when the stored key changed."""
+        return self.is_activated()
+
     def is_activated(self) -> bool:
-        """Check if the license is activated using hardware-based verification."""
+        """Check if the license is activated, reusing the last verification while the key is unchanged."""
+        cache = self._activation_cache
+        if cache is not None and cache[0] == self.storage.license_key_revision:
+            return cache[1]
+        revision = self.storage.license_key_revision
+        result = self._verify_activation()
+        # A legacy migration rewrites the key; the result still holds for the new revision.
+        if result and self.storage.license_key_revision != revision:
+            revision = self.storage.license_key_revision
+        self._activation_cache = (revision, result)
+        return result
+
+    @property
+    def activation_pending(self) -> bool:
+        """True while ``prefetch_activation`` is still verifying on its thread."""
+        return self._activation_thread is not None and self._activation_thread.is_alive()
+
+    def prefetch_activation(self) -> None:
+        """Verify the license on a background thread; poll ``activation_pending``.
+
+        A first verification may have to probe the hardware (wmic can take
+        seconds), so the Tk thread only calls ``is_activated()`` once this is
+        done. Without a stored key the answer is immediate and nothing starts.
+        """
+        if self.activation_pending:
+            return
+        cache = self._activation_cache
+        if (cache is not None and cache[0] == self.storage.license_key_revision) or not self.storage.get_license_key():
+            self.is_activated()
+            return
+        self._activation_thread = threading.Thread(target=self.is_activated, name="activation", daemon=True)
+        self._activation_thread.start()
+
+    def invalidate_activation_cache(self) -> None:
+        self._activation_cache = None
+
+    def _verify_activation(self) -> bool:
+        """Hardware-based verification of the stored license key."""
         try:
-            # Get the machine code for this computer
-            current_machine_code = self.get_machine_code()
-            
-            # Get the activation key from storage
+            # Get the activation key from storage (no key: no need to probe the hardware)
             stored_key = self.storage.get_license_key()
             
             if not stored_key:
                 return False
             
+            # Get the machine code for this computer
+            current_machine_code = self.get_machine_code()
+            
             # Verify if the stored key matches this machine
             from utils.hardware_id import verify_activation_key, generate_activation_key
             
@@ -208,6 +523,7 @@ class AppController:
             if verify_activation_key(current_machine_code, key, self.SECRET_PHRASE):
                 # Store the valid key in the database
                 self.storage.set_license_key(key)
+                self._activation_cache = (self.storage.license_key_revision, True)
                 
                 # Also update the file-based activation for consistency
                 from activation_storage import set_activated
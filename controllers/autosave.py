@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import time
+
+from controllers.app_controller import AppController
+
+AUTOSAVE_DELAY_MS = 1500     # quiet time after the last edit before journaling
+COMPACT_INTERVAL_S = 60.0    # fold the journal into the saved project at most this often
+
+
+class Autosave:
+    """Debounced idle autosave driven by a widget's ``after()`` loop.
+
+    Every edit calls ``touch()``; once edits stop for ``delay_ms`` the
+    pending changes are appended to the journal at the next idle moment.
+    At most every ``compact_interval_s`` seconds the project itself is
+    saved, which also truncates the journal, but only when the session
+    owns its stored copy (see ``AppController.autosave_project``).
+
+    A failure is passed to ``on_error(error)`` once, until a run succeeds
+    again (printed when there is no handler).
+    """
+
+    def __init__(
+        self,
+        widget,
+        controller: AppController,
+        delay_ms: int = AUTOSAVE_DELAY_MS,
+        compact_interval_s: float = COMPACT_INTERVAL_S,
+        on_error=None,
+    ) -> None:
+        self.widget = widget
+        self.controller = controller
+        self.delay_ms = delay_ms
+        self.compact_interval_s = compact_interval_s
+        self.enabled = True
+        self.on_error = on_error
+        self._failing = False
+        self._after_id = None
+        self._last_compact = time.monotonic()
+
+    def touch(self) -> None:
+        """Note an edit; restarts the quiet-time countdown."""
+        if not self.enabled:
+            return
+        self.cancel()
+        self._after_id = self.widget.after(self.delay_ms, self._on_quiet)
+
+    def cancel(self) -> None:
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def run_now(self, compact: bool = False) -> None:
+        """Journal pending edits, and save the project when due (or ``compact``)."""
+        self.cancel()
+        try:
+            self.controller.flush_journal()
+            due = time.monotonic() - self._last_compact >= self.compact_interval_s
+            if self.controller.has_unsaved_changes and (compact or due):
+                if self.controller.autosave_project():
+                    self._last_compact = time.monotonic()
+        except Exception as e:
+            if self.on_error is None:
+                print(f"WARN: échec de la sauvegarde automatique: {e}")
+            elif not self._failing:
+                self.on_error(e)
+            self._failing = True
+            return
+        self._failing = False
+
+    def _on_quiet(self) -> None:
+        self._after_id = self.widget.after_idle(self.run_now)
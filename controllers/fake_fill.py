@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import dataclasses
+import queue
+import threading
+import time
+
+from core import models
+
+CHUNK_ROWS = 2000  # rows generated per chunk handed to the Tk thread
+POLL_MS = 50       # how often the Tk side collects finished chunks
+
+
+class FakeFillJob:
+    """Generates ``count`` Faker rows for a table on a worker thread.
+
+    Rows come back in chunks of ``chunk_rows``; an ``after()`` loop on the
+    Tk thread passes each one to ``on_chunk(rows)`` and then reports
+    ``on_progress(done, count, rows_per_second)``. ``cancel()`` stops the
+    worker after its current chunk; chunks already generated are still
+    delivered. ``on_done(done, cancelled, error)`` runs last, on the Tk
+    thread too.
+
+    Without ``generator``, the worker imports Faker and takes the shared
+    generator of ``locale`` itself (``generator`` is set once it exists),
+    so the import never blocks the Tk thread; failures go to ``on_done``.
+    """
+
+    def __init__(
+        self, widget, table: models.TableModel, count: int,
+        on_chunk, on_progress=None, on_done=None, chunk_rows: int = CHUNK_ROWS,
+        generator=None, locale: str = "fr_FR",
+    ) -> None:
+        self.widget = widget
+        self.generator = generator
+        self.locale = locale
+        self.table = table
+        # The worker only reads the columns; the Tk thread may edit the table meanwhile.
+        self._definition = dataclasses.replace(table, columns=list(table.columns), rows=[], dirty_chunks=set())
+        self.count = count
+        self.on_chunk = on_chunk
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.chunk_rows = chunk_rows
+        self.done = 0
+        self._cancel = threading.Event()
+        self._chunks: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._poll_id = None
+        self._started = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._poll_id is not None
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="faker-fill", daemon=True)
+        self._thread.start()
+        self._poll_id = self.widget.after(POLL_MS, self._poll)
+
+    def cancel(self) -> None:
+        """Stop generating; rows already generated are kept."""
+        self._cancel.set()
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = time.perf_counter() - self._started
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def _run(self) -> None:
+        error = None
+        try:
+            if self.generator is None:
+                from core.fake_gen import get_generator
+                self.generator = get_generator(self.locale)
+            remaining = self.count
+            while remaining > 0 and not self._cancel.is_set():
+                rows = self.generator.generate_rows(self._definition, min(self.chunk_rows, remaining))
+                remaining -= len(rows)
+                self._chunks.put(rows)
+        except Exception as e:
+            error = e
+        self._chunks.put(error if error is not None else None)
+
+    def _poll(self) -> None:
+        self._poll_id = None
+        finished, error = False, None
+        while True:
+            try:
+                item = self._chunks.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, list):
+                self.done += len(item)
+                _safe_call(self.on_chunk, item)
+            else:
+                finished, error = True, item
+                break
+        if self.on_progress:
+            _safe_call(self.on_progress, self.done, self.count, self.rows_per_second)
+        if finished:
+            if self.on_done:
+                _safe_call(self.on_done, self.done, self._cancel.is_set(), error)
+            return
+        try:
+            self._poll_id = self.widget.after(POLL_MS, self._poll)
+        except Exception:
+            self._cancel.set()  # widget destroyed
+
+
+def _safe_call(cb, *args) -> None:
+    try:
+        cb(*args)
+    except Exception as e:
+        print(f"WARN: callback de génération Faker en erreur: {e}")
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+from dataclasses import astuple
+from typing import Callable
+
+from core import models
+from data.serializers import column_from_dict, column_to_dict
+
+
+class ChangeJournal:
+    """Turns edits of the current project into small append-only records.
+
+    Record kinds (payloads are JSON-serialisable dicts):
+
+    - ``layout``: database name, DBMS and table order; ``order[i]`` is the
+      previous index of table ``i`` or -1 for a new table.
+    - ``table``: name and columns of the table at ``index``.
+    - ``rows``: ``rows[start:stop] = rows`` on the table at ``index``
+      (an append is ``start == stop == len(rows)``).
+
+    Row edits are recorded as they happen (``record_rows``); definition and
+    layout changes are found by diffing against the last journaled state
+    when ``collect`` runs, so typing in the table editor costs nothing.
+    """
+
+    def __init__(self) -> None:
+        self.base_name = ""  # stored project the records apply to ("" = empty project)
+        self._tables: list[models.TableModel] = []
+        self._signatures: dict[int, str] = {}
+        self._meta: tuple[str, str] = ("", "")
+        self._row_ops: list[tuple[models.TableModel, int, int, list[dict]]] = []
+
+    def reset(self, project: models.DatabaseProject, base_name: str = "") -> None:
+        """Take ``project`` as the state the next records are relative to."""
+        self.base_name = base_name
+        self._tables = list(project.tables)
+        self._signatures = {id(t): _table_signature(t) for t in project.tables}
+        self._meta = (project.database_name, project.dbms)
+        self._row_ops.clear()
+
+    def record_rows(self, table: models.TableModel, start: int, stop: int, rows: list[dict]) -> None:
+        self._row_ops.append((table, start, stop, list(rows)))
+
+    def collect(self, project: models.DatabaseProject) -> list[tuple[str, dict]]:
+        """Records describing the changes since the last call, oldest first."""
+        records: list[tuple[str, dict]] = []
+        meta = (project.database_name, project.dbms)
+        previous = {id(t): i for i, t in enumerate(self._tables)}
+        order = [previous.get(id(t), -1) for t in project.tables]
+        if meta != self._meta or order != list(range(len(self._tables))):
+            records.append(("layout", {"database_name": meta[0], "dbms": meta[1], "order": order}))
+
+        for index, table in enumerate(project.tables):
+            signature = _table_signature(table)
+            if self._signatures.get(id(table)) != signature:
+                records.append(("table", {
+                    "index": index, "name": table.name, "columns": [column_to_dict(c) for c in table.columns],
+                }))
+
+        positions = {id(t): i for i, t in enumerate(project.tables)}
+        for table, start, stop, rows in self._row_ops:
+            # Edits of a table removed since then are moot.
+            if id(table) in positions:
+                records.append(("rows", {"index": positions[id(table)], "start": start, "stop": stop, "rows": rows}))
+
+        self._tables = list(project.tables)
+        self._signatures = {id(t): _table_signature(t) for t in project.tables}
+        self._meta = meta
+        self._row_ops.clear()
+        return records
+
+
+def replay(
+    project: models.DatabaseProject,
+    records: list[dict],
+    load_rows: Callable[[models.TableModel], None],
+) -> models.DatabaseProject:
+    """Apply journal records (``{"kind", "payload"}``) in order to ``project``."""
+    for record in records:
+        data = record["payload"]
+        try:
+            if record["kind"] == "layout":
+                old = project.tables
+                project.tables = [
+                    old[src] if 0 <= src < len(old) else models.TableModel(name="")
+                    for src in data["order"]
+                ]
+                project.database_name = data["database_name"]
+                project.dbms = data["dbms"]
+            elif record["kind"] == "table":
+                table = project.tables[data["index"]]
+                table.name = data["name"]
+                table.columns = [column_from_dict(c) for c in data["columns"]]
+            elif record["kind"] == "rows":
+                table = project.tables[data["index"]]
+                load_rows(table)
+                apply_row_splice(table, data["start"], data["stop"], data["rows"])
+        except (IndexError, KeyError, TypeError) as e:
+            print(f"WARN: entrée de journal ignorée ({record['kind']}): {e}")
+    return project
+
+
+def apply_row_splice(table: models.TableModel, start: int, stop: int, rows: list[dict]) -> None:
+    """``table.rows[start:stop] = rows`` with the matching dirty chunks."""
+    table.rows[start:stop] = rows
+    if len(rows) == stop - start:
+        table.mark_rows_changed(start, stop)
+    else:
+        # Later rows shifted (or the table shrank)
+        table.mark_rows_changed(start)
+
+
+def _table_signature(table: models.TableModel) -> str:
+    return json.dumps([table.name, [astuple(c) for c in table.columns]], ensure_ascii=False)
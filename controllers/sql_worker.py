@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Callable
+
+POLL_MS = 30  # how often the Tk side looks for a finished generation while one is running
+
+
+class GenerationCancelled(Exception):
+    """Raised inside a job once a newer request has superseded it."""
+
+
+class SqlWorker:
+    """Runs SQL generation on a background thread, newest request only.
+
+    ``submit(token, fn)`` queues ``fn(cancelled)``, replacing any request
+    that has not started yet; a running job sees ``cancelled()`` turn true
+    as soon as a newer token is submitted and should raise
+    ``GenerationCancelled`` at its next check. Results are picked up on the
+    Tk thread by an ``after()`` loop that only runs while work is in flight;
+    results of superseded tokens are dropped there.
+
+    ``on_result(token, result)`` and ``on_error(token, exception)`` run on
+    the Tk thread; ``on_busy(bool)`` reports when work starts and stops.
+    """
+
+    def __init__(self, widget, on_result, on_error=None, on_busy=None) -> None:
+        self.widget = widget
+        self.on_result = on_result
+        self.on_error = on_error
+        self.on_busy = on_busy
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._next: tuple[Any, Callable] | None = None
+        self._latest = None
+        self._closed = False
+        self._done: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._poll_id = None
+
+    @property
+    def busy(self) -> bool:
+        return self._poll_id is not None
+
+    def submit(self, token, fn: Callable[[Callable[[], bool]], Any]) -> None:
+        """Queue ``fn(cancelled)`` as the newest request (call from the Tk thread)."""
+        with self._lock:
+            self._latest = token
+            self._next = (token, fn)
+            self._wakeup.notify()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="sql-generator", daemon=True)
+            self._thread.start()
+        if self._poll_id is None:
+            if self.on_busy:
+                self.on_busy(True)
+            self._poll_id = self.widget.after(POLL_MS, self._poll)
+
+    def is_current(self, token) -> bool:
+        return token == self._latest
+
+    def close(self) -> None:
+        """Stop the thread; a running job is cancelled and its result dropped."""
+        with self._lock:
+            self._closed = True
+            self._latest = None
+            self._next = None
+            self._wakeup.notify()
+        if self._poll_id is not None:
+            try:
+                self.widget.after_cancel(self._poll_id)
+            except Exception:
+                pass
+            self._poll_id = None
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the newest request is done and deliver it (e.g. before copying the script)."""
+        if self._poll_id is None:
+            return True
+        self.widget.after_cancel(self._poll_id)
+        self._poll_id = None
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._done.get(timeout=remaining)
+            except queue.Empty:
+                self._poll_id = self.widget.after(POLL_MS, self._poll)
+                return False
+            if self._deliver(*item):
+                self._finish()
+                return True
+
+    def _poll(self) -> None:
+        self._poll_id = None
+        while True:
+            try:
+                item = self._done.get_nowait()
+            except queue.Empty:
+                break
+            if self._deliver(*item):
+                self._finish()
+                return
+        if self._latest is None:
+            self._finish()
+            return
+        try:
+            self._poll_id = self.widget.after(POLL_MS, self._poll)
+        except Exception:
+            pass  # widget destroyed
+
+    def _deliver(self, token, result, error) -> bool:
+        """Hand a finished job to the callbacks; False if it was superseded."""
+        if not self.is_current(token):
+            return False
+        if error is None:
+            _safe_call(self.on_result, token, result)
+        elif not isinstance(error, GenerationCancelled) and self.on_error:
+            _safe_call(self.on_error, token, error)
+        return True
+
+    def _finish(self) -> None:
+        if self.on_busy:
+            _safe_call(self.on_busy, False)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                self._wakeup.wait_for(lambda: self._next is not None or self._closed)
+                if self._closed:
+                    return
+                token, fn = self._next
+                self._next = None
+            result, error = None, None
+            try:
+                result = fn(lambda: token != self._latest)
+            except Exception as e:
+                error = e
+            self._done.put((token, result, error))
+
+
+def _safe_call(cb, *args) -> None:
+    try:
+        cb(*args)
+    except Exception as e:
+        print(f"WARN: callback de génération en erreur: {e}")
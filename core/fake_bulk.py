@@ -0,0 +1,70 @@
+"""Whole columns of numbers, booleans and dates as SQL-ready strings.
+
+Used by ``FakeGenerator`` for the columns that do not need Faker. NumPy
+draws the numbers when it is installed; otherwise the stdlib ``random``
+module does, still without a Python-level call per value for dates.
+"""
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # optional speed-up
+    np = None
+
+_rng = np.random.default_rng() if np is not None else None
+
+
+def ints(low: int, high: int, count: int) -> list[str]:
+    """``count`` integers in ``[low, high]``."""
+    if _rng is not None:
+        return _rng.integers(low, high + 1, size=count).astype(str).tolist()
+    return list(map(str, random.choices(range(low, high + 1), k=count)))
+
+
+def decimals(low: float, high: float, count: int, digits: int = 2) -> list[str]:
+    """``count`` uniform values in ``[low, high]`` rounded to ``digits`` (same text as ``str(round(x))``)."""
+    if _rng is not None:
+        return list(map(str, np.round(_rng.uniform(low, high, size=count), digits).tolist()))
+    r = random.random
+    span = high - low
+    return [str(round(low + span * r(), digits)) for _ in range(count)]
+
+
+def bools(count: int) -> list[str]:
+    if _rng is not None:
+        return _rng.integers(0, 2, size=count).astype(str).tolist()
+    return random.choices(("0", "1"), k=count)
+
+
+def dates(start: date, end: date, count: int) -> list[str]:
+    """``count`` ISO dates between ``start`` and ``end`` (inclusive)."""
+    return random.choices(_days(start, end), k=count)
+
+
+@lru_cache(maxsize=16)
+def _days(start: date, end: date) -> tuple[str, ...]:
+    # A century is ~36k strings: cheaper to sample than to format per value.
+    first = start.toordinal()
+    return tuple(date.fromordinal(first + i).isoformat() for i in range(max(1, end.toordinal() - first + 1)))
+
+
+def this_year() -> tuple[date, date]:
+    """Like Faker's ``date_this_year()``: January 1st to today."""
+    today = date.today()
+    return today.replace(month=1, day=1), today
+
+
+def this_decade() -> tuple[date, date]:
+    """Like Faker's ``date_this_decade()``: January 1st of the decade to today."""
+    today = date.today()
+    return date(today.year - today.year % 10, 1, 1), today
+
+
+def birth_dates() -> tuple[date, date]:
+    """Like Faker's ``date_of_birth()``: people aged 0 to 115."""
+    today = date.today()
+    return today - timedelta(days=int(115.25 * 365)), today
@@ -1,97 +1,306 @@
-from faker import Faker
+from faker import Faker, VERSION as FAKER_VERSION
+import json
+import os
 import random
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable
+from core import fake_bulk
 from core.models import TableModel, ColumnModel
+from utils import profiling
+
+# Text providers cost tens of microseconds per call: by default their values
+# are sampled from a pool of distinct values per locale. The pool is filled
+# with the values actually generated, so small fills cost no more than before.
+DEFAULT_POOL_SIZE = 5000
+ENV_POOL_SIZE = "SQLGEN_FAKER_POOL_SIZE"    # 0 calls Faker for every cell
+ENV_POOL_CACHE = "SQLGEN_FAKER_POOL_CACHE"  # directory where pools are kept between runs
+# Values that may repeat. Emails and logins are left out: pooled, they would
+# collapse to pool_size distinct values and break UNIQUE constraints.
+POOLED_KINDS = frozenset({
+    "first_name", "last_name", "phone_number", "street_address", "city", "postcode",
+    "country", "sentence", "title", "url", "word",
+})
+_POOL_ATTEMPTS = 3  # calls per wanted value before settling for a smaller pool (few distinct values)
+PLAN_CACHE_SIZE = 32  # compiled plans kept per generator (one per column layout)
+
+_generators: dict = {}
+_generators_lock = threading.Lock()
+
+
+def get_generator(locale: str = "fr_FR") -> "FakeGenerator":
+    """Shared generator for ``locale``; building a Faker instance loads all its providers."""
+    with _generators_lock:
+        gen = _generators.get(locale)
+        if gen is None:
+            gen = _generators[locale] = FakeGenerator(locale)
+        return gen
+
+
+@dataclass
+class ColumnRule:
+    """How one column is filled: ``make()`` returns one value, ``kind`` names the heuristic that matched."""
+    kind: str
+    make: Callable[[], object]
+
+    def values(self, count: int) -> list[str]:
+        make = self.make
+        return [str(make()) for _ in range(count)]
+
+
+@dataclass
+class PooledRule(ColumnRule):
+    """Fresh values until the pool is full, then samples of it (see ``FakeGenerator.pooled_values``)."""
+    sample: Callable[[int], list[str]] | None = None
+
+    def values(self, count: int) -> list[str]:
+        return self.sample(count)
+
+
+@dataclass
+class BulkRule(ColumnRule):
+    """Produces the whole column at once with ``bulk(count)`` (numbers, booleans, dates)."""
+    bulk: Callable[[int], list[str]] | None = None
+
+    def values(self, count: int) -> list[str]:
+        return self.bulk(count)
+
+
+@dataclass
+class GenerationPlan:
+    """Column name -> ColumnRule, resolved once per table instead of once per cell.
+
+    ``describe()`` shows what each column will receive; ``override()``
+    replaces (or adds) the rule of one column, e.g. a fixed list of statuses.
+    Auto-increment columns are not part of the plan.
+    """
+    rules: dict[str, ColumnRule] = field(default_factory=dict)
+
+    def describe(self) -> list[tuple[str, str]]:
+        return [
+            (name, f"{rule.kind} (pool)" if isinstance(rule, PooledRule) else rule.kind)
+            for name, rule in self.rules.items()
+        ]
+
+    def override(self, column: str, make: Callable[[], object], kind: str = "custom") -> None:
+        self.rules[column] = ColumnRule(kind, make)
+
+    def generate(self, count: int) -> list[dict]:
+        """``count`` rows, generated column by column."""
+        names = list(self.rules)
+        columns = [rule.values(count) for rule in self.rules.values()]
+        if not names:
+            return [{} for _ in range(count)]
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
 
 class FakeGenerator:
-    def __init__(self, locale: str = "fr_FR"):
+    def __init__(self, locale: str = "fr_FR", pool_size: int | None = None, cache_dir: str | None = None):
         self.fake = Faker(locale)
+        self.locale = locale
+        if pool_size is None:
+            try:
+                pool_size = int(os.getenv(ENV_POOL_SIZE, DEFAULT_POOL_SIZE))
+            except ValueError:
+                pool_size = DEFAULT_POOL_SIZE
+        self.pool_size = max(0, pool_size)
+        self.cache_dir = cache_dir or os.getenv(ENV_POOL_CACHE) or None
+        self._plans: OrderedDict[tuple, GenerationPlan] = OrderedDict()
+        self._pools: dict[str, list[str]] = {}
+        self._pools_full: set[str] = set()
+        # Pools still filling: values already in them and Faker calls made so far
+        self._pool_seen: dict[str, set[str]] = {}
+        self._pool_attempts: dict[str, int] = {}
+        self._disk_loaded = False
 
-    def generate_rows(self, table: TableModel, count: int) -> list[dict]:
+    @profiling.timed("faker.generate_rows", snapshot=True)
+    def generate_rows(self, table: TableModel, count: int, plan: GenerationPlan | None = None) -> list[dict]:
         """Generate 'count' rows of fake data for the given table."""
-        rows = []
-        for _ in range(count):
-            row_data = {}
-            for col in table.columns:
-                # Skip Auto Increment usually (let DB handle it), 
-                # but if we want to preview, we might just skip it for INSERTs
-                if col.is_auto_increment:
-                    continue
-                
-                val = self._generate_value_for_col(col)
-                row_data[col.name] = str(val)
-            rows.append(row_data)
-        return rows
-
-    def _generate_value_for_col(self, col: ColumnModel) -> any:
+        if plan is None:
+            plan = self.plan_for(table)
+        return plan.generate(count)
+
+    def plan_for(self, table: TableModel) -> GenerationPlan:
+        """The (cached) plan of ``table``; recompiled when its columns change."""
+        key = tuple((c.name, c.sql_type, c.is_auto_increment, c.is_primary_key) for c in table.columns)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._plans[key] = self.compile_plan(table)
+            while len(self._plans) > PLAN_CACHE_SIZE:
+                self._plans.popitem(last=False)
+        else:
+            self._plans.move_to_end(key)
+        return plan
+
+    def compile_plan(self, table: TableModel) -> GenerationPlan:
+        """A fresh plan for ``table``, safe to modify with ``override()``."""
+        plan = GenerationPlan()
+        for col in table.columns:
+            # Skip Auto Increment usually (let DB handle it), 
+            # but if we want to preview, we might just skip it for INSERTs
+            if col.is_auto_increment:
+                continue
+            rule = self._rule_for_col(col)
+            # A primary key must stay distinct, whatever it holds
+            if self.pool_size and rule.kind in POOLED_KINDS and not col.is_primary_key:
+                rule = PooledRule(rule.kind, rule.make, sample=partial(self.pooled_values, rule.kind, rule.make))
+            plan.rules[col.name] = rule
+        return plan
+
+    def pooled_values(self, kind: str, make: Callable[[], object], count: int) -> list[str]:
+        """``count`` values of ``kind`` through its pool of up to ``pool_size`` distinct values.
+
+        While the pool is filling, values come straight from ``make()`` and
+        the new ones join the pool, so no call pays for values it does not
+        use. Once full (or once distinct values stop coming), it is sampled
+        with ``random.choices`` and saved to the disk cache if there is one.
+        """
+        if not self._disk_loaded:
+            self._disk_loaded = True
+            cached = self._read_pool_cache()
+            self._pools.update(cached)
+            self._pools_full.update(cached)
+        values = self._pools.setdefault(kind, [])
+        if kind in self._pools_full:
+            return random.choices(values, k=count)
+        seen = self._pool_seen.setdefault(kind, set(values))
+        attempts = self._pool_attempts.get(kind, 0)
+        budget = self.pool_size * _POOL_ATTEMPTS
+        fresh: list[str] = []
+        while len(fresh) < count and len(values) < self.pool_size and attempts < budget:
+            value = str(make())
+            attempts += 1
+            fresh.append(value)
+            if value not in seen:
+                seen.add(value)
+                values.append(value)
+        self._pool_attempts[kind] = attempts
+        if len(values) >= self.pool_size or attempts >= budget:
+            self._pools_full.add(kind)
+            del self._pool_seen[kind]
+            self._write_pool_cache()
+        if len(fresh) < count:
+            fresh.extend(random.choices(values, k=count - len(fresh)))
+        return fresh
+
+    def _pool_cache_path(self) -> str | None:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"faker_pools_{self.locale}_{self.pool_size}.json")
+
+    def _read_pool_cache(self) -> dict[str, list[str]]:
+        path = self._pool_cache_path()
+        if not path or not os.path.exists(path):
+            return {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            # Pools of another Faker version may hold values it no longer produces
+            if data.get("faker") != FAKER_VERSION:
+                return {}
+            return {kind: list(values) for kind, values in data.get("pools", {}).items()}
+        except Exception as e:
+            print(f"WARN: cache des valeurs Faker illisible ({path}): {e}")
+            return {}
+
+    def _write_pool_cache(self) -> None:
+        path = self._pool_cache_path()
+        if not path:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                pools = {kind: self._pools[kind] for kind in self._pools_full}
+                json.dump({"faker": FAKER_VERSION, "pools": pools}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"WARN: impossible d'écrire le cache des valeurs Faker ({path}): {e}")
+
+    def _rule_for_col(self, col: ColumnModel) -> ColumnRule:
         name = col.name.lower()
         ctype = col.sql_type.upper()
+        fake = self.fake
 
         # 1. Detection by Name (Heuristics)
         if "email" in name or "mail" in name:
-            return self.fake.email()
+            return ColumnRule("email", fake.email)
         
         if "prenom" in name or "firstname" in name:
-            return self.fake.first_name()
+            return ColumnRule("first_name", fake.first_name)
         
         if "nom" in name or "lastname" in name or "surname" in name:
-            return self.fake.last_name()
+            return ColumnRule("last_name", fake.last_name)
         
         if "tel" in name or "phone" in name:
-            return self.fake.phone_number()
+            return ColumnRule("phone_number", fake.phone_number)
         
         if "adresse" in name or "address" in name or "street" in name:
-            return self.fake.street_address()
+            return ColumnRule("street_address", fake.street_address)
         
         if "ville" in name or "city" in name:
-            return self.fake.city()
+            return ColumnRule("city", fake.city)
             
         if "zip" in name or "postal" in name or "cp" in name:
-            return self.fake.postcode()
+            return ColumnRule("postcode", fake.postcode)
         
         if "pays" in name or "country" in name:
-            return self.fake.country()
+            return ColumnRule("country", fake.country)
             
         if "date" in name:
             if "naissance" in name or "birth" in name:
-                return self.fake.date_of_birth()
-            return self.fake.date_this_decade()
+                return BulkRule("date_of_birth", fake.date_of_birth,
+                                bulk=lambda n: fake_bulk.dates(*fake_bulk.birth_dates(), n))
+            return BulkRule("date_this_decade", fake.date_this_decade,
+                            bulk=lambda n: fake_bulk.dates(*fake_bulk.this_decade(), n))
             
         if "description" in name or "comment" in name or "bio" in name:
-            return self.fake.sentence(nb_words=10)
+            return ColumnRule("sentence", lambda: fake.sentence(nb_words=10))
             
         if "titre" in name or "title" in name:
-            return self.fake.sentence(nb_words=3).replace(".", "")
+            return ColumnRule("title", lambda: fake.sentence(nb_words=3).replace(".", ""))
             
         if "login" in name or "user" in name or "pseudo" in name:
-            return self.fake.user_name()
+            return ColumnRule("user_name", fake.user_name)
             
         if "pass" in name or "pwd" in name:
-            return "P@ssw0rd123!" # Standard format often preferred over random mess
+            return ColumnRule("password", lambda: "P@ssw0rd123!") # Standard format often preferred over random mess
             
         if "url" in name or "site" in name or "link" in name:
-            return self.fake.url()
+            return ColumnRule("url", fake.url)
         
         if "uuid" in name:
-            return self.fake.uuid4()
+            return ColumnRule("uuid4", fake.uuid4)
 
         # 2. Detection by SQL Type
+        # Numbers, booleans and dates are drawn a whole column at a time (see core.fake_bulk)
         if "INT" in ctype:
             if "age" in name:
-                return random.randint(18, 90)
-            if "annee" in name or "year" in name:
-                return random.randint(1990, 2025)
-            return random.randint(0, 1000)
+                low, high = 18, 90
+            elif "annee" in name or "year" in name:
+                low, high = 1990, 2025
+            else:
+                low, high = 0, 1000
+            return BulkRule(f"int[{low},{high}]", partial(random.randint, low, high),
+                            bulk=partial(fake_bulk.ints, low, high))
             
         if "DECIMAL" in ctype or "FLOAT" in ctype or "MONEY" in ctype:
             if "prix" in name or "price" in name:
-                return round(random.uniform(10.0, 500.0), 2)
-            return round(random.uniform(0.0, 100.0), 2)
+                low, high = 10.0, 500.0
+            else:
+                low, high = 0.0, 100.0
+            return BulkRule(f"decimal[{low:g},{high:g}]", lambda: round(random.uniform(low, high), 2),
+                            bulk=partial(fake_bulk.decimals, low, high))
             
         if "BOOL" in ctype or "BIT" in ctype:
-            return random.choice([0, 1])
+            return BulkRule("bool", lambda: random.choice([0, 1]), bulk=fake_bulk.bools)
             
         if "DATE" in ctype or "TIME" in ctype:
-            return self.fake.date_this_year()
+            # Same text as before bulk generation: a date, even for DATETIME/TIME columns
+            return BulkRule("date_this_year", fake.date_this_year,
+                            bulk=lambda n: fake_bulk.dates(*fake_bulk.this_year(), n))
 
         # Fallback text
-        return self.fake.word()
+        return ColumnRule("word", fake.word)
@@ -3,6 +3,9 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import List
 
+# Rows are persisted in fixed-size chunks; edits only rewrite the chunks they touch.
+ROW_CHUNK_SIZE = 500
+
 
 @dataclass
 class ColumnModel:
@@ -20,11 +23,24 @@ class TableModel:
     name: str
     columns: List[ColumnModel] = field(default_factory=list)
     rows: List[dict] = field(default_factory=list)
+    # Persistence bookkeeping maintained by data.storage (not part of the definition).
+    storage_id: int | None = field(default=None, repr=False, compare=False)
+    rows_loaded: bool = field(default=True, repr=False, compare=False)
+    row_count: int = field(default=0, repr=False, compare=False)
+    dirty_chunks: set = field(default_factory=set, repr=False, compare=False)
 
     @property
     def primary_keys(self) -> list[ColumnModel]:
         return [col for col in self.columns if col.is_primary_key]
 
+    def mark_rows_changed(self, start: int = 0, stop: int | None = None) -> None:
+        """Flag rows[start:stop] as modified (``stop=None``: everything from ``start`` on,
+        e.g. after an append, a delete that shifts later rows, or a clear)."""
+        first = start // ROW_CHUNK_SIZE
+        end = len(self.rows) if stop is None else stop
+        last = max(end - 1, start) // ROW_CHUNK_SIZE
+        self.dirty_chunks.update(range(first, last + 1))
+
 
 @dataclass
 class DatabaseProject:
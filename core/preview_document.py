@@ -0,0 +1,148 @@
+"""Tk-independent model of the SQL preview: the script as indexed blocks of lines."""
+from __future__ import annotations
+
+import itertools
+import re
+from array import array
+from bisect import bisect_right
+from difflib import SequenceMatcher
+
+LINE_INDEX_STEP = 64  # a block remembers the offset of every 64th line
+_LINE_GROUP = re.compile(r"(?:[^\n]*\n){%d}" % LINE_INDEX_STEP)
+_revisions = itertools.count(1)
+
+
+class PreviewBlock:
+    """One generated SQL block (header, CREATE TABLE, procedure, INSERTs...).
+
+    Line offsets are sampled every ``LINE_INDEX_STEP`` lines, so a line of
+    a multi-million-line INSERT block is found with at most that many
+    ``str.find`` calls, for 8 bytes per 64 lines of index.
+    """
+
+    __slots__ = ("text", "table", "line_count", "_checkpoints")
+
+    def __init__(self, text: str, table: str | None = None) -> None:
+        self.text = text
+        self.table = table
+        self.line_count = text.count("\n") + 1
+        self._checkpoints = array("q", [0])
+        # Anchored matches: a search would rescan the tail (< 64 lines) from every position
+        match = _LINE_GROUP.match(text)
+        while match is not None:
+            self._checkpoints.append(match.end())
+            match = _LINE_GROUP.match(text, match.end())
+
+    def line_offset(self, line: int) -> int:
+        """Character offset where ``line`` (0-based, may be ``line_count``) starts."""
+        if line >= self.line_count:
+            return len(self.text) + 1
+        offset = self._checkpoints[line // LINE_INDEX_STEP]
+        find = self.text.find
+        for _ in range(line % LINE_INDEX_STEP):
+            offset = find("\n", offset) + 1
+        return offset
+
+    def lines(self, first: int, last: int) -> str:
+        """Lines ``first`` to ``last`` (exclusive), without the final newline."""
+        return self.text[self.line_offset(first):self.line_offset(last) - 1]
+
+
+class PreviewDocument:
+    """Blocks separated by one blank line, exactly like ``"\\n\\n".join(texts)``.
+
+    Only the requested window of lines is ever materialized, so the viewer
+    never copies a large script into the Tk widget.
+    """
+
+    def __init__(self, blocks: list[PreviewBlock] | None = None) -> None:
+        self.blocks = blocks or []
+        self.revision = next(_revisions)
+        # Set by compare_with: the revision of the previous document (not the
+        # document itself, so old scripts can be freed) and the changed lines
+        self.base_revision: int | None = None
+        self.changes: list[tuple[str, int, int, int, int]] = []
+        # First document line of each block
+        self.starts = array("q")
+        line = 0
+        for block in self.blocks:
+            self.starts.append(line)
+            line += block.line_count + 1
+        self.line_count = max(0, line - 1)
+
+    @classmethod
+    def from_blocks(cls, blocks: list[tuple[str | None, str]]) -> PreviewDocument:
+        """From ``AppController.build_sql_blocks`` output."""
+        return cls([PreviewBlock(text, table) for table, text in blocks])
+
+    @classmethod
+    def from_text(cls, text: str) -> PreviewDocument:
+        return cls([PreviewBlock(text)] if text else [])
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.blocks
+
+    def text(self) -> str:
+        """The whole script (for copy, export and history)."""
+        return "\n\n".join(block.text for block in self.blocks)
+
+    def block_index(self, line: int) -> int:
+        return max(0, bisect_right(self.starts, line) - 1)
+
+    def lines(self, first: int, last: int) -> str:
+        """Document lines ``first`` to ``last`` (exclusive) joined by newlines."""
+        first = max(0, first)
+        last = min(last, self.line_count)
+        parts: list[str] = []
+        line = first
+        while line < last:
+            index = self.block_index(line)
+            block, start = self.blocks[index], self.starts[index]
+            block_end = start + block.line_count
+            if line < block_end:
+                end = min(last, block_end)
+                parts.append(block.lines(line - start, end - start))
+                line = end
+            else:
+                parts.append("")  # separator between two blocks
+                line += 1
+        return "\n".join(parts)
+
+    def compare_with(self, previous: PreviewDocument | None) -> None:
+        """Record the line ranges that differ from ``previous`` (see ``diff_lines``)."""
+        self.base_revision = previous.revision if previous is not None else None
+        self.changes = diff_lines(previous, self) if previous is not None else []
+
+    def tables(self) -> list[tuple[str, int]]:
+        """``(table name, first line)`` for every table, in script order."""
+        seen: dict[str, int] = {}
+        for block, start in zip(self.blocks, self.starts):
+            if block.table is not None and block.table not in seen:
+                seen[block.table] = start
+        return list(seen.items())
+
+
+def diff_lines(old: PreviewDocument, new: PreviewDocument) -> list[tuple[str, int, int, int, int]]:
+    """``SequenceMatcher``-style opcodes over document lines, computed block by block.
+
+    Unchanged blocks are matched by their text, so the cost grows with the
+    number of blocks, not lines; a changed block is reported whole.
+    """
+    old_ends = list(old.starts) + [old.line_count + 1]
+    new_ends = list(new.starts) + [new.line_count + 1]
+    matcher = SequenceMatcher(None, [b.text for b in old.blocks], [b.text for b in new.blocks], autojunk=False)
+    changes = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        changes.append((tag, old_ends[i1], old_ends[i2], new_ends[j1], new_ends[j2]))
+    return changes
+
+
+def map_line(changes: list[tuple[str, int, int, int, int]], line: int) -> int:
+    """Where old document ``line`` is in the new one (same offset inside a changed block, clamped)."""
+    for tag, a1, a2, b1, b2 in changes:
+        if a1 <= line < a2:
+            if tag == "equal":
+                return b1 + (line - a1)
+            return b1 + min(line - a1, max(0, b2 - b1 - 1))
+    return changes[-1][4] if changes else line
@@ -0,0 +1,88 @@
+"""Tk-independent tokenization used by the SQL preview syntax highlighting."""
+from __future__ import annotations
+
+import re
+
+KEYWORDS_PATTERN = r'\b(SELECT|FROM|WHERE|INSERT|INTO|VALUES|UPDATE|SET|DELETE|CREATE|TABLE|DATABASE|IF|NOT|EXISTS|USE|GO|BEGIN|END|PRIMARY|KEY|IDENTITY|AUTO_INCREMENT|SERIAL|BIGSERIAL|NULL|DEFAULT|CONSTRAINT|FOREIGN|REFERENCES|INDEX|UNIQUE|CHECK|AS|ON|AND|OR|IN|LIKE|BETWEEN|ORDER|BY|GROUP|HAVING|JOIN|LEFT|RIGHT|INNER|OUTER|UNION|CASE|WHEN|THEN|ELSE|DROP|ALTER|ADD|MODIFY|COLUMN|VARCHAR|INT|BIGINT|SMALLINT|DECIMAL|FLOAT|DATETIME|TIMESTAMP|DATE|TEXT|BIT|BOOLEAN|CHAR|NVARCHAR|PROCEDURE|FUNCTION|RETURN|DECLARE|EXEC|EXECUTE)\b'
+
+# (tag, pattern, flags) in the order the preview applies them
+HIGHLIGHT_RULES: list[tuple[str, str, int]] = [
+    ("keyword", KEYWORDS_PATTERN, re.IGNORECASE),
+    ("comment", r'--[^\n]*', 0),
+    ("string", r"'[^']*'", 0),
+    ("number", r'\b\d+\b', 0),
+    ("identifier", r'(\[[^\]]+\]|`[^`]+`|"[^"]+")', 0),
+]
+
+KEYWORDS = frozenset(KEYWORDS_PATTERN[3:-3].split("|"))
+
+# One pass over the script: the leftmost token wins, comments and strings
+# first so keywords inside them are not highlighted. Words are matched
+# whole and classified in Python, which is much cheaper than trying the
+# keyword alternation at every position.
+_TOKEN_RE = re.compile(
+    r"(?P<comment>--[^\n]*)"
+    r"|(?P<string>'[^']*')"
+    r'|(?P<identifier>\[[^\]]+\]|`[^`]+`|"[^"]+")'
+    r"|(?P<word>\w+)"
+)
+# Same tokens plus newlines, to track line numbers in the same pass.
+_LINE_TOKEN_RE = re.compile(_TOKEN_RE.pattern + r"|(?P<newline>\n)")
+
+
+def highlight_spans(content: str) -> list[tuple[str, int, int]]:
+    """Return (tag, start, end) character offsets for every highlighted token, in text order."""
+    spans: list[tuple[str, int, int]] = []
+    append = spans.append
+    keywords = KEYWORDS
+    for match in _TOKEN_RE.finditer(content):
+        tag = match.lastgroup
+        if tag == "word":
+            word = match.group()
+            if word.isdigit():
+                tag = "number"
+            elif word.upper() in keywords:
+                tag = "keyword"
+            else:
+                continue
+        append((tag, match.start(), match.end()))
+    return spans
+
+
+def highlight_ranges(content: str, first_line: int = 1) -> list[tuple[int, str, str, str]]:
+    """Tokens as ``(line, tag, start_index, end_index)`` with Tk ``"line.col"`` indices.
+
+    Tk resolves ``"1.0+Nc"`` by counting from the start of the text, so
+    line/column indices are computed here instead. ``first_line`` is the
+    widget line ``content`` starts on. Ranges come in text order; ``line``
+    is where the token starts.
+    """
+    ranges: list[tuple[int, str, str, str]] = []
+    append = ranges.append
+    keywords = KEYWORDS
+    line, line_start = first_line, 0
+    for match in _LINE_TOKEN_RE.finditer(content):
+        tag = match.lastgroup
+        if tag == "newline":
+            line += 1
+            line_start = match.end()
+            continue
+        start, end = match.span()
+        if tag == "word":
+            word = match.group()
+            if word.isdigit():
+                tag = "number"
+            elif word.upper() in keywords:
+                tag = "keyword"
+            else:
+                continue
+            append((line, tag, f"{line}.{start - line_start}", f"{line}.{end - line_start}"))
+            continue
+        first_line, start_index = line, f"{line}.{start - line_start}"
+        newlines = content.count("\n", start, end)
+        if newlines:
+            # Strings and identifiers may span lines
+            line += newlines
+            line_start = content.rfind("\n", start, end) + 1
+        append((first_line, tag, start_index, f"{line}.{end - line_start}"))
+    return ranges
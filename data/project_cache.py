@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from core import models
+
+PROJECT_CACHE_MAX_BYTES = 64 * 1024 * 1024  # estimated size of the cached definitions and rows
+_COLUMN_OVERHEAD = 64  # rough per-column cost on top of its strings
+
+
+@dataclass
+class _CachedTable:
+    table_id: int
+    name: str
+    columns: tuple[models.ColumnModel, ...]
+    row_count: int
+    rows: list[dict] | None = None  # filled once the rows were loaded
+
+
+@dataclass
+class _CachedProject:
+    updated_at: str
+    database_name: str
+    dbms: str
+    tables: list[_CachedTable]
+    size: int = 0
+    by_table_id: dict[int, _CachedTable] = field(default_factory=dict)
+
+
+class ProjectCache:
+    """LRU cache of parsed projects, keyed by project id and ``updated_at``.
+
+    Entries hold the column models and row lists read from the database;
+    ``build`` hands out fresh ``TableModel`` objects with copies of those
+    lists, so edits of a loaded project never reach the cache. Column
+    models and row dicts are shared: the UI replaces them, never mutates
+    them in place.
+
+    Sizes are estimated from the serialized columns and row chunks; the
+    least recently used projects are dropped once ``max_bytes`` is exceeded.
+    """
+
+    def __init__(self, max_bytes: int = PROJECT_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[int, _CachedProject] = OrderedDict()
+        self._size = 0
+        # Loads run on the Tk thread, saves (and their invalidation) on the writer.
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def get(self, project_id: int, updated_at: str) -> models.DatabaseProject | None:
+        """A fresh copy of the cached project, or None when absent or stale."""
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is None or entry.updated_at != updated_at:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(project_id)
+            self.hits += 1
+            return _build(entry)
+
+    def put(self, project_id: int, updated_at: str, project: models.DatabaseProject) -> None:
+        """Cache a project just read from the database (before any edit)."""
+        tables = [
+            _CachedTable(t.storage_id, t.name, tuple(t.columns), t.row_count, list(t.rows) if t.rows_loaded else None)
+            for t in project.tables
+        ]
+        entry = _CachedProject(updated_at, project.database_name, project.dbms, tables)
+        entry.by_table_id = {t.table_id: t for t in tables}
+        entry.size = len(project.database_name) + len(project.dbms) + sum(_definition_size(t) for t in tables)
+        with self._lock:
+            self._drop(project_id)
+            self._entries[project_id] = entry
+            self._size += entry.size
+            self._evict()
+
+    def rows(self, table_id: int) -> list[dict] | None:
+        """Copy of the cached rows of a table, if its project is cached with them."""
+        with self._lock:
+            for project_id, entry in self._entries.items():
+                cached = entry.by_table_id.get(table_id)
+                if cached is not None:
+                    if cached.rows is None:
+                        return None
+                    self._entries.move_to_end(project_id)
+                    self.hits += 1
+                    return list(cached.rows)
+            return None
+
+    def put_rows(self, table_id: int, rows: list[dict], size: int) -> None:
+        """Attach rows loaded by ``Storage.load_rows``; ``size`` is their serialized length."""
+        with self._lock:
+            for entry in self._entries.values():
+                cached = entry.by_table_id.get(table_id)
+                if cached is not None and cached.rows is None:
+                    cached.rows = list(rows)
+                    entry.size += size
+                    self._size += size
+                    self._evict()
+                    return
+
+    def invalidate(self, project_id: int) -> None:
+        with self._lock:
+            self._drop(project_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _drop(self, project_id: int) -> None:
+        entry = self._entries.pop(project_id, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._size -= entry.size
+
+
+def _build(entry: _CachedProject) -> models.DatabaseProject:
+    tables = []
+    for cached in entry.tables:
+        loaded = cached.rows is not None or cached.row_count == 0
+        tables.append(models.TableModel(
+            name=cached.name, columns=list(cached.columns),
+            rows=list(cached.rows) if cached.rows is not None else [],
+            storage_id=cached.table_id, row_count=cached.row_count, rows_loaded=loaded,
+        ))
+    return models.DatabaseProject(database_name=entry.database_name, tables=tables, dbms=entry.dbms)
+
+
+def _definition_size(table: _CachedTable) -> int:
+    size = len(table.name)
+    for col in table.columns:
+        size += _COLUMN_OVERHEAD + len(col.name) + len(col.sql_type)
+        size += len(col.foreign_key_table or "") + len(col.foreign_key_column or "")
+    return size
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+import os
+
+from core import models
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional backend
+    msgpack = None
+
+# First byte of every encoded payload. Text values (no marker) are the JSON
+# written before serializers existed and keep loading as such.
+FORMAT_JSON = 1     # UTF-8 JSON from the json module
+FORMAT_ORJSON = 2   # same wire format, but only values orjson round-trips exactly
+FORMAT_MSGPACK = 3
+
+# Backend for new writes: "json", "orjson" or "msgpack". orjson payloads read
+# back with the json module too; msgpack ones need msgpack installed.
+ENV_SERIALIZER = "SQLGEN_SERIALIZER"
+
+
+class SerializerError(Exception):
+    """A payload cannot be decoded with the installed backends."""
+
+
+class JsonSerializer:
+    name = "json"
+    format_id = FORMAT_JSON
+
+    def dumps(self, value) -> bytes:
+        return bytes((FORMAT_JSON,)) + json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class OrjsonSerializer(JsonSerializer):
+    name = "orjson"
+    format_id = FORMAT_ORJSON
+
+    def dumps(self, value) -> bytes:
+        try:
+            return bytes((self.format_id,)) + orjson.dumps(value)
+        except TypeError:
+            # Values orjson refuses (e.g. integers beyond 64 bits): plain JSON,
+            # which is also read back with the json module.
+            return JsonSerializer.dumps(self, value)
+
+
+class MsgpackSerializer:
+    name = "msgpack"
+    format_id = FORMAT_MSGPACK
+
+    def dumps(self, value) -> bytes:
+        return bytes((self.format_id,)) + msgpack.packb(value, use_bin_type=True)
+
+
+def available_serializers() -> list[str]:
+    names = ["json"]
+    if orjson is not None:
+        names.append("orjson")
+    if msgpack is not None:
+        names.append("msgpack")
+    return names
+
+
+def get_serializer(name: str | None = None):
+    """Serializer called ``name``, or the fastest JSON one installed.
+
+    ``name`` defaults to the ``SQLGEN_SERIALIZER`` environment variable;
+    unknown or missing backends fall back to the default.
+    """
+    name = name or os.getenv(ENV_SERIALIZER)
+    if name == "msgpack" and msgpack is not None:
+        return MsgpackSerializer()
+    if name == "json" or orjson is None:
+        return JsonSerializer()
+    return OrjsonSerializer()
+
+
+def loads(data):
+    """Decode a payload written by any serializer, or legacy JSON text."""
+    if isinstance(data, str):
+        return json.loads(data)
+    format_id = data[0]
+    if format_id == FORMAT_ORJSON:
+        return orjson.loads(data[1:]) if orjson is not None else json.loads(data[1:])
+    if format_id == FORMAT_JSON:
+        return json.loads(data[1:])
+    if format_id == FORMAT_MSGPACK:
+        if msgpack is None:
+            raise SerializerError("Données au format msgpack, mais le module msgpack n'est pas installé")
+        return msgpack.unpackb(data[1:], raw=False)
+    if data[:1] in (b"[", b"{"):
+        # JSON stored as a blob without the marker
+        return json.loads(data)
+    raise SerializerError(f"Format de données inconnu: {format_id}")
+
+
+def column_to_dict(col: models.ColumnModel) -> dict:
+    """Plain dict of a column, without the deep copy done by ``dataclasses.asdict``."""
+    return {
+        "name": col.name,
+        "sql_type": col.sql_type,
+        "nullable": col.nullable,
+        "is_primary_key": col.is_primary_key,
+        "is_auto_increment": col.is_auto_increment,
+        "foreign_key_table": col.foreign_key_table,
+        "foreign_key_column": col.foreign_key_column,
+    }
+
+
+def column_from_dict(data: dict) -> models.ColumnModel:
+    return models.ColumnModel(
+        name=data["name"],
+        sql_type=data["sql_type"],
+        nullable=data.get("nullable", True),
+        is_primary_key=data.get("is_primary_key", False),
+        is_auto_increment=data.get("is_auto_increment", False),
+        foreign_key_table=data.get("foreign_key_table"),
+        foreign_key_column=data.get("foreign_key_column"),
+    )
@@ -1,17 +1,68 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import re
 import sqlite3
-from dataclasses import asdict
+import threading
+import zlib
+from dataclasses import dataclass
 
 from core import models
+from data import serializers
+from data.project_cache import ProjectCache
+from utils import profiling
+
+
+BUSY_TIMEOUT_S = 5.0  # wait for another app instance holding the write lock
+STATEMENT_CACHE_SIZE = 256
+# projects.format: 1 = whole project in payload_json, 2 = normalized tables/columns/row chunks.
+# Row chunks and journal payloads are data.serializers blobs (format byte + body);
+# chunks written as JSON text before that still load.
+PROJECT_FORMAT = 2
+# History retention defaults, overridable through set_history_retention().
+HISTORY_MAX_ENTRIES = 1000
+HISTORY_MAX_BYTES = 50 * 1024 * 1024  # compressed size of the stored scripts
+HISTORY_COMPRESSION_LEVEL = 6
+# Object names indexed for history search (tables, procedures, insert targets...).
+_SQL_OBJECT_NAME = re.compile(
+    r"\b(?:TABLE|PROCEDURE|PROC|FUNCTION|VIEW|DATABASE|INTO|UPDATE|FROM)\s+"
+    r"(?:IF\s+(?:NOT\s+)?EXISTS\s+)?([\[\]`\"\w.]+)",
+    re.IGNORECASE,
+)
 
 
 class Storage:
-    """SQLite-backed storage for offline projects."""
+    """SQLite-backed storage for offline projects.
+
+    Each thread keeps one long-lived connection in WAL mode; sqlite3 reuses
+    the prepared statement for every query string it has already seen on it.
 
-    def __init__(self, db_path: str) -> None:
+    Projects are normalized into tables, columns and row chunks of
+    ``models.ROW_CHUNK_SIZE`` rows. Saves only rewrite changed table
+    definitions and the chunks listed in ``TableModel.dirty_chunks``; loads
+    leave rows on disk until ``load_rows`` is called for a table. Parsed
+    projects and their loaded rows are kept in a size-bounded LRU
+    (``project_cache``), revalidated against ``updated_at`` on every load.
+
+    History scripts are stored once per content hash as zlib blobs; entries
+    only reference them. Object names found in each script are indexed with
+    FTS5 (or a LIKE fallback when the SQLite build lacks it).
+    """
+
+    def __init__(self, db_path: str, serializer: str | None = None) -> None:
+        # Bumped on every license key write so callers can cache derived state.
+        self.license_key_revision = 0
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        # table id -> signature of the definition last written/read, to skip unchanged tables
+        self._schema_signatures: dict[int, str] = {}
+        self._fts_enabled = False
+        self.project_cache = ProjectCache()
+        # Encodes row chunks and journal payloads; see data/serializers.py
+        self.serializer = serializers.get_serializer(serializer)
         try:
             self.db_path = self._resolve_db_path(db_path)
             self._init_db()
@@ -19,93 +70,247 @@ class Storage:
             # Handle any database initialization errors gracefully
             raise Exception(f"Impossible d'initialiser la base de données: {str(e)}")
 
-    def save_project(self, project: models.DatabaseProject) -> None:
-        """Upsert a project. Returns project id."""
+    @profiling.timed("storage.save_project")
+    def save_project(
+        self, project: models.DatabaseProject, raise_errors: bool = False, journal_epoch: int | None = None
+    ) -> None:
+        """Upsert a project, writing only modified tables and row chunks in one transaction.
+
+        With ``journal_epoch``, journal records up to that epoch (now part of
+        the saved project) are dropped in the same transaction.
+        """
         try:
-            payload = _project_to_payload(project)
-            with sqlite3.connect(self.db_path) as con:
+            name = project_key(project)
+            with self._connection() as con:
                 con.execute(
-                    "INSERT INTO projects(name, payload_json) VALUES(?, ?) "
-                    "ON CONFLICT(name) DO UPDATE SET payload_json=excluded.payload_json, updated_at=CURRENT_TIMESTAMP",
-                    (payload["name"], payload["payload_json"]),
+                    "INSERT INTO projects(name, payload_json, format) VALUES(?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET payload_json=excluded.payload_json, "
+                    "format=excluded.format, updated_at=CURRENT_TIMESTAMP",
+                    (name, _project_meta_json(project), PROJECT_FORMAT),
+                )
+                project_id = con.execute("SELECT id FROM projects WHERE name = ?", (name,)).fetchone()[0]
+                written = self._write_tables(con, project_id, project.tables)
+                self._index_project(con, project_id)
+                if journal_epoch is not None:
+                    con.execute("DELETE FROM project_journal WHERE epoch <= ?", (journal_epoch,))
+                con.commit()
+            self.project_cache.invalidate(project_id)
+            # Only record the new state once the transaction is committed.
+            for table, table_id, signature in written:
+                table.storage_id = table_id
+                table.row_count = len(table.rows) if table.rows_loaded else table.row_count
+                table.dirty_chunks.clear()
+                self._schema_signatures[table_id] = signature
+        except Exception:
+            # Silently handle project saving errors (the write queue wants them)
+            if raise_errors:
+                raise
+
+    @profiling.timed("storage.append_journal")
+    def append_journal(self, base_name: str, epoch: int, records: list[tuple[str, dict]], raise_errors: bool = False) -> None:
+        """Append crash-recovery records for unsaved edits (see controllers.journal)."""
+        if not records:
+            return
+        try:
+            with self._connection() as con:
+                con.executemany(
+                    "INSERT INTO project_journal(base_name, epoch, kind, payload_json) VALUES(?, ?, ?, ?)",
+                    [(base_name, epoch, kind, self.serializer.dumps(payload)) for kind, payload in records],
                 )
                 con.commit()
         except Exception:
-            # Silently handle project saving errors
+            if raise_errors:
+                raise
+
+    @profiling.timed("storage.read_journal")
+    def read_journal(self) -> list[dict]:
+        """Journal records in write order: ``{"base_name", "epoch", "kind", "payload"}``."""
+        try:
+            with self._connection() as con:
+                cur = con.execute("SELECT base_name, epoch, kind, payload_json FROM project_journal ORDER BY id")
+                return [
+                    {"base_name": r[0], "epoch": r[1], "kind": r[2], "payload": serializers.loads(r[3])}
+                    for r in cur.fetchall()
+                ]
+        except Exception:
+            return []
+
+    @profiling.timed("storage.clear_journal")
+    def clear_journal(self) -> None:
+        try:
+            with self._connection() as con:
+                con.execute("DELETE FROM project_journal")
+                con.commit()
+        except Exception:
             pass
 
-    def add_history(self, project_name: str, sql_content: str) -> None:
-        """Save generated SQL to history, keeping only the last 10 entries."""
+    @profiling.timed("storage.max_journal_epoch")
+    def max_journal_epoch(self) -> int:
+        try:
+            with self._connection() as con:
+                return con.execute("SELECT COALESCE(MAX(epoch), 0) FROM project_journal").fetchone()[0]
+        except Exception:
+            return 0
+
+    @profiling.timed("storage.add_history")
+    def add_history(self, project_name: str, sql_content: str, raise_errors: bool = False) -> None:
+        """Save generated SQL to history, then apply the retention limits."""
         if not sql_content.strip():
             return
-            
+
         try:
-            with sqlite3.connect(self.db_path) as con:
-                # Insert new entry
-                con.execute(
-                    "INSERT INTO history(project_name, sql_content) VALUES(?, ?)",
-                    (project_name or "Sans nom", sql_content)
-                )
-                
-                # Delete old entries to keep only 10
+            with self._connection() as con:
+                content_hash = self._store_history_blob(con, sql_content)
                 con.execute(
-                    """
-                    DELETE FROM history 
-                    WHERE id NOT IN (
-                        SELECT id FROM history ORDER BY created_at DESC LIMIT 10
-                    )
-                    """
+                    "INSERT INTO history_entries(project_name, content_hash) VALUES(?, ?)",
+                    (project_name or "Sans nom", content_hash)
                 )
+                self._apply_history_retention(con)
                 con.commit()
         except Exception:
             # Silently handle history saving errors
-            pass
+            if raise_errors:
+                raise
 
+    @profiling.timed("storage.delete_history_entry")
     def delete_history_entry(self, entry_id: int) -> None:
         """Delete a single history entry by ID."""
         try:
-            with sqlite3.connect(self.db_path) as con:
-                con.execute("DELETE FROM history WHERE id = ?", (entry_id,))
+            with self._connection() as con:
+                con.execute("DELETE FROM history_entries WHERE id = ?", (entry_id,))
+                self._delete_orphan_history_blobs(con)
                 con.commit()
         except Exception:
             pass
     
+    @profiling.timed("storage.clear_history")
     def clear_history(self) -> None:
         """Clear all history entries."""
         try:
-            with sqlite3.connect(self.db_path) as con:
-                con.execute("DELETE FROM history")
-                con.execute("DELETE FROM sqlite_sequence WHERE name='history'")
+            with self._connection() as con:
+                con.execute("DELETE FROM history_entries")
+                con.execute("DELETE FROM history_blobs")
+                if self._fts_enabled:
+                    con.execute("DELETE FROM history_fts")
+                con.execute("DELETE FROM sqlite_sequence WHERE name='history_entries'")
                 con.commit()
         except Exception:
             pass
 
-    def get_history(self) -> list[dict]:
-        """Retrieve the last 10 history entries."""
+    @profiling.timed("storage.get_history")
+    def get_history(self, limit: int = 100) -> list[dict]:
+        """Most recent history entries, metadata only (see ``get_history_content``)."""
         try:
-            with sqlite3.connect(self.db_path) as con:
-                cur = con.execute("SELECT id, project_name, sql_content, created_at FROM history ORDER BY created_at DESC")
+            with self._connection() as con:
+                cur = con.execute(
+                    "SELECT e.id, e.project_name, e.created_at, b.size FROM history_entries e "
+                    "JOIN history_blobs b ON b.hash = e.content_hash "
+                    "ORDER BY e.created_at DESC, e.id DESC LIMIT ?",
+                    (limit,),
+                )
                 rows = cur.fetchall()
-            return [{"id": r[0], "project_name": r[1], "sql_content": r[2], "created_at": r[3]} for r in rows]
+            return [_history_meta(r) for r in rows]
         except Exception:
             # Return empty history if there's an error
             return []
 
+    @profiling.timed("storage.get_history_content")
+    def get_history_content(self, entry_id: int) -> str | None:
+        """The SQL script of one history entry, or None if it no longer exists."""
+        try:
+            with self._connection() as con:
+                row = con.execute(
+                    "SELECT b.content FROM history_entries e JOIN history_blobs b ON b.hash = e.content_hash "
+                    "WHERE e.id = ?",
+                    (entry_id,),
+                ).fetchone()
+            return _decompress(row[0]) if row else None
+        except Exception:
+            return None
+
+    @profiling.timed("storage.search_history")
+    def search_history(self, query: str, limit: int = 100) -> list[dict]:
+        """History entries whose project, table or procedure names match ``query`` (prefix match)."""
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return self.get_history(limit)
+        try:
+            with self._connection() as con:
+                if self._fts_enabled:
+                    match = " ".join(f'"{t}"*' for t in terms)
+                    cur = con.execute(
+                        "SELECT e.id, e.project_name, e.created_at, b.size FROM history_entries e "
+                        "JOIN history_blobs b ON b.hash = e.content_hash "
+                        "WHERE e.content_hash IN (SELECT content_hash FROM history_fts WHERE history_fts MATCH ?) "
+                        "OR e.project_name LIKE ? "
+                        "ORDER BY e.created_at DESC, e.id DESC LIMIT ?",
+                        (match, f"%{query.strip()}%", limit),
+                    )
+                else:
+                    where = " AND ".join("(b.names LIKE ? OR e.project_name LIKE ?)" for _ in terms)
+                    params = [p for t in terms for p in (f"%{t}%", f"%{t}%")]
+                    cur = con.execute(
+                        "SELECT e.id, e.project_name, e.created_at, b.size FROM history_entries e "
+                        f"JOIN history_blobs b ON b.hash = e.content_hash WHERE {where} "
+                        "ORDER BY e.created_at DESC, e.id DESC LIMIT ?",
+                        (*params, limit),
+                    )
+                rows = cur.fetchall()
+            return [_history_meta(r) for r in rows]
+        except Exception:
+            return []
+
+    @profiling.timed("storage.get_history_retention")
+    def get_history_retention(self) -> tuple[int, int]:
+        """Return (max entries, max compressed bytes) kept in history."""
+        try:
+            with self._connection() as con:
+                values = dict(con.execute(
+                    "SELECT key, val FROM config WHERE key IN ('history_max_entries', 'history_max_bytes')"
+                ).fetchall())
+            return (
+                int(values.get("history_max_entries", HISTORY_MAX_ENTRIES)),
+                int(values.get("history_max_bytes", HISTORY_MAX_BYTES)),
+            )
+        except Exception:
+            return HISTORY_MAX_ENTRIES, HISTORY_MAX_BYTES
+
+    @profiling.timed("storage.set_history_retention")
+    def set_history_retention(self, max_entries: int | None = None, max_bytes: int | None = None) -> None:
+        """Change the history limits (``None`` keeps the current value) and prune right away."""
+        try:
+            with self._connection() as con:
+                for key, value in (("history_max_entries", max_entries), ("history_max_bytes", max_bytes)):
+                    if value is None:
+                        continue
+                    con.execute(
+                        "INSERT INTO config(key, val) VALUES(?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET val=excluded.val",
+                        (key, str(max(1, int(value)))),
+                    )
+                self._apply_history_retention(con)
+                con.commit()
+        except Exception:
+            pass
+
+    @profiling.timed("storage.load_project")
     def load_project(self, project_id: int) -> models.DatabaseProject:
+        """Load a project definition; rows stay on disk until ``load_rows``."""
         try:
-            with sqlite3.connect(self.db_path) as con:
-                cur = con.execute("SELECT payload_json FROM projects WHERE id = ?", (project_id,))
+            with self._connection() as con:
+                cur = con.execute("SELECT id, payload_json, updated_at FROM projects WHERE id = ?", (project_id,))
                 row = cur.fetchone()
-            if not row:
-                return models.DatabaseProject(database_name="")
-            return _payload_to_project(row[0])
+                if not row:
+                    return models.DatabaseProject(database_name="")
+                return self._cached_read_project(con, *row)
         except Exception:
             # Return empty project if there's an error
             return models.DatabaseProject(database_name="")
 
+    @profiling.timed("storage.list_projects")
     def list_projects(self) -> list[dict]:
         try:
-            with sqlite3.connect(self.db_path) as con:
+            with self._connection() as con:
                 cur = con.execute("SELECT id, name, updated_at FROM projects ORDER BY updated_at DESC")
                 rows = cur.fetchall()
             return [{"id": r[0], "name": r[1], "updated_at": r[2]} for r in rows]
@@ -113,22 +318,108 @@ class Storage:
             # Return empty list if there's an error
             return []
 
+    @profiling.timed("storage.search_projects")
+    def search_projects(self, query: str = "", limit: int = 50, offset: int = 0, order: str = "updated") -> list[dict]:
+        """One page of the project catalog.
+
+        ``query`` matches word prefixes of the project name or of its table
+        names; ``order`` is ``"updated"`` (most recent first) or ``"name"``.
+        """
+        where, params = self._project_filter(query)
+        order_by = "p.name COLLATE NOCASE, p.id" if order == "name" else "p.updated_at DESC, p.id DESC"
+        try:
+            with self._connection() as con:
+                cur = con.execute(
+                    "SELECT p.id, p.name, p.updated_at, "
+                    "(SELECT COUNT(*) FROM project_tables t WHERE t.project_id = p.id) "
+                    f"FROM projects p {where} ORDER BY {order_by} LIMIT ? OFFSET ?",
+                    (*params, limit, offset),
+                )
+                rows = cur.fetchall()
+            return [{"id": r[0], "name": r[1], "updated_at": r[2], "table_count": r[3]} for r in rows]
+        except Exception:
+            return []
+
+    @profiling.timed("storage.count_projects")
+    def count_projects(self, query: str = "") -> int:
+        where, params = self._project_filter(query)
+        try:
+            with self._connection() as con:
+                return con.execute(f"SELECT COUNT(*) FROM projects p {where}", params).fetchone()[0]
+        except Exception:
+            return 0
+
+    @profiling.timed("storage.delete_project")
+    def delete_project(self, project_id: int) -> str | None:
+        """Delete a project and its tables; returns the name it was stored under (None if nothing was deleted)."""
+        try:
+            with self._connection() as con:
+                row = con.execute("SELECT name FROM projects WHERE id = ?", (project_id,)).fetchone()
+                if not row:
+                    return None
+                table_ids = [r[0] for r in con.execute("SELECT id FROM project_tables WHERE project_id = ?", (project_id,))]
+                for table_id in table_ids:
+                    self._delete_table(con, table_id)
+                if self._fts_enabled:
+                    con.execute("DELETE FROM project_fts WHERE project_id = ?", (project_id,))
+                con.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+                con.commit()
+            self.project_cache.invalidate(project_id)
+            return row[0]
+        except Exception:
+            return None
+
+    @profiling.timed("storage.load_project_by_name")
     def load_project_by_name(self, name: str) -> models.DatabaseProject:
         try:
-            with sqlite3.connect(self.db_path) as con:
-                cur = con.execute("SELECT payload_json FROM projects WHERE name = ?", (name,))
+            with self._connection() as con:
+                cur = con.execute("SELECT id, payload_json, updated_at FROM projects WHERE name = ?", (name,))
                 row = cur.fetchone()
-            if not row:
-                return models.DatabaseProject(database_name="")
-            return _payload_to_project(row[0])
+                if not row:
+                    return models.DatabaseProject(database_name="")
+                return self._cached_read_project(con, *row)
         except Exception:
             # Return empty project if there's an error
             return models.DatabaseProject(database_name="")
 
+    @profiling.timed("storage.load_rows")
+    def load_rows(self, table: models.TableModel) -> None:
+        """Fetch the rows of a lazily loaded table (no-op once loaded)."""
+        if table.rows_loaded:
+            return
+        if table.storage_id is None:
+            table.rows_loaded = True
+            return
+        cached = self.project_cache.rows(table.storage_id)
+        if cached is not None:
+            table.rows = cached
+            table.row_count = len(cached)
+            table.rows_loaded = True
+            return
+        try:
+            with self._connection() as con:
+                cur = con.execute(
+                    "SELECT rows_json FROM project_rows WHERE table_id = ? ORDER BY chunk_index",
+                    (table.storage_id,),
+                )
+                rows: list[dict] = []
+                size = 0
+                for (chunk,) in cur:
+                    rows.extend(serializers.loads(chunk))
+                    size += len(chunk)
+            self.project_cache.put_rows(table.storage_id, rows, size)
+            table.rows = rows
+            table.row_count = len(rows)
+            table.rows_loaded = True
+        except Exception:
+            # Leave the table unloaded so a later save cannot drop its rows
+            pass
+
+    @profiling.timed("storage.get_license_key")
     def get_license_key(self) -> str | None:
         """Retrieve the saved license key if any."""
         try:
-            with sqlite3.connect(self.db_path) as con:
+            with self._connection() as con:
                 cur = con.execute("SELECT val FROM config WHERE key = 'license_key'")
                 row = cur.fetchone()
             return row[0] if row else None
@@ -136,34 +427,63 @@ class Storage:
             # Return None if there's an error accessing the license key
             return None
 
+    @profiling.timed("storage.set_license_key")
     def set_license_key(self, key: str) -> None:
         """Save the license key."""
         try:
-            with sqlite3.connect(self.db_path) as con:
+            with self._connection() as con:
                 con.execute(
                     "INSERT INTO config(key, val) VALUES('license_key', ?) "
                     "ON CONFLICT(key) DO UPDATE SET val=excluded.val",
                     (key,)
                 )
                 con.commit()
+            self.license_key_revision += 1
         except Exception:
             # Silently handle license setting errors
             pass
 
+    @profiling.timed("storage.get_machine_fingerprint")
+    def get_machine_fingerprint(self) -> str | None:
+        """Retrieve the persisted (signed) machine fingerprint record if any."""
+        try:
+            with self._connection() as con:
+                cur = con.execute("SELECT val FROM config WHERE key = 'machine_fingerprint'")
+                row = cur.fetchone()
+            return row[0] if row else None
+        except Exception:
+            return None
+
+    @profiling.timed("storage.set_machine_fingerprint")
+    def set_machine_fingerprint(self, record: str) -> None:
+        """Persist the signed machine fingerprint record."""
+        try:
+            with self._connection() as con:
+                con.execute(
+                    "INSERT INTO config(key, val) VALUES('machine_fingerprint', ?) "
+                    "ON CONFLICT(key) DO UPDATE SET val=excluded.val",
+                    (record,)
+                )
+                con.commit()
+        except Exception:
+            pass
+
+    @profiling.timed("storage.get_theme")
     def get_theme(self) -> str:
         """Retrieve the saved theme name, defaults to 'Clair'."""
         try:
-            with sqlite3.connect(self.db_path) as con:
+            with self._connection() as con:
                 cur = con.execute("SELECT val FROM config WHERE key = 'theme'")
                 row = cur.fetchone()
             return row[0] if row else "Clair"
         except Exception:
             return "Clair"
 
-    def set_theme(self, theme_name: str) -> None:
+    @profiling.timed("storage.set_theme")
+    def set_theme(self, theme_name: str, raise_errors: bool = False) -> None:
         """Save the theme name."""
         try:
-            with sqlite3.connect(self.db_path) as con:
+            with self._connection() as con:
                 con.execute(
                     "INSERT INTO config(key, val) VALUES('theme', ?) "
                     "ON CONFLICT(key) DO UPDATE SET val=excluded.val",
@@ -171,12 +491,284 @@ class Storage:
                 )
                 con.commit()
         except Exception:
-            pass
+            if raise_errors:
+                raise
+
+    def close(self) -> None:
+        """Close every connection opened by this storage (call on application exit)."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for con in connections:
+            try:
+                con.close()
+            except Exception:
+                pass
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening and tuning it on first use."""
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(
+                self.db_path,
+                timeout=BUSY_TIMEOUT_S,
+                cached_statements=STATEMENT_CACHE_SIZE,
+                # Only used by its own thread; close() may run from another one.
+                check_same_thread=False,
+            )
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+            con.execute(f"PRAGMA busy_timeout={int(BUSY_TIMEOUT_S * 1000)}")
+            self._local.con = con
+            with self._connections_lock:
+                self._connections.append(con)
+        return con
+
+    def _store_history_blob(self, con: sqlite3.Connection, sql_content: str) -> str:
+        """Insert the compressed script unless an identical one is already stored."""
+        data = sql_content.encode("utf-8")
+        content_hash = hashlib.sha256(data).hexdigest()
+        if con.execute("SELECT 1 FROM history_blobs WHERE hash = ?", (content_hash,)).fetchone():
+            return content_hash
+        blob = zlib.compress(data, HISTORY_COMPRESSION_LEVEL)
+        names = " ".join(_sql_object_names(sql_content))
+        con.execute(
+            "INSERT INTO history_blobs(hash, content, size, stored_size, names) VALUES(?, ?, ?, ?, ?)",
+            (content_hash, blob, len(data), len(blob), names),
+        )
+        if self._fts_enabled:
+            con.execute("INSERT INTO history_fts(content_hash, names) VALUES(?, ?)", (content_hash, names))
+        return content_hash
+
+    def _apply_history_retention(self, con: sqlite3.Connection) -> None:
+        """Drop the oldest entries beyond the count limit, then until blobs fit the size limit."""
+        values = dict(con.execute(
+            "SELECT key, val FROM config WHERE key IN ('history_max_entries', 'history_max_bytes')"
+        ).fetchall())
+        max_entries = int(values.get("history_max_entries", HISTORY_MAX_ENTRIES))
+        max_bytes = int(values.get("history_max_bytes", HISTORY_MAX_BYTES))
+
+        removed = con.execute(
+            "DELETE FROM history_entries WHERE id IN ("
+            "SELECT id FROM history_entries ORDER BY created_at DESC, id DESC LIMIT -1 OFFSET ?)",
+            (max_entries,),
+        ).rowcount
+        if removed:
+            self._delete_orphan_history_blobs(con)
+
+        total = con.execute("SELECT COALESCE(SUM(stored_size), 0) FROM history_blobs").fetchone()[0]
+        if total <= max_bytes:
+            return
+        # Oldest first; always keep the newest entry even if it alone exceeds the limit.
+        cur = con.execute(
+            "SELECT e.id, e.content_hash, b.stored_size FROM history_entries e "
+            "JOIN history_blobs b ON b.hash = e.content_hash ORDER BY e.created_at, e.id"
+        )
+        entries = cur.fetchall()
+        refs: dict[str, int] = {}
+        for _, content_hash, _ in entries:
+            refs[content_hash] = refs.get(content_hash, 0) + 1
+        doomed = []
+        for entry_id, content_hash, stored_size in entries[:-1]:
+            if total <= max_bytes:
+                break
+            doomed.append((entry_id,))
+            refs[content_hash] -= 1
+            if not refs[content_hash]:
+                total -= stored_size
+        con.executemany("DELETE FROM history_entries WHERE id = ?", doomed)
+        self._delete_orphan_history_blobs(con)
+
+    def _delete_orphan_history_blobs(self, con: sqlite3.Connection) -> None:
+        orphans = "SELECT hash FROM history_blobs WHERE hash NOT IN (SELECT content_hash FROM history_entries)"
+        if self._fts_enabled:
+            con.execute(f"DELETE FROM history_fts WHERE content_hash IN ({orphans})")
+        con.execute(f"DELETE FROM history_blobs WHERE hash IN ({orphans})")
+
+    def _migrate_legacy_history(self, con: sqlite3.Connection) -> None:
+        """Move entries of the old plain-text ``history`` table into the blob store."""
+        if not con.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'history'").fetchone():
+            return
+        legacy = con.execute(
+            "SELECT project_name, sql_content, created_at FROM history ORDER BY created_at, id"
+        ).fetchall()
+        for project_name, sql_content, created_at in legacy:
+            content_hash = self._store_history_blob(con, sql_content)
+            con.execute(
+                "INSERT INTO history_entries(project_name, content_hash, created_at) VALUES(?, ?, ?)",
+                (project_name, content_hash, created_at),
+            )
+        con.execute("DROP TABLE history")
+
+    def _write_tables(self, con: sqlite3.Connection, project_id: int, tables: list[models.TableModel]) -> list[tuple]:
+        """Write the tables of a project inside the caller's transaction.
+
+        Returns ``(table, table_id, signature)`` for every table, to be applied
+        to the models after commit.
+        """
+        existing = {
+            r[0] for r in con.execute("SELECT id FROM project_tables WHERE project_id = ?", (project_id,))
+        }
+        written = []
+        for position, table in enumerate(tables):
+            signature = _table_signature(table)
+            table_id = table.storage_id
+            if table_id not in existing:
+                # New table, or one loaded from another project (saved under a new name).
+                row_count = len(table.rows) if table.rows_loaded else table.row_count
+                cur = con.execute(
+                    "INSERT INTO project_tables(project_id, position, name, row_count) VALUES(?, ?, ?, ?)",
+                    (project_id, position, table.name, row_count),
+                )
+                new_id = cur.lastrowid
+                self._write_columns(con, new_id, table)
+                if table.rows_loaded:
+                    self._write_chunks(con, new_id, table, range(_chunk_count(len(table.rows))))
+                elif table_id is not None:
+                    con.execute(
+                        "INSERT INTO project_rows(table_id, chunk_index, rows_json) "
+                        "SELECT ?, chunk_index, rows_json FROM project_rows WHERE table_id = ?",
+                        (new_id, table_id),
+                    )
+                written.append((table, new_id, signature))
+                continue
+
+            existing.discard(table_id)
+            con.execute(
+                "UPDATE project_tables SET position = ?, name = ? WHERE id = ? AND (position != ? OR name != ?)",
+                (position, table.name, table_id, position, table.name),
+            )
+            if self._schema_signatures.get(table_id) != signature:
+                con.execute("DELETE FROM project_columns WHERE table_id = ?", (table_id,))
+                self._write_columns(con, table_id, table)
+            if table.rows_loaded and (table.dirty_chunks or len(table.rows) != table.row_count):
+                n_chunks = _chunk_count(len(table.rows))
+                self._write_chunks(con, table_id, table, sorted(c for c in table.dirty_chunks if c < n_chunks))
+                con.execute("DELETE FROM project_rows WHERE table_id = ? AND chunk_index >= ?", (table_id, n_chunks))
+                con.execute("UPDATE project_tables SET row_count = ? WHERE id = ?", (len(table.rows), table_id))
+            written.append((table, table_id, signature))
+
+        # Tables removed from the project since the last save.
+        for table_id in existing:
+            self._delete_table(con, table_id)
+        return written
+
+    def _write_columns(self, con: sqlite3.Connection, table_id: int, table: models.TableModel) -> None:
+        con.executemany(
+            "INSERT INTO project_columns(table_id, position, name, sql_type, nullable, is_primary_key, "
+            "is_auto_increment, foreign_key_table, foreign_key_column) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(table_id, i, *_column_values(col)) for i, col in enumerate(table.columns)],
+        )
+
+    def _write_chunks(self, con: sqlite3.Connection, table_id: int, table: models.TableModel, chunk_indexes) -> None:
+        size = models.ROW_CHUNK_SIZE
+        con.executemany(
+            "INSERT INTO project_rows(table_id, chunk_index, rows_json) VALUES(?, ?, ?) "
+            "ON CONFLICT(table_id, chunk_index) DO UPDATE SET rows_json=excluded.rows_json",
+            (
+                (table_id, i, self.serializer.dumps(table.rows[i * size:(i + 1) * size]))
+                for i in chunk_indexes
+            ),
+        )
+
+    def _delete_table(self, con: sqlite3.Connection, table_id: int) -> None:
+        con.execute("DELETE FROM project_rows WHERE table_id = ?", (table_id,))
+        con.execute("DELETE FROM project_columns WHERE table_id = ?", (table_id,))
+        con.execute("DELETE FROM project_tables WHERE id = ?", (table_id,))
+        self._schema_signatures.pop(table_id, None)
+
+    def _cached_read_project(
+        self, con: sqlite3.Connection, project_id: int, meta_json: str, updated_at: str
+    ) -> models.DatabaseProject:
+        project = self.project_cache.get(project_id, updated_at)
+        if project is not None:
+            for table in project.tables:
+                self._schema_signatures[table.storage_id] = _table_signature(table)
+            return project
+        project = self._read_project(con, project_id, meta_json)
+        self.project_cache.put(project_id, updated_at, project)
+        return project
+
+    def _read_project(self, con: sqlite3.Connection, project_id: int, meta_json: str) -> models.DatabaseProject:
+        meta = json.loads(meta_json)
+        columns_by_table: dict[int, list[models.ColumnModel]] = {}
+        cur = con.execute(
+            "SELECT c.table_id, c.name, c.sql_type, c.nullable, c.is_primary_key, c.is_auto_increment, "
+            "c.foreign_key_table, c.foreign_key_column FROM project_columns c "
+            "JOIN project_tables t ON t.id = c.table_id WHERE t.project_id = ? ORDER BY c.table_id, c.position",
+            (project_id,),
+        )
+        for r in cur:
+            columns_by_table.setdefault(r[0], []).append(models.ColumnModel(
+                name=r[1], sql_type=r[2], nullable=bool(r[3]), is_primary_key=bool(r[4]),
+                is_auto_increment=bool(r[5]), foreign_key_table=r[6], foreign_key_column=r[7],
+            ))
+
+        tables = []
+        cur = con.execute(
+            "SELECT id, name, row_count FROM project_tables WHERE project_id = ? ORDER BY position", (project_id,)
+        )
+        for table_id, name, row_count in cur:
+            table = models.TableModel(
+                name=name, columns=columns_by_table.get(table_id, []),
+                storage_id=table_id, row_count=row_count, rows_loaded=row_count == 0,
+            )
+            self._schema_signatures[table_id] = _table_signature(table)
+            tables.append(table)
+
+        return models.DatabaseProject(
+            database_name=meta.get("database_name", ""),
+            dbms=meta.get("dbms", "SQL Server"),  # Default to SQL Server if missing
+            tables=tables,
+        )
+
+    def _project_filter(self, query: str) -> tuple[str, tuple]:
+        """WHERE clause (on ``projects p``) for a catalog search."""
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return "", ()
+        if self._fts_enabled:
+            match = " ".join(f'"{t}"*' for t in terms)
+            return "WHERE p.id IN (SELECT project_id FROM project_fts WHERE project_fts MATCH ?)", (match,)
+        clauses, params = [], []
+        for t in terms:
+            clauses.append(
+                "(p.name LIKE ? OR EXISTS (SELECT 1 FROM project_tables t WHERE t.project_id = p.id AND t.name LIKE ?))"
+            )
+            params += [f"{t}%", f"{t}%"]
+        return "WHERE " + " AND ".join(clauses), tuple(params)
+
+    def _index_project(self, con: sqlite3.Connection, project_id: int) -> None:
+        """Refresh the catalog search entry (project name + table names)."""
+        if not self._fts_enabled:
+            return
+        name, table_names = con.execute(
+            "SELECT p.name, (SELECT group_concat(t.name, ' ') FROM project_tables t WHERE t.project_id = p.id) "
+            "FROM projects p WHERE p.id = ?",
+            (project_id,),
+        ).fetchone()
+        con.execute("DELETE FROM project_fts WHERE project_id = ?", (project_id,))
+        con.execute(
+            "INSERT INTO project_fts(project_id, name, table_names) VALUES(?, ?, ?)",
+            (project_id, name, table_names or ""),
+        )
+
+    def _migrate_legacy_projects(self, con: sqlite3.Connection) -> None:
+        """Convert projects saved as a single JSON payload to the normalized layout."""
+        legacy = con.execute("SELECT id, payload_json FROM projects WHERE format < ?", (PROJECT_FORMAT,)).fetchall()
+        for project_id, payload_json in legacy:
+            project = _payload_to_project(payload_json)
+            self._write_tables(con, project_id, project.tables)
+            con.execute(
+                "UPDATE projects SET payload_json = ?, format = ? WHERE id = ?",
+                (_project_meta_json(project), PROJECT_FORMAT, project_id),
+            )
+            self._index_project(con, project_id)
 
     def _init_db(self) -> None:
         try:
             os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
-            with sqlite3.connect(self.db_path) as con:
+            with self._connection() as con:
                 con.execute(
                     """
                     CREATE TABLE IF NOT EXISTS config (
@@ -196,16 +788,106 @@ class Storage:
                     )
                     """
                 )
+                if "format" not in {r[1] for r in con.execute("PRAGMA table_info(projects)")}:
+                    con.execute("ALTER TABLE projects ADD COLUMN format INTEGER NOT NULL DEFAULT 1")
                 con.execute(
                     """
-                    CREATE TABLE IF NOT EXISTS history (
+                    CREATE TABLE IF NOT EXISTS project_tables (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        project_id INTEGER NOT NULL,
+                        position INTEGER NOT NULL,
+                        name TEXT NOT NULL,
+                        row_count INTEGER NOT NULL DEFAULT 0
+                    )
+                    """
+                )
+                con.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_project_tables_project ON project_tables(project_id, position)"
+                )
+                con.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS project_columns (
+                        table_id INTEGER NOT NULL,
+                        position INTEGER NOT NULL,
+                        name TEXT NOT NULL,
+                        sql_type TEXT NOT NULL,
+                        nullable INTEGER NOT NULL,
+                        is_primary_key INTEGER NOT NULL,
+                        is_auto_increment INTEGER NOT NULL,
+                        foreign_key_table TEXT,
+                        foreign_key_column TEXT,
+                        PRIMARY KEY (table_id, position)
+                    )
+                    """
+                )
+                con.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS project_rows (
+                        table_id INTEGER NOT NULL,
+                        chunk_index INTEGER NOT NULL,
+                        rows_json TEXT NOT NULL,
+                        PRIMARY KEY (table_id, chunk_index)
+                    )
+                    """
+                )
+                con.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS project_journal (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        base_name TEXT NOT NULL,
+                        epoch INTEGER NOT NULL,
+                        kind TEXT NOT NULL,
+                        payload_json TEXT NOT NULL,
+                        created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+                    )
+                    """
+                )
+                con.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS history_blobs (
+                        hash TEXT PRIMARY KEY,
+                        content BLOB NOT NULL,
+                        size INTEGER NOT NULL,
+                        stored_size INTEGER NOT NULL,
+                        names TEXT NOT NULL DEFAULT ''
+                    )
+                    """
+                )
+                con.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS history_entries (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         project_name TEXT,
-                        sql_content TEXT NOT NULL,
+                        content_hash TEXT NOT NULL,
                         created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
                     )
                     """
                 )
+                con.execute("CREATE INDEX IF NOT EXISTS idx_history_created ON history_entries(created_at)")
+                con.execute("CREATE INDEX IF NOT EXISTS idx_history_hash ON history_entries(content_hash)")
+                try:
+                    con.execute(
+                        "CREATE VIRTUAL TABLE IF NOT EXISTS history_fts "
+                        "USING fts5(content_hash UNINDEXED, names, tokenize='unicode61')"
+                    )
+                    self._fts_enabled = True
+                except sqlite3.OperationalError:
+                    # SQLite built without FTS5: searches fall back to LIKE
+                    self._fts_enabled = False
+                con.execute("CREATE INDEX IF NOT EXISTS idx_projects_updated ON projects(updated_at)")
+                if self._fts_enabled:
+                    new_index = not con.execute(
+                        "SELECT 1 FROM sqlite_master WHERE name = 'project_fts'"
+                    ).fetchone()
+                    con.execute(
+                        "CREATE VIRTUAL TABLE IF NOT EXISTS project_fts "
+                        "USING fts5(project_id UNINDEXED, name, table_names, tokenize='unicode61')"
+                    )
+                    if new_index:
+                        for (project_id,) in con.execute("SELECT id FROM projects").fetchall():
+                            self._index_project(con, project_id)
+                self._migrate_legacy_history(con)
+                self._migrate_legacy_projects(con)
                 con.commit()
         except Exception as e:
             raise Exception(f"Impossible de créer les tables de la base de données: {str(e)}")
@@ -221,14 +903,96 @@ class Storage:
         return os.path.join(app_dir, db_path)
 
 
-def _project_to_payload(project: models.DatabaseProject) -> dict[str, str]:
-    # V1.0.1 stores one-table project, but payload supports multiple.
-    name = project.database_name.strip() or "default"
-    payload = asdict(project)
-    return {"name": name, "payload_json": json.dumps(payload, ensure_ascii=False)}
+@dataclass
+class ProjectSnapshot:
+    """Copy of a project taken on the Tk thread for a background save.
+
+    Row lists are copied (rows themselves are replaced, never mutated, by the
+    UI) and pending dirty chunks move to the copy, so edits made while the
+    save runs are tracked for the next one.
+    """
+
+    project: models.DatabaseProject
+    originals: list[models.TableModel]
+    journal_epoch: int | None = None  # journal records covered by this snapshot
+
+    @classmethod
+    def take(cls, project: models.DatabaseProject, journal_epoch: int | None = None) -> ProjectSnapshot:
+        tables = []
+        for t in project.tables:
+            tables.append(models.TableModel(
+                name=t.name, columns=list(t.columns), rows=list(t.rows),
+                storage_id=t.storage_id, rows_loaded=t.rows_loaded, row_count=t.row_count,
+                dirty_chunks=t.dirty_chunks,
+            ))
+            t.dirty_chunks = set()
+        copy = models.DatabaseProject(database_name=project.database_name, tables=tables, dbms=project.dbms)
+        return cls(copy, list(project.tables), journal_epoch)
+
+    def merge(self, newer: ProjectSnapshot) -> ProjectSnapshot:
+        """Coalesce with a newer snapshot of the same project that replaces this one."""
+        by_original = {id(orig): copy for orig, copy in zip(newer.originals, newer.project.tables)}
+        for orig, copy in zip(self.originals, self.project.tables):
+            target = by_original.get(id(orig))
+            if target is not None:
+                target.dirty_chunks |= copy.dirty_chunks
+        return newer
+
+    def apply(self) -> None:
+        """After a successful save: hand the storage ids back to the edited models."""
+        for orig, copy in zip(self.originals, self.project.tables):
+            orig.storage_id = copy.storage_id
+            orig.row_count = copy.row_count
+
+    def restore(self) -> None:
+        """After a failed save: the chunks are still dirty."""
+        for orig, copy in zip(self.originals, self.project.tables):
+            orig.dirty_chunks |= copy.dirty_chunks
+
+
+def project_key(project: models.DatabaseProject) -> str:
+    """Name a project is stored under."""
+    return project.database_name.strip() or "default"
+
+
+def _project_meta_json(project: models.DatabaseProject) -> str:
+    # Project-level fields only; tables live in project_tables/columns/rows.
+    return json.dumps({"database_name": project.database_name, "dbms": project.dbms}, ensure_ascii=False)
+
+
+def _column_values(col: models.ColumnModel) -> tuple:
+    return (
+        col.name, col.sql_type, int(col.nullable), int(col.is_primary_key), int(col.is_auto_increment),
+        col.foreign_key_table, col.foreign_key_column,
+    )
+
+
+def _table_signature(table: models.TableModel) -> str:
+    return json.dumps([_column_values(col) for col in table.columns], ensure_ascii=False)
+
+
+def _chunk_count(n_rows: int) -> int:
+    return -(-n_rows // models.ROW_CHUNK_SIZE)
+
+
+def _history_meta(row: tuple) -> dict:
+    return {"id": row[0], "project_name": row[1], "created_at": row[2], "size": row[3]}
+
+
+def _decompress(blob: bytes) -> str:
+    return zlib.decompress(blob).decode("utf-8")
+
+
+def _sql_object_names(sql_content: str) -> list[str]:
+    """Distinct object names referenced by a script, without quoting or schema prefix."""
+    names = dict.fromkeys(
+        m.group(1).strip('[]`"').split(".")[-1].strip('[]`"') for m in _SQL_OBJECT_NAME.finditer(sql_content)
+    )
+    return [n for n in names if n]
 
 
 def _payload_to_project(payload_json: str) -> models.DatabaseProject:
+    """Parse a format 1 payload (whole project as JSON), used by the migration."""
     try:
         data = json.loads(payload_json)
         tables = []
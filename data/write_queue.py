@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+POLL_MS = 50  # how often the Tk side picks up finished writes
+
+
+@dataclass
+class _Job:
+    key: Any
+    fn: Callable[[Any], Any]
+    payload: Any
+    merge: Callable[[Any, Any], Any] | None = None
+    on_done: list = field(default_factory=list)
+    on_error: list = field(default_factory=list)
+
+
+class WriteQueue:
+    """Single background writer so storage writes never run on the Tk thread.
+
+    Jobs submitted with the same ``key`` while still waiting are coalesced
+    into one (the newest payload wins, or ``merge(old, new)`` decides).
+    Completion and error callbacks are collected by the writer thread and
+    run on the Tk thread by an ``after()`` loop started with ``attach``,
+    following the rule that only the main thread touches widgets.
+
+    ``on_done(result)`` and ``on_error(exception, payload)`` are per job;
+    every failure is also reported to ``error_handler`` so it is never lost.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[Any, _Job] = {}
+        self._order: queue.Queue = queue.Queue()
+        self._completed: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._busy = 0  # submitted but not finished
+        self._thread: threading.Thread | None = None
+        self._widget = None
+        # Called on the Tk thread with (exception, key) for every failed job.
+        self.error_handler: Callable[[Exception, Any], None] | None = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="storage-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, key, fn: Callable[[Any], Any], payload=None, *, merge=None, on_done=None, on_error=None) -> None:
+        """Queue ``fn(payload)``; ``key=None`` disables coalescing for this job."""
+        self.start()
+        with self._lock:
+            job = self._pending.get(key) if key is not None else None
+            if job is not None:
+                # Still waiting: fold the new request into it.
+                job.payload = merge(job.payload, payload) if merge else payload
+                job.fn = fn
+            else:
+                job = _Job(key, fn, payload, merge)
+                if key is not None:
+                    self._pending[key] = job
+                self._busy += 1
+                self._order.put(job)
+            if on_done:
+                job.on_done.append(on_done)
+            if on_error:
+                job.on_error.append(on_error)
+
+    def attach(self, widget) -> None:
+        """Deliver callbacks on ``widget``'s event loop (call from the Tk thread)."""
+        self._widget = widget
+        self._poll()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every queued write is done, then run pending callbacks. False on timeout."""
+        with self._idle:
+            done = self._idle.wait_for(lambda: self._busy == 0, timeout)
+        self.dispatch_completed()
+        return done
+
+    def close(self, timeout: float | None = None) -> bool:
+        """Flush on exit: wait for the writes, report errors, drop UI callbacks."""
+        self._widget = None
+        with self._idle:
+            done = self._idle.wait_for(lambda: self._busy == 0, timeout)
+        while True:
+            try:
+                job, result, error = self._completed.get_nowait()
+            except queue.Empty:
+                break
+            if error is not None:
+                # The window is gone: the console is the only place left to report it.
+                print(f"WARN: écriture en arrière-plan échouée ({job.key}): {error}")
+        if self._thread is not None:
+            self._order.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+        return done
+
+    def dispatch_completed(self) -> None:
+        """Run the callbacks of finished jobs on the calling (Tk) thread."""
+        while True:
+            try:
+                job, result, error = self._completed.get_nowait()
+            except queue.Empty:
+                return
+            if error is None:
+                for cb in job.on_done:
+                    _safe_call(cb, result)
+                continue
+            for cb in job.on_error:
+                _safe_call(cb, error, job.payload)
+            if self.error_handler:
+                _safe_call(self.error_handler, error, job.key)
+            else:
+                print(f"WARN: écriture en arrière-plan échouée ({job.key}): {error}")
+
+    def _poll(self) -> None:
+        widget = self._widget
+        if widget is None:
+            return
+        try:
+            if not widget.winfo_exists():
+                return
+        except Exception:
+            return
+        self.dispatch_completed()
+        widget.after(POLL_MS, self._poll)
+
+    def _run(self) -> None:
+        while True:
+            job = self._order.get()
+            if job is None:
+                return
+            with self._lock:
+                # From here on, new submits with this key start a fresh job.
+                if job.key is not None and self._pending.get(job.key) is job:
+                    del self._pending[job.key]
+                fn, payload = job.fn, job.payload
+            result, error = None, None
+            try:
+                result = fn(payload)
+            except Exception as e:
+                error = e
+            self._completed.put((job, result, error))
+            with self._idle:
+                self._busy -= 1
+                self._idle.notify_all()
+
+
+def _safe_call(cb, *args) -> None:
+    try:
+        cb(*args)
+    except Exception as e:
+        print(f"WARN: callback d'écriture en erreur: {e}")
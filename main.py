@@ -1,20 +1,26 @@
+import time
+
+_PROCESS_START = time.perf_counter()
+
 import os
 import sys
 import tkinter as tk
 from tkinter import messagebox
+
 try:
     from ctypes import windll
     windll.shcore.SetProcessDpiAwareness(1)
 except:
     pass
 
-from controllers.app_controller import AppController
-from data.storage import Storage
-from ui.main_window import MainWindow
-from ui.theme_manager import ThemeManager
-from utils.update_manager import check_for_updates
 from version import VERSION
 
+ACTIVATION_POLL_MS = 30  # how often the start screen checks whether the license check finished
+
+# Heavy modules (UI frames, Faker, dialogs, update checker) are imported on
+# first use so the window shows up as early as possible.
+
+
 def run_app() -> None:
     try:
         root = tk.Tk()
@@ -46,15 +52,37 @@ def run_app() -> None:
             except:
                 pass
 
+        from controllers.app_controller import AppController
+        from data.storage import Storage
+        from data.write_queue import WriteQueue
+        from ui.theme_manager import ThemeManager
+
         storage = Storage(db_path="sql_generator.db")
-        controller = AppController(storage=storage)
+        writer = WriteQueue()
+        writer.attach(root)
+        controller = AppController(storage=storage, writer=writer)
+        # Resolve the hardware fingerprint while the rest of the UI loads
+        controller.prefetch_machine_code()
         
         # Apply theme early
         theme_manager = ThemeManager()
         theme_manager.apply_theme(controller.get_theme(), root)
         
-        # Check for updates in background
-        check_for_updates(VERSION)
+        # Check for updates once the UI is up (keeps urllib/webbrowser off the startup path)
+        root.after(1500, _check_updates_deferred)
+
+        def show_start():
+            if controller.activation_pending:
+                root.after(ACTIVATION_POLL_MS, show_start)
+                return
+            placeholder.destroy()
+            # Verified by now: is_activated() returns the cached result
+            if not controller.is_activated():
+                from ui.license_page import LicensePage
+                page = LicensePage(root, controller, on_success=launch_main)
+                page.pack(fill="both", expand=True)
+            else:
+                launch_main()
 
         def launch_main():
             # Clear root
@@ -63,16 +91,22 @@ def run_app() -> None:
             
             # Reset menu if any
             root.config(menu="")
+            from ui.main_window import MainWindow
             MainWindow(master=root, controller=controller)
+            # First frame = the main window drawn, not the license placeholder
+            from utils.diagnostics import install_first_frame_probe
+            install_first_frame_probe(root, _PROCESS_START)
 
-        if not controller.is_activated():
-            from ui.license_page import LicensePage
-            page = LicensePage(root, controller, on_success=launch_main)
-            page.pack(fill="both", expand=True)
-        else:
-            launch_main()
+        # The license check may probe the hardware: never on the Tk thread
+        controller.prefetch_activation()
+        placeholder = tk.Label(root, text="Vérification de la licence…")
+        placeholder.pack(expand=True)
+        show_start()
 
         root.mainloop()
+        # Pending saves must reach the disk before the process exits.
+        writer.close()
+        storage.close()
     except Exception as e:
         try:
             messagebox.showerror("Erreur Critique", f"Impossible de lancer l'application.\n{e}")
@@ -80,5 +114,13 @@ def run_app() -> None:
             print(f"Critical error: {e}")
         sys.exit(1)
 
+def _check_updates_deferred() -> None:
+    from utils.update_manager import check_for_updates
+    check_for_updates(VERSION)
+
+
 if __name__ == "__main__":
+    if "--diagnostics" in sys.argv:
+        from utils.diagnostics import run_diagnostics
+        sys.exit(run_diagnostics())
     run_app()
@@ -3,9 +3,12 @@ from __future__ import annotations
 import tkinter as tk
 from tkinter import ttk
 
+# Large scripts are inserted into the Text widget in slices so the dialog stays responsive.
+INSERT_CHUNK_CHARS = 200_000
+
 
 class HistoryDialog(tk.Toplevel):
-    """Dialog to view last 10 generated SQL scripts."""
+    """Dialog to view and search previously generated SQL scripts."""
 
     def __init__(self, master, history: list[dict], controller=None) -> None:
         super().__init__(master)
@@ -24,7 +27,9 @@ class HistoryDialog(tk.Toplevel):
         self.geometry('+%d+%d' % (x, y))
         self.deiconify()
 
-        self.history = history
+        self.history = history  # metadata only; content is fetched on selection
+        self._content = ""
+        self._load_token = 0
         self._build_ui()
         from ui.theme_manager import ThemeManager
         ThemeManager().apply_theme(ThemeManager().current_theme.name, self)
@@ -38,21 +43,33 @@ class HistoryDialog(tk.Toplevel):
         left_frame = ttk.Frame(paned)
         paned.add(left_frame, weight=1)
 
-        ttk.Label(left_frame, text="Dernières générations (max 10)", font=("Segoe UI", 10, "bold")).pack(anchor="w", pady=(0, 4))
+        ttk.Label(left_frame, text="Dernières générations", font=("Segoe UI", 10, "bold")).pack(anchor="w", pady=(0, 4))
+
+        # Search by project, table or procedure name
+        search_box = ttk.Frame(left_frame)
+        search_box.pack(fill="x", pady=(0, 4))
+        ttk.Label(search_box, text="🔎").pack(side="left")
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_box, textvariable=self.search_var)
+        search_entry.pack(side="left", fill="x", expand=True, padx=(4, 0))
+        search_entry.bind("<Return>", lambda e: self._on_search())
+        ttk.Button(search_box, text="Rechercher", command=self._on_search).pack(side="left", padx=(4, 0))
         
-        self.tree = ttk.Treeview(left_frame, columns=("id", "project", "date"), show="headings", selectmode="browse")
+        self.tree = ttk.Treeview(left_frame, columns=("id", "project", "date", "size"), show="headings", selectmode="browse")
         self.tree.heading("id", text="ID")
         self.tree.heading("project", text="Projet")
         self.tree.heading("date", text="Date")
+        self.tree.heading("size", text="Taille")
         
         self.tree.column("id", width=40, anchor="center")
-        self.tree.column("project", width=150, anchor="w")
-        self.tree.column("date", width=150, anchor="w")
+        self.tree.column("project", width=130, anchor="w")
+        self.tree.column("date", width=130, anchor="w")
+        self.tree.column("size", width=70, anchor="e")
         
         self.tree.pack(fill="both", expand=True)
         self.tree.bind("<<TreeviewSelect>>", self._on_select)
         
-        if self.controller and self.controller.is_activated():
+        if self.controller and self.controller.activated:
             btn_box = ttk.Frame(left_frame)
             btn_box.pack(fill="x", pady=(5, 0))
             ttk.Button(btn_box, text="Supprimer sélection", command=self._delete_selected).pack(side="left", fill="x", expand=True, padx=(0, 2))
@@ -76,13 +93,26 @@ class HistoryDialog(tk.Toplevel):
         
         self.text.configure(state="disabled")
 
-        # Load data
+        self._populate()
+
+    def _populate(self) -> None:
+        self.tree.delete(*self.tree.get_children())
         for entry in self.history:
-            self.tree.insert("", "end", values=(entry["id"], entry["project_name"], entry["created_at"]), tags=(str(entry["id"]),))
+            values = (entry["id"], entry["project_name"], entry["created_at"], _format_size(entry.get("size", 0)))
+            self.tree.insert("", "end", values=values, tags=(str(entry["id"]),))
 
         if self.history:
             first_item = self.tree.get_children()[0]
             self.tree.selection_set(first_item)
+        else:
+            self._show_content("")
+
+    def _on_search(self) -> None:
+        if not self.controller:
+            return
+        query = self.search_var.get().strip()
+        self.history = self.controller.search_history(query) if query else self.controller.get_history()
+        self._populate()
 
     def _on_select(self, event) -> None:
         selection = self.tree.selection()
@@ -91,18 +121,34 @@ class HistoryDialog(tk.Toplevel):
             
         item = self.tree.item(selection[0])
         entry_id = item["values"][0]
-        
-        # Find entry in history
-        entry = next((e for e in self.history if e["id"] == entry_id), None)
-        if entry:
-            self.text.configure(state="normal")
-            self.text.delete("1.0", tk.END)
-            self.text.insert(tk.END, entry["sql_content"])
-            self.text.insert(tk.END, entry["sql_content"])
-            self.text.configure(state="disabled")
+        content = self.controller.get_history_content(entry_id) if self.controller else None
+        self._show_content(content or "")
+
+    def _show_content(self, content: str) -> None:
+        """Replace the preview; big scripts are appended slice by slice from the event loop."""
+        self._load_token += 1
+        self._content = content
+        self.text.configure(state="normal")
+        self.text.delete("1.0", tk.END)
+        self.text.configure(state="disabled")
+        self._insert_chunk(self._load_token, 0)
+
+    def _insert_chunk(self, token: int, offset: int) -> None:
+        # A newer selection superseded this load
+        if token != self._load_token or not self.winfo_exists():
+            return
+        chunk = self._content[offset:offset + INSERT_CHUNK_CHARS]
+        if not chunk:
+            return
+        self.text.configure(state="normal")
+        self.text.insert(tk.END, chunk)
+        self.text.configure(state="disabled")
+        if offset + INSERT_CHUNK_CHARS < len(self._content):
+            self.after(1, self._insert_chunk, token, offset + INSERT_CHUNK_CHARS)
 
     def _copy_sql(self) -> None:
-        content = self.text.get("1.0", tk.END).strip()
+        # Copy the full script even while the preview is still being filled
+        content = self._content.strip()
         if content:
             self.clipboard_clear()
             self.clipboard_append(content)
@@ -121,9 +167,7 @@ class HistoryDialog(tk.Toplevel):
         if tk.messagebox.askyesno("Confirmer", "Supprimer cette entrée ?"):
             self.controller.delete_history_entry(entry_id)
             self.tree.delete(selection[0])
-            self.text.configure(state="normal")
-            self.text.delete("1.0", tk.END)
-            self.text.configure(state="disabled")
+            self._show_content("")
             
             # Remove from local list
             self.history = [h for h in self.history if h["id"] != entry_id]
@@ -135,8 +179,14 @@ class HistoryDialog(tk.Toplevel):
             self.controller.clear_history()
             # Clear UI
             self.tree.delete(*self.tree.get_children())
-            self.text.configure(state="normal")
-            self.text.delete("1.0", tk.END)
-            self.text.configure(state="disabled")
+            self._show_content("")
             self.history = []
             tk.messagebox.showinfo("Succès", "Historique effacé.")
+
+
+def _format_size(size: int) -> str:
+    if size < 1024:
+        return f"{size} o"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} Ko"
+    return f"{size / (1024 * 1024):.1f} Mo"
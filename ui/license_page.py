@@ -99,12 +99,24 @@ class LicensePage(ttk.Frame):
 
     def _load_machine_code(self):
         try:
-            self._current_machine_code = self.controller.get_machine_code()
-            self.machine_code_label.config(text=self._current_machine_code)
-            self.copy_btn.config(state="normal")
+            # Computed on a worker thread; poll so Tk is only touched from the main thread
+            self.controller.prefetch_machine_code()
+            self._poll_machine_code()
         except Exception as e:
             self.machine_code_label.config(text="Erreur de détection matérielle")
 
+    def _poll_machine_code(self):
+        code = self.controller.cached_machine_code
+        if not code and self.controller.machine_code_pending:
+            self.after(50, self._poll_machine_code)
+            return
+        if not code:
+            # Lookup finished without caching: use the controller fallback
+            code = self.controller.get_machine_code()
+        self._current_machine_code = code
+        self.machine_code_label.config(text=self._current_machine_code)
+        self.copy_btn.config(state="normal")
+
     def _copy_machine_code(self):
         try:
             if not self._current_machine_code:
@@ -1,13 +1,13 @@
+import time
 import tkinter as tk
 from tkinter import messagebox, simpledialog, ttk
 
 from controllers.app_controller import AppController
-from ui.history_dialog import HistoryDialog
-from ui.license_dialog import LicenseDialog
 from ui.sample_data_frame import SampleDataFrame
 from ui.sql_preview_frame import SQLPreviewFrame
 from ui.table_definition_frame import TableDefinitionFrame
 from ui.theme_manager import ThemeManager, THEMES
+from utils import profiling
 
 
 class MainWindow(ttk.Frame):
@@ -26,6 +26,22 @@ class MainWindow(ttk.Frame):
             "Update": tk.BooleanVar(value=False),
             "Delete": tk.BooleanVar(value=False),
         }
+        self.profiling_var = tk.BooleanVar(value=profiling.is_enabled())
+        self.memory_tracing_var = tk.BooleanVar(value=profiling.is_memory_tracing())
+        self.status_var = tk.StringVar(value="")
+        # Edits are journaled at idle time; off until a crash recovery has been offered.
+        from controllers.autosave import Autosave
+        self.autosave = Autosave(self, controller, on_error=self._on_autosave_error)
+        self.autosave.enabled = False
+        # Preview regeneration: bursts of edits coalesce into one run, skipped if nothing changed.
+        from ui.refresh_scheduler import RefreshScheduler
+        self.refresh_scheduler = RefreshScheduler(self, self._render_outputs, key=self._preview_inputs)
+        # SQL is generated on a worker thread from a snapshot; only the newest result is shown.
+        from controllers.sql_worker import SqlWorker
+        self.sql_worker = SqlWorker(
+            self, on_result=self._show_outputs, on_error=self._on_generation_error, on_busy=self._on_generation_busy
+        )
+        self._refresh_started = 0.0
         self.pack(fill="both", expand=True)
         self.theme_manager = ThemeManager()
         self._setup_style()
@@ -38,11 +54,15 @@ class MainWindow(ttk.Frame):
         # keep standard colors if theme is dark.
         saved_theme = self.controller.get_theme()
         # If theme is not Clair and not premium, force fallback (though get_theme might return saved)
-        if saved_theme != "Clair" and not self.controller.is_activated():
+        if saved_theme != "Clair" and not self.controller.activated:
             saved_theme = "Clair"
         
         self.theme_manager.apply_theme(saved_theme, self.winfo_toplevel())
         
+        if self.controller.writer is not None:
+            self.controller.writer.error_handler = self._on_storage_error
+        self.bind("<Destroy>", self._on_destroy, add="+")
+        self.after_idle(self._offer_recovery)
         self._refresh_outputs()
 
     def _setup_style(self) -> None:
@@ -52,7 +72,7 @@ class MainWindow(ttk.Frame):
 
     def _change_theme(self, theme_name: str) -> None:
         """Change application theme and save preference."""
-        if theme_name != "Clair" and not self.controller.is_activated():
+        if theme_name != "Clair" and not self.controller.activated:
             if messagebox.askyesno("Premium Requis", 
                 f"Le thème '{theme_name}' est réservé à la version Premium.\n\n"
                 "Souhaitez-vous activer votre licence maintenant pour y accéder ?"):
@@ -65,7 +85,7 @@ class MainWindow(ttk.Frame):
         # Refresh SQL Preview colors
         if hasattr(self, 'sql_preview_frame'):
             self.sql_preview_frame._configure_syntax_highlighting()
-            self._refresh_outputs()
+            self._refresh_outputs(force=True)
 
         # Refresh Manual Buttons (tk.Button)
         if hasattr(self, 'table_frame'):
@@ -74,7 +94,7 @@ class MainWindow(ttk.Frame):
     def _update_title(self) -> None:
         root = self.winfo_toplevel()
         try:
-            status = "PREMIUM" if self.controller.is_activated() else "STANDARD (Gratuit)"
+            status = "PREMIUM" if self.controller.activated else "STANDARD (Gratuit)"
         except Exception:
             status = "STANDARD"
         
@@ -97,6 +117,9 @@ class MainWindow(ttk.Frame):
         help_menu.add_command(label="Activer la licence…", command=self._show_license)
         help_menu.add_command(label="Afficher mon code machine", command=self._show_machine_code)
         help_menu.add_separator()
+        help_menu.add_checkbutton(label="Mode diagnostic (profilage)", variable=self.profiling_var, command=self._toggle_profiling)
+        help_menu.add_checkbutton(label="Suivi mémoire (tracemalloc)", variable=self.memory_tracing_var, command=self._toggle_memory_tracing)
+        help_menu.add_separator()
         from version import VERSION
         help_menu.add_command(label="Vérifier les mises à jour...", command=self._check_updates)
         help_menu.add_separator()
@@ -105,7 +128,7 @@ class MainWindow(ttk.Frame):
 
         theme_menu = tk.Menu(menubar, tearoff=False)
         for theme_name in THEMES:
-            prefix = "🔒 " if theme_name != "Clair" and not self.controller.is_activated() else ""
+            prefix = "🔒 " if theme_name != "Clair" and not self.controller.activated else ""
             theme_menu.add_command(
                 label=f"{prefix}{theme_name}", 
                 command=lambda t=theme_name: self._change_theme(t)
@@ -118,10 +141,11 @@ class MainWindow(ttk.Frame):
 
     def _show_license(self) -> None:
         try:
-            if self.controller.is_activated():
+            if self.controller.activated:
                 messagebox.showinfo("Licence", "Produit déjà activé (Version Premium).")
                 return
             
+            from ui.license_dialog import LicenseDialog
             dialog = LicenseDialog(self, self.controller)
             self.wait_window(dialog)
             if hasattr(dialog, 'success') and dialog.success:
@@ -150,12 +174,55 @@ class MainWindow(ttk.Frame):
         # For now, let's just trigger it.
         check_for_updates(VERSION)
 
+    def _toggle_profiling(self) -> None:
+        enabled = self.profiling_var.get()
+        profiling.set_enabled(enabled)
+        if enabled:
+            self.status_var.set(f"Profilage actif — journal : {profiling.output_dir()}")
+        else:
+            profiling.set_memory_tracing(False)
+            self.memory_tracing_var.set(False)
+            self.status_var.set("")
+
+    def _toggle_memory_tracing(self) -> None:
+        profiling.set_memory_tracing(self.memory_tracing_var.get())
+        # Memory tracing implies the timing log
+        self.profiling_var.set(profiling.is_enabled())
+        self._toggle_profiling()
+
+    def _on_project_saved(self) -> None:
+        self.status_var.set("Projet sauvegardé.")
+        messagebox.showinfo("Succès", "Projet sauvegardé avec succès.")
+
+    def _on_storage_error(self, error: Exception, key) -> None:
+        """Background write failures (queued saves, history, preferences)."""
+        self.status_var.set("Erreur d'enregistrement.")
+        what = "le projet" if isinstance(key, tuple) and key[0] == "project" else "les données"
+        messagebox.showerror("Erreur", f"Impossible d'enregistrer {what}: {error}")
+
+    def _on_autosave_error(self, error: Exception) -> None:
+        self._on_storage_error(error, ("project", self.controller.current_project.database_name.strip()))
+
+    def _on_destroy(self, event) -> None:
+        if event.widget is self:
+            self.refresh_scheduler.cancel()
+            self.sql_worker.close()
+            if self.autosave.enabled:
+                # Clean exit: fold the journal into the session's own project; an
+                # unsaved draft stays journaled and is offered back at the next start
+                self.autosave.on_error = None  # no dialogs while the window goes away
+                self.autosave.run_now(compact=True)
+            if self.controller.writer is not None and self.controller.writer.error_handler == self._on_storage_error:
+                self.controller.writer.error_handler = None
+            profiling.flush()
+
     def _show_history(self) -> None:
         try:
             history = self.controller.get_history()
             if not history:
                 messagebox.showinfo("Historique", "L'historique est vide.")
                 return
+            from ui.history_dialog import HistoryDialog
             HistoryDialog(self, history, controller=self.controller)
         except Exception as e:
             messagebox.showerror("Erreur", f"Impossible d'accéder à l'historique: {str(e)}")
@@ -171,21 +238,27 @@ class MainWindow(ttk.Frame):
             controller=self.controller,
             actions_vars=self.actions_vars, 
             on_actions_changed=self._refresh_outputs,
-            on_save_history=self.controller.add_to_history
+            on_save_history=self.controller.add_to_history,
+            flush_pending=self._flush_outputs,
         )
         self.sql_preview_frame.grid(row=0, column=1, sticky="nsew", padx=8, pady=8)
 
         self.table_frame = TableDefinitionFrame(
             master=self,
             controller=self.controller,
-            on_updated=self._refresh_outputs,
+            on_updated=self._on_project_changed,
             on_table_selected=self._on_table_selected,
         )
         self.table_frame.grid(row=0, column=0, sticky="nsew", padx=8, pady=8)
 
-        self.sample_data_frame = SampleDataFrame(master=self, controller=self.controller, on_updated=self._refresh_outputs)
+        self.sample_data_frame = SampleDataFrame(master=self, controller=self.controller, on_updated=self._on_project_changed)
         self.sample_data_frame.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=8, pady=8)
 
+        # Status bar (latency of the last preview refresh when profiling is on)
+        ttk.Label(self, textvariable=self.status_var, anchor="w", font=("Segoe UI", 8)).grid(
+            row=2, column=0, columnspan=2, sticky="ew", padx=8, pady=(0, 4)
+        )
+
     def _on_table_selected(self, table_idx: int) -> None:
         """Called when user selects a different table in the definition frame."""
         # Use the tables from table_frame directly, not from controller
@@ -199,13 +272,90 @@ class MainWindow(ttk.Frame):
         else:
             self.sample_data_frame.set_active_table(None)
 
-    def _refresh_outputs(self) -> None:
+    def _on_project_changed(self) -> None:
+        self.autosave.touch()
+        self._refresh_outputs()
+
+    def _offer_recovery(self) -> None:
+        """Replay the journal of a session that ended without saving (crash)."""
+        try:
+            records = self.controller.pending_recovery()
+            if records:
+                if messagebox.askyesno(
+                    "Récupération",
+                    "Des modifications non enregistrées de la session précédente ont été trouvées.\n"
+                    "Voulez-vous les restaurer ?",
+                ):
+                    self.controller.recover_from_journal(records)
+                    project = self.controller.current_project
+                    self.table_frame.load_from_project(project.database_name, project.tables, project.dbms)
+                    self._refresh_outputs()
+                    # Replayed edits stay journaled until the project is saved explicitly
+                    self.controller.flush_journal()
+                else:
+                    self.controller.discard_journal()
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Impossible de restaurer les modifications: {str(e)}")
+        self.autosave.enabled = True
+        self.autosave.touch()
+
+    def _refresh_outputs(self, force: bool = False) -> None:
+        """Schedule a preview refresh (debounced; see RefreshScheduler)."""
+        self.refresh_scheduler.request(force=force)
+
+    def _active_actions(self) -> list[str]:
+        return [k for k, v in self.actions_vars.items() if v.get()]
+
+    def _preview_inputs(self):
+        return self.controller.preview_inputs(self._active_actions())
+
+    def _render_outputs(self) -> None:
+        """Start generating the preview in the background (the worker drops superseded runs)."""
         try:
-            active_actions = [k for k, v in self.actions_vars.items() if v.get()]
-            scripts = self.controller.build_sql_artifacts(active_actions)
-            self.sql_preview_frame.show_scripts(scripts)
+            actions = self._active_actions()
+            with profiling.span("ui.preview_snapshot"):
+                snapshot = self.controller.preview_snapshot(actions)
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lors de la génération du SQL: {str(e)}")
+            return
+        self._refresh_started = time.perf_counter()
+        # Documents are never modified once built, so the worker can diff against the shown one.
+        previous = self.sql_preview_frame.document
+        self.sql_worker.submit(
+            self.refresh_scheduler.generation,
+            lambda cancelled: self._generate_outputs(actions, snapshot, previous, cancelled),
+        )
+
+    def _generate_outputs(self, actions: list[str], snapshot, previous, cancelled):
+        # Worker thread: must not touch any widget.
+        from core.preview_document import PreviewDocument
+        with profiling.span("ui.generate_outputs", profile=True, snapshot=True):
+            blocks = self.controller.build_sql_blocks(actions, project=snapshot, cancelled=cancelled)
+            with profiling.span("ui.index_document", blocks=len(blocks)):
+                document = PreviewDocument.from_blocks(blocks)
+            with profiling.span("ui.diff_document", blocks=len(blocks)):
+                document.compare_with(previous)
+            return document
+
+    def _show_outputs(self, token, document) -> None:
+        with profiling.span("ui.refresh_outputs"):
+            self.sql_preview_frame.show_document(document)
+        if profiling.is_enabled():
+            elapsed_ms = (time.perf_counter() - self._refresh_started) * 1000
+            self.status_var.set(f"Dernier rafraîchissement : {elapsed_ms:.1f} ms")
+
+    def _on_generation_error(self, token, error: Exception) -> None:
+        # Let the same inputs be retried
+        self.refresh_scheduler.invalidate()
+        messagebox.showerror("Erreur", f"Erreur lors de la génération du SQL: {str(error)}")
+
+    def _on_generation_busy(self, busy: bool) -> None:
+        self.sql_preview_frame.set_busy(busy)
+
+    def _flush_outputs(self) -> None:
+        """Bring the preview up to date now, waiting for a generation in progress."""
+        self.refresh_scheduler.flush()
+        self.sql_worker.wait()
 
     def _save_project(self) -> None:
         try:
@@ -221,23 +371,25 @@ class MainWindow(ttk.Frame):
             if not messagebox.askyesno("Confirmer", f"Sauvegarder le projet '{self.controller.current_project.database_name}' ?\nCela écrasera la version précédente."):
                 return
 
-            self.controller.save_project()
-            messagebox.showinfo("Succès", "Projet sauvegardé avec succès.")
+            self.status_var.set("Sauvegarde du projet…")
+            self.controller.save_project(on_done=self._on_project_saved)
         except Exception as e:
             messagebox.showerror("Erreur", f"Impossible de sauvegarder le projet: {str(e)}")
 
     def _load_project(self) -> None:
         try:
-            projects = self.controller.list_projects()
-            if not projects:
+            self.controller.flush_writes()
+            if not self.controller.count_projects():
                 tk.messagebox.showinfo("Charger", "Aucun projet sauvegardé.")
                 return
-            # Simple picker: ask by exact name
-            names = "\n".join(f"- {p['name']}" for p in projects)
-            name = simpledialog.askstring("Charger", f"Nom exact du projet à charger :\n\n{names}")
-            if not name:
-                return
-            self.controller.current_project = self.controller.storage.load_project_by_name(name.strip())
+            from ui.project_manager_dialog import ProjectManagerDialog
+            ProjectManagerDialog(self, self.controller, on_open=self._open_project)
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Impossible de charger le projet: {str(e)}")
+
+    def _open_project(self, project_id: int) -> None:
+        try:
+            self.controller.load_project(project_id)
             # Refresh UI with all tables
             self.table_frame.load_from_project(
                 self.controller.current_project.database_name,
@@ -1,14 +1,203 @@
 from __future__ import annotations
 
 import tkinter as tk
-from tkinter import ttk
+from tkinter import messagebox, ttk
+
+SEARCH_DELAY_MS = 250  # debounce while typing in the search box
+DEFAULT_ROW_HEIGHT = 20
+SORT_OPTIONS = {"Modifiés récemment": "updated", "Nom (A-Z)": "name"}
 
 
 class ProjectManagerDialog(tk.Toplevel):
-    """Placeholder dialog for managing saved projects."""
+    """Browser for saved projects.
+
+    The list is virtualized: the Treeview only ever holds the rows that fit
+    on screen, fetched with LIMIT/OFFSET from the indexed catalog, and the
+    scrollbar maps onto the total match count. Thousands of projects cost
+    the same as ten.
+    """
 
-    def __init__(self, master) -> None:
+    def __init__(self, master, controller, on_open=None) -> None:
         super().__init__(master)
+        self.controller = controller
+        self.on_open = on_open
         self.title("Projets sauvegardés")
-        ttk.Label(self, text="Gestion des projets (à implémenter)").pack(padx=8, pady=8)
-        ttk.Button(self, text="Fermer", command=self.destroy).pack(padx=8, pady=8)
+        self.geometry("640x460")
+        self.minsize(480, 320)
+        self.transient(master)
+
+        self.search_var = tk.StringVar()
+        self.sort_var = tk.StringVar(value=next(iter(SORT_OPTIONS)))
+        self.status_var = tk.StringVar()
+        self._offset = 0
+        self._total = 0
+        self._visible_rows = 15
+        self._search_after = None
+
+        self._build_ui()
+        from ui.theme_manager import ThemeManager
+        ThemeManager().apply_theme(ThemeManager().current_theme.name, self)
+        self._reload()
+
+    def _build_ui(self) -> None:
+        top = ttk.Frame(self)
+        top.pack(fill="x", padx=8, pady=(8, 4))
+        ttk.Label(top, text="🔎").pack(side="left")
+        search_entry = ttk.Entry(top, textvariable=self.search_var)
+        search_entry.pack(side="left", fill="x", expand=True, padx=(4, 8))
+        search_entry.focus_set()
+        self.search_var.trace_add("write", lambda *args: self._schedule_search())
+        sort_combo = ttk.Combobox(top, textvariable=self.sort_var, values=list(SORT_OPTIONS), state="readonly", width=20)
+        sort_combo.pack(side="left")
+        sort_combo.bind("<<ComboboxSelected>>", lambda e: self._reload())
+
+        list_frame = ttk.Frame(self)
+        list_frame.pack(fill="both", expand=True, padx=8, pady=4)
+        self.tree = ttk.Treeview(
+            list_frame, columns=("name", "tables", "updated"), show="headings", selectmode="browse"
+        )
+        self.tree.heading("name", text="Projet")
+        self.tree.heading("tables", text="Tables")
+        self.tree.heading("updated", text="Modifié le")
+        self.tree.column("name", width=300, anchor="w")
+        self.tree.column("tables", width=60, anchor="center")
+        self.tree.column("updated", width=150, anchor="w")
+        # Not the tree's own yview: the scrollbar spans the whole catalog.
+        self.scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self._on_scrollbar)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_to(self._offset - 3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_to(self._offset + 3))
+        self.tree.bind("<Up>", self._on_key_up)
+        self.tree.bind("<Down>", self._on_key_down)
+        self.tree.bind("<Prior>", lambda e: self._scroll_to(self._offset - self._visible_rows) or "break")
+        self.tree.bind("<Next>", lambda e: self._scroll_to(self._offset + self._visible_rows) or "break")
+        self.tree.bind("<Double-1>", lambda e: self._open_selected())
+        self.tree.bind("<Return>", lambda e: self._open_selected())
+
+        bottom = ttk.Frame(self)
+        bottom.pack(fill="x", padx=8, pady=(4, 8))
+        ttk.Label(bottom, textvariable=self.status_var).pack(side="left")
+        ttk.Button(bottom, text="Fermer", command=self.destroy).pack(side="right")
+        ttk.Button(bottom, text="🗑️ Supprimer", command=self._delete_selected).pack(side="right", padx=(0, 6))
+        ttk.Button(bottom, text="📂 Ouvrir", command=self._open_selected).pack(side="right", padx=(0, 6))
+
+    # --- Data window ---
+    def _reload(self) -> None:
+        """New query or sort order: recount and go back to the top."""
+        self._total = self.controller.count_projects(self.search_var.get())
+        self.status_var.set(f"{self._total} projet(s)")
+        self._offset = 0
+        self._render()
+
+    def _render(self) -> None:
+        page = self.controller.search_projects(
+            self.search_var.get(), limit=self._visible_rows, offset=self._offset,
+            order=SORT_OPTIONS.get(self.sort_var.get(), "updated"),
+        )
+        self.tree.delete(*self.tree.get_children())
+        for project in page:
+            self.tree.insert(
+                "", "end", iid=str(project["id"]),
+                values=(project["name"], project["table_count"], project["updated_at"]),
+            )
+        if self._total:
+            first = self._offset / self._total
+            last = min(1.0, (self._offset + self._visible_rows) / self._total)
+            self.scrollbar.set(first, last)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _scroll_to(self, offset: int) -> None:
+        offset = max(0, min(offset, max(0, self._total - self._visible_rows)))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    # --- Events ---
+    def _schedule_search(self) -> None:
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+        self._search_after = self.after(SEARCH_DELAY_MS, self._run_search)
+
+    def _run_search(self) -> None:
+        self._search_after = None
+        self._reload()
+
+    def _on_scrollbar(self, action, *args) -> None:
+        if action == "moveto":
+            self._scroll_to(int(float(args[0]) * self._total))
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1]
+            step = self._visible_rows if unit == "pages" else 1
+            self._scroll_to(self._offset + amount * step)
+
+    def _on_mousewheel(self, event) -> str:
+        self._scroll_to(self._offset - 3 * (1 if event.delta > 0 else -1))
+        return "break"
+
+    def _on_key_up(self, event):
+        children = self.tree.get_children()
+        if children and self.tree.focus() == children[0] and self._offset > 0:
+            self._scroll_to(self._offset - 1)
+            self._select_row(0)
+            return "break"
+        return None
+
+    def _on_key_down(self, event):
+        children = self.tree.get_children()
+        if children and self.tree.focus() == children[-1]:
+            self._scroll_to(self._offset + 1)
+            self._select_row(len(self.tree.get_children()) - 1)
+            return "break"
+        return None
+
+    def _select_row(self, index: int) -> None:
+        children = self.tree.get_children()
+        if children:
+            iid = children[min(index, len(children) - 1)]
+            self.tree.selection_set(iid)
+            self.tree.focus(iid)
+
+    def _on_resize(self, event) -> None:
+        style = ttk.Style(self)
+        try:
+            row_height = int(style.lookup("Treeview", "rowheight") or DEFAULT_ROW_HEIGHT)
+        except (TypeError, ValueError):
+            row_height = DEFAULT_ROW_HEIGHT
+        # Leave room for the heading row
+        visible = max(1, event.height // row_height - 1)
+        if visible != self._visible_rows:
+            self._visible_rows = visible
+            self._offset = max(0, min(self._offset, max(0, self._total - visible)))
+            self._render()
+
+    # --- Actions ---
+    def _selected_project_id(self) -> int | None:
+        selection = self.tree.selection()
+        return int(selection[0]) if selection else None
+
+    def _open_selected(self) -> None:
+        project_id = self._selected_project_id()
+        if project_id is None:
+            return
+        self.destroy()
+        if self.on_open:
+            self.on_open(project_id)
+
+    def _delete_selected(self) -> None:
+        project_id = self._selected_project_id()
+        if project_id is None:
+            messagebox.showinfo("Info", "Veuillez sélectionner un projet.", parent=self)
+            return
+        name = self.tree.set(str(project_id), "name")
+        if not messagebox.askyesno("Confirmer", f"Supprimer le projet '{name}' ?\nCette action est irréversible.", parent=self):
+            return
+        self.controller.delete_project(project_id)
+        self._total = self.controller.count_projects(self.search_var.get())
+        self.status_var.set(f"{self._total} projet(s)")
+        self._offset = max(0, min(self._offset, max(0, self._total - self._visible_rows)))
+        self._render()
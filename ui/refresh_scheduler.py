@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+REFRESH_DELAY_MS = 150  # quiet time after the last change before regenerating the preview
+
+
+class RefreshScheduler:
+    """Coalesces bursts of refresh requests into one run on ``widget.after()``.
+
+    Every change calls ``request()``; the refresh runs once nothing new has
+    been requested for ``delay_ms``. ``key()`` summarises the inputs of the
+    refresh: when it equals the key of the last successful run, the run is
+    skipped (unless a request was made with ``force``). ``generation``
+    grows with each request so a result can tell whether it is still the
+    latest one.
+    """
+
+    def __init__(
+        self,
+        widget,
+        run: Callable[[], None],
+        key: Callable[[], Any] | None = None,
+        delay_ms: int = REFRESH_DELAY_MS,
+    ) -> None:
+        self.widget = widget
+        self.run = run
+        self.key = key
+        self.delay_ms = delay_ms
+        self.generation = 0
+        self._after_id = None
+        self._force = False
+        self._last_key = None
+
+    def request(self, force: bool = False) -> None:
+        """Note a change; restarts the debounce countdown."""
+        self.generation += 1
+        self._force = self._force or force
+        self.cancel()
+        self._after_id = self.widget.after(self.delay_ms, self.run_now)
+
+    def cancel(self) -> None:
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    @property
+    def pending(self) -> bool:
+        return self._after_id is not None
+
+    def flush(self) -> None:
+        """Run a scheduled refresh right away (before reading its output)."""
+        if self.pending:
+            self.run_now()
+
+    def run_now(self) -> None:
+        """Refresh immediately if the inputs changed (or a forced request is pending)."""
+        self.cancel()
+        key = self.key() if self.key else None
+        if not self._force and key is not None and key == self._last_key:
+            return
+        self._force = False
+        self._last_key = None
+        self.run()
+        # Only remembered once the run went through.
+        self._last_key = key
+
+    def invalidate(self) -> None:
+        """Forget the last inputs: the next run happens even if they look the same."""
+        self._last_key = None
@@ -5,11 +5,19 @@ from tkinter import filedialog, messagebox, ttk
 
 from controllers.app_controller import AppController
 from core import models
-from core.fake_gen import FakeGenerator
+
+DEFAULT_ROW_HEIGHT = 20
+FAKER_MAX_ROWS = 1_000_000  # upper bound offered by the Faker dialog
 
 
 class SampleDataFrame(ttk.LabelFrame):
-    """Manually enter data for the active table."""
+    """Manually enter data for the active table.
+
+    The rows grid is virtualized: the Treeview only holds the rows that fit
+    on screen (item ids are row indices in ``TableModel.rows``) and the
+    scrollbar maps onto the row count. Adding, editing or deleting a row
+    touches at most the visible page, whatever the size of the table.
+    """
 
     def __init__(self, master, controller: AppController, on_updated=None) -> None:
         super().__init__(master, text="Saisie de valeurs (INSERT)")
@@ -18,6 +26,10 @@ class SampleDataFrame(ttk.LabelFrame):
         self.active_table: models.TableModel | None = None
         self.entry_vars: dict[str, tk.StringVar] = {}
         self._editing_idx: int | None = None
+        self._selected_idx: int | None = None
+        self._offset = 0          # index of the first row shown in the grid
+        self._visible_rows = 8
+        self._fill_job = None     # FakeFillJob while Faker rows are being generated
         
         self._build_ui()
 
@@ -64,6 +76,14 @@ class SampleDataFrame(ttk.LabelFrame):
         ttk.Button(btn_frame, text="❌ Annuler", command=self._cancel_edit).pack(side="left", padx=(10, 0))
         ttk.Button(btn_frame, text="🧹 Effacer tout", command=self._clear_all_rows).pack(side="right", padx=(6, 0))
 
+        # Shown while Faker rows are generated in the background
+        self.fill_frame = ttk.Frame(self.input_frame)
+        self.fill_progress = ttk.Progressbar(self.fill_frame, mode="determinate", maximum=100, length=160)
+        self.fill_progress.pack(side="left")
+        self.fill_status_var = tk.StringVar()
+        ttk.Label(self.fill_frame, textvariable=self.fill_status_var, font=("Segoe UI", 8)).pack(side="left", padx=(6, 0))
+        ttk.Button(self.fill_frame, text="⏹ Arrêter", command=self._cancel_fill).pack(side="left", padx=(10, 0))
+
         # Treeview for data
         self.tree_frame = ttk.LabelFrame(self, text="Lignes saisies (cliquez pour sélectionner)")
         self.tree_frame.grid(row=1, column=0, sticky="nsew", padx=4, pady=4)
@@ -74,21 +94,37 @@ class SampleDataFrame(ttk.LabelFrame):
         ttk.Button(tree_btns, text="🗑️ Supprimer sélection", command=self._delete_selected_row).pack(side="left", padx=4)
 
         self.tree = ttk.Treeview(self.tree_frame, show="headings", height=8, selectmode="browse")
-        vsb = ttk.Scrollbar(self.tree_frame, orient="vertical", command=self.tree.yview)
+        # Not the tree's own yview: the scrollbar spans all the rows of the table.
+        self.vsb = ttk.Scrollbar(self.tree_frame, orient="vertical", command=self._on_scrollbar)
         hsb = ttk.Scrollbar(self.tree_frame, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        self.tree.configure(xscrollcommand=hsb.set)
         
         self.tree.pack(side="left", fill="both", expand=True, padx=4, pady=4)
-        vsb.pack(side="right", fill="y")
+        self.vsb.pack(side="right", fill="y")
         hsb.pack(side="bottom", fill="x")
 
         self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.tree.bind("<Configure>", self._on_tree_resize)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_to(self._offset - 3) or "break")
+        self.tree.bind("<Button-5>", lambda e: self._scroll_to(self._offset + 3) or "break")
+        self.tree.bind("<Up>", self._on_key_up)
+        self.tree.bind("<Down>", self._on_key_down)
+        self.tree.bind("<Prior>", lambda e: self._scroll_to(self._offset - self._visible_rows) or "break")
+        self.tree.bind("<Next>", lambda e: self._scroll_to(self._offset + self._visible_rows) or "break")
+        self.tree.bind("<Home>", lambda e: self._scroll_to(0) or "break")
+        self.tree.bind("<End>", lambda e: self._scroll_to(self._row_count()) or "break")
 
     def set_active_table(self, table: models.TableModel | None) -> None:
+        if self._fill_job is not None and self._fill_job.table is not table:
+            self._cancel_fill()
+        if table is not None:
+            # Rows of a saved project are only read when the table is opened.
+            self.controller.ensure_rows_loaded(table)
         self.active_table = table
         self._editing_idx = None
         self._refresh_inputs()
-        self._refresh_tree()
+        self._setup_columns()
 
     def _refresh_inputs(self) -> None:
         for widget in self.inputs_inner.winfo_children():
@@ -140,23 +176,133 @@ class SampleDataFrame(ttk.LabelFrame):
         from ui.theme_manager import ThemeManager
         ThemeManager().refresh_theme(self.inputs_inner)
 
-    def _refresh_tree(self) -> None:
-        # Clear tree
+    # --- Rows grid (virtual) ---
+    def _setup_columns(self) -> None:
+        """New active table: set up the headings and show its first rows."""
         self.tree.delete(*self.tree.get_children())
-        if not self.active_table:
-            return
-
-        # Setup columns
-        cols = [c.name for c in self.active_table.columns]
+        self._offset = 0
+        self._selected_idx = None
+        cols = [c.name for c in self.active_table.columns] if self.active_table else []
         self.tree.configure(columns=cols)
         for c in cols:
             self.tree.heading(c, text=c)
             self.tree.column(c, width=100, anchor="w")
-        
-        # Load existing rows from table model
-        for row_dict in self.active_table.rows:
-            values = [row_dict.get(c, "") for c in cols]
-            self.tree.insert("", "end", values=values)
+        self._render_rows()
+
+    def _row_count(self) -> int:
+        return len(self.active_table.rows) if self.active_table else 0
+
+    def _row_values(self, idx: int) -> list:
+        row_dict = self.active_table.rows[idx]
+        return [row_dict.get(c.name, "") for c in self.active_table.columns]
+
+    def _render_rows(self) -> None:
+        """Fill the grid with the rows of the current page."""
+        self.tree.delete(*self.tree.get_children())
+        total = self._row_count()
+        for idx in range(self._offset, min(total, self._offset + self._visible_rows)):
+            self.tree.insert("", "end", iid=str(idx), values=self._row_values(idx))
+        if self._selected_idx is not None and self.tree.exists(str(self._selected_idx)):
+            self.tree.selection_set(str(self._selected_idx))
+            self.tree.focus(str(self._selected_idx))
+        self._update_scrollbar()
+
+    def _update_scrollbar(self) -> None:
+        total = self._row_count()
+        if total:
+            self.vsb.set(self._offset / total, min(1.0, (self._offset + self._visible_rows) / total))
+        else:
+            self.vsb.set(0.0, 1.0)
+
+    def _scroll_to(self, offset: int) -> None:
+        offset = max(0, min(offset, max(0, self._row_count() - self._visible_rows)))
+        if offset != self._offset:
+            self._offset = offset
+            self._render_rows()
+
+    def _on_rows_appended(self) -> None:
+        """New rows at the end: only the free slots of the page need items."""
+        total = self._row_count()
+        shown = len(self.tree.get_children())
+        for idx in range(self._offset + shown, min(total, self._offset + self._visible_rows)):
+            self.tree.insert("", "end", iid=str(idx), values=self._row_values(idx))
+        self._update_scrollbar()
+
+    def _on_row_replaced(self, idx: int) -> None:
+        if self.tree.exists(str(idx)):
+            self.tree.item(str(idx), values=self._row_values(idx))
+
+    def _on_row_deleted(self, idx: int) -> None:
+        if self._selected_idx is not None:
+            if self._selected_idx == idx:
+                self._selected_idx = None
+            elif self._selected_idx > idx:
+                self._selected_idx -= 1
+        if idx < self._offset:
+            # The page shows the same rows, one index lower
+            self._offset -= 1
+            self._render_rows()
+        elif idx < self._offset + self._visible_rows:
+            self._offset = max(0, min(self._offset, self._row_count() - self._visible_rows))
+            self._render_rows()
+        else:
+            self._update_scrollbar()
+
+    def _on_scrollbar(self, action, *args) -> None:
+        if action == "moveto":
+            self._scroll_to(int(float(args[0]) * self._row_count()))
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1]
+            step = self._visible_rows if unit == "pages" else 1
+            self._scroll_to(self._offset + amount * step)
+
+    def _on_mousewheel(self, event) -> str:
+        self._scroll_to(self._offset - 3 * (1 if event.delta > 0 else -1))
+        return "break"
+
+    def _on_key_up(self, event):
+        children = self.tree.get_children()
+        if children and self.tree.focus() == children[0] and self._offset > 0:
+            self._scroll_to(self._offset - 1)
+            self._select_row(self._offset)
+            return "break"
+        return None
+
+    def _on_key_down(self, event):
+        children = self.tree.get_children()
+        if children and self.tree.focus() == children[-1] and self._offset + len(children) < self._row_count():
+            self._scroll_to(self._offset + 1)
+            self._select_row(self._offset + len(self.tree.get_children()) - 1)
+            return "break"
+        return None
+
+    def _select_row(self, idx: int) -> None:
+        if self.tree.exists(str(idx)):
+            self._selected_idx = idx
+            self.tree.selection_set(str(idx))
+            self.tree.focus(str(idx))
+
+    def _on_tree_resize(self, event) -> None:
+        style = ttk.Style(self)
+        try:
+            row_height = int(style.lookup("Treeview", "rowheight") or DEFAULT_ROW_HEIGHT)
+        except (TypeError, ValueError):
+            row_height = DEFAULT_ROW_HEIGHT
+        # Leave room for the heading row
+        visible = max(1, event.height // row_height - 1)
+        if visible != self._visible_rows:
+            self._visible_rows = visible
+            self._offset = max(0, min(self._offset, max(0, self._row_count() - visible)))
+            self._render_rows()
+
+    def _selected_row_index(self) -> int | None:
+        selection = self.tree.selection()
+        if not selection:
+            return None
+        idx = int(selection[0])
+        if not self.active_table or idx >= len(self.active_table.rows):
+            return None
+        return idx
 
     def _on_submit(self) -> None:
         if not self.active_table:
@@ -183,14 +329,14 @@ class SampleDataFrame(ttk.LabelFrame):
         
         if self._editing_idx is not None:
             # Update existing
-            self.active_table.rows[self._editing_idx] = row_data
+            self.controller.replace_row(self.active_table, self._editing_idx, row_data)
+            self._on_row_replaced(self._editing_idx)
             self._editing_idx = None
             self.submit_btn.configure(text="✅ Ajouter ligne")
         else:
             # Add new
-            self.active_table.rows.append(row_data)
-        
-        self._refresh_tree()
+            self.controller.append_rows(self.active_table, [row_data])
+            self._on_rows_appended()
         
         # Clear inputs for next entry
         for v in self.entry_vars.values():
@@ -200,34 +346,62 @@ class SampleDataFrame(ttk.LabelFrame):
             self.on_updated()
 
     def _auto_fill_faker(self) -> None:
-        if not self.active_table:
+        if not self.active_table or self._fill_job is not None:
             return
             
         from tkinter import simpledialog
-        count = simpledialog.askinteger("Faker", "Combien de lignes générer ?", minvalue=1, maxvalue=1000, initialvalue=10)
+        count = simpledialog.askinteger("Faker", "Combien de lignes générer ?", minvalue=1, maxvalue=FAKER_MAX_ROWS, initialvalue=10)
         if not count:
             return
             
-        try:
-            gen = FakeGenerator()
-            new_rows = gen.generate_rows(self.active_table, count)
-            self.active_table.rows.extend(new_rows)
-            self._refresh_tree()
-            if self.on_updated:
-                self.on_updated()
-            messagebox.showinfo("Faker", f"{count} lignes générées avec succès !")
-        except Exception as e:
-            messagebox.showerror("Erreur Faker", str(e))
+        # Faker is slow to import: the job loads it on its worker thread
+        from controllers.fake_fill import FakeFillJob
+        self._fill_job = FakeFillJob(
+            self, self.active_table, count,
+            on_chunk=self._on_fill_chunk, on_progress=self._on_fill_progress, on_done=self._on_fill_done,
+        )
+        self.btn_faker.configure(state="disabled")
+        self.fill_progress["value"] = 0
+        self.fill_status_var.set("Chargement de Faker…")
+        self.fill_frame.pack(fill="x", padx=4, pady=(0, 4))
+        self._fill_job.start()
+
+    def _cancel_fill(self) -> None:
+        if self._fill_job is not None:
+            self._fill_job.cancel()
+
+    def _on_fill_chunk(self, rows: list[dict]) -> None:
+        table = self._fill_job.table
+        self.controller.append_rows(table, rows)
+        if table is self.active_table:
+            self._on_rows_appended()
+
+    def _on_fill_progress(self, done: int, count: int, rows_per_second: float) -> None:
+        if self._fill_job.generator is None:
+            return  # still loading Faker
+        self.fill_progress["value"] = done * 100 / count
+        self.fill_status_var.set(
+            f"{_format_count(done)} / {_format_count(count)} lignes — {_format_count(int(rows_per_second))} lignes/s"
+        )
+
+    def _on_fill_done(self, done: int, cancelled: bool, error) -> None:
+        self._fill_job = None
+        self.fill_frame.pack_forget()
+        self.btn_faker.configure(state="normal")
+        if done and self.on_updated:
+            self.on_updated()
+        if error is not None and not done:
+            messagebox.showerror("Erreur Faker", str(error))
+        elif error is not None:
+            messagebox.showerror("Erreur Faker", f"{error}\n\n{done} lignes générées avant l'erreur ont été conservées.")
+        elif cancelled:
+            messagebox.showinfo("Faker", f"Génération arrêtée : {done} lignes conservées.")
+        else:
+            messagebox.showinfo("Faker", f"{done} lignes générées avec succès !")
 
     def _load_selected_for_edit(self, event=None) -> None:
-        selection = self.tree.selection()
-        if not selection:
-            return
-        
-        item_id = selection[0]
-        idx = self.tree.index(item_id)
-        
-        if not self.active_table or idx >= len(self.active_table.rows):
+        idx = self._selected_row_index()
+        if idx is None:
             return
             
         self._editing_idx = idx
@@ -249,19 +423,16 @@ class SampleDataFrame(ttk.LabelFrame):
         self.canvas.itemconfig(self.canvas_window, width=event.width)
 
     def _delete_selected_row(self) -> None:
-        selection = self.tree.selection()
-        if not selection:
+        idx = self._selected_row_index()
+        if idx is None:
             return
         
         if not messagebox.askyesno("Confirmer", "Supprimer cette ligne ?"):
             return
             
-        item_id = selection[0]
-        idx = self.tree.index(item_id)
-        
         if self.active_table and idx < len(self.active_table.rows):
-            del self.active_table.rows[idx]
-            self._refresh_tree()
+            self.controller.delete_row(self.active_table, idx)
+            self._on_row_deleted(idx)
             if self._editing_idx == idx:
                 self._cancel_edit()
             elif self._editing_idx is not None and self._editing_idx > idx:
@@ -271,18 +442,25 @@ class SampleDataFrame(ttk.LabelFrame):
                 self.on_updated()
 
     def _on_tree_select(self, event) -> None:
-        # Optional: Auto-load for edit on select? 
-        # Maybe better to keep it manual via button to avoid clearing unsaved new info.
-        pass
+        # Remembered by row index so the selection survives scrolling the page away.
+        # Not auto-loaded for edit, to avoid clearing unsaved new info.
+        selection = self.tree.selection()
+        if selection:
+            self._selected_idx = int(selection[0])
 
     def _clear_all_rows(self) -> None:
         if self.active_table:
             if not messagebox.askyesno("Confirmer", "Supprimer TOUTES les lignes ?"):
                 return
-            self.active_table.rows.clear()
+            self.controller.clear_rows(self.active_table)
             self._editing_idx = None
-            self._refresh_tree()
+            self._selected_idx = None
+            self._offset = 0
+            self._render_rows()
             self._cancel_edit()
             if self.on_updated:
                 self.on_updated()
 
+
+def _format_count(n: int) -> str:
+    return f"{n:,}".replace(",", " ")
@@ -1,19 +1,44 @@
 from __future__ import annotations
 
-import re
 import tkinter as tk
+from bisect import bisect_left
+from difflib import SequenceMatcher
 from tkinter import filedialog, messagebox, ttk
+from tkinter import font as tkfont
+
+from core.preview_document import PreviewDocument, diff_lines, map_line
+from core.sql_highlight import highlight_ranges
+from utils import profiling
+
+WINDOW_MARGIN_LINES = 200     # lines rendered above and below the viewport
+HIGHLIGHT_MARGIN_LINES = 50   # highlighted with the visible lines, before the first paint
+HIGHLIGHT_BATCH = 4000        # ranges tagged per idle step for the rest of the window
 
 
 class SQLPreviewFrame(ttk.LabelFrame):
-    """Shows generated SQL scripts with action toggles."""
+    """Shows generated SQL scripts with action toggles.
+
+    The script is kept as a ``PreviewDocument``; the Text widget only holds
+    the lines around the viewport (``WINDOW_MARGIN_LINES`` on each side)
+    and is re-filled when scrolling gets close to either end. The scrollbar
+    maps onto the document's line count, not the widget's content.
 
-    def __init__(self, master, controller, actions_vars: dict[str, tk.BooleanVar], on_actions_changed, on_save_history=None) -> None:
+    A new document is patched in: only the lines of the window that
+    changed are replaced, the view stays on the same content and the tags
+    of the untouched lines are kept.
+    """
+
+    def __init__(
+        self, master, controller, actions_vars: dict[str, tk.BooleanVar], on_actions_changed,
+        on_save_history=None, flush_pending=None,
+    ) -> None:
         super().__init__(master, text="Aperçu SQL")
         self.controller = controller
         self.actions_vars = actions_vars
         self.on_actions_changed = on_actions_changed
         self.on_save_history = on_save_history
+        # Brings the preview up to date when a refresh is still scheduled
+        self.flush_pending = flush_pending
         
         toolbar = ttk.Frame(self)
         toolbar.pack(fill="x", padx=4, pady=(4, 0))
@@ -21,6 +46,13 @@ class SQLPreviewFrame(ttk.LabelFrame):
         ttk.Button(toolbar, text="💾 Exporter .sql", command=self.export_sql).pack(side="left", padx=(6, 0))
         ttk.Button(toolbar, text="📜 Sauvegarder dans l'historique", command=self._save_to_history).pack(side="left", padx=(6, 0))
         ttk.Button(toolbar, text="☑️ Tout cocher", command=self._select_all).pack(side="left", padx=(6, 0))
+        # Shown while the SQL is being generated in the background
+        self.spinner = ttk.Progressbar(toolbar, mode="indeterminate", length=80)
+        self.busy_label = ttk.Label(toolbar, text="Génération…", font=("Segoe UI", 8))
+        ttk.Label(toolbar, text="Aller à :").pack(side="left", padx=(12, 2))
+        self.table_nav = ttk.Combobox(toolbar, state="readonly", width=18)
+        self.table_nav.pack(side="left")
+        self.table_nav.bind("<<ComboboxSelected>>", self._jump_to_table)
 
         # Actions area (Split into 2 rows for better fit)
         actions_frame = ttk.Frame(self)
@@ -45,11 +77,25 @@ class SQLPreviewFrame(ttk.LabelFrame):
         for name, var in items[3:]:
             tk.Checkbutton(row2, text=name, variable=var, command=self.on_actions_changed, font=("Segoe UI", 9)).pack(side="left", padx=2)
 
-        self.text = tk.Text(self, height=24, wrap="none", font=("Consolas", 10))
+        text_frame = ttk.Frame(self)
+        text_frame.pack(fill="both", expand=True, padx=4, pady=4)
+        self.text = tk.Text(text_frame, height=24, wrap="none", font=("Consolas", 10), yscrollcommand=self._on_text_scrolled)
         self._configure_syntax_highlighting()
         self.text.configure(state="disabled")
-        self.text.pack(fill="both", expand=True, padx=4, pady=4)
-        self._last_sql = ""
+        # Not the Text's own yview: the scrollbar spans the whole document.
+        self.scrollbar = ttk.Scrollbar(text_frame, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.text.pack(side="left", fill="both", expand=True)
+        self.text.bind("<Configure>", self._on_resize, add="+")
+
+        self._document = PreviewDocument()
+        self._table_lines: dict[str, int] = {}
+        self._top = 0              # document line at the top of the viewport
+        self._window = (0, 0)      # document lines currently in the widget
+        self._rendering = False
+        self._recenter_after = None
+        self._line_height = None
+        self._highlight_after = None
 
     def _configure_syntax_highlighting(self) -> None:
         """Configure text widget tags for SQL syntax highlighting using the current theme."""
@@ -78,76 +124,241 @@ class SQLPreviewFrame(ttk.LabelFrame):
             v.set(target)
         self.on_actions_changed()
 
+    def set_busy(self, busy: bool) -> None:
+        if busy:
+            self.busy_label.pack(side="right", padx=(6, 0))
+            self.spinner.pack(side="right")
+            self.spinner.start(12)
+        else:
+            self.spinner.stop()
+            self.spinner.pack_forget()
+            self.busy_label.pack_forget()
+
+    @property
+    def document(self) -> PreviewDocument:
+        return self._document
+
+    @property
+    def script(self) -> str:
+        """The whole displayed script."""
+        return self._document.text()
+
     def show_scripts(self, scripts: str) -> None:
-        self.text.configure(state="normal")
-        self.text.delete("1.0", tk.END)
-        self._last_sql = scripts or ""
-        if not self._last_sql.strip():
-            self.text.insert(tk.END, "Aucune table définie pour le moment.\n")
+        self.show_document(PreviewDocument.from_text(scripts or ""))
+
+    @profiling.timed("preview.show_document")
+    def show_document(self, document: PreviewDocument) -> None:
+        previous = self._document
+        self._document = document
+        tables = document.tables()
+        self._table_lines = dict(tables)
+        self.table_nav.configure(values=[name for name, _line in tables])
+        first, last = self._window
+        if previous.is_empty or document.is_empty or first == last or self._highlight_after is not None:
+            self._top = min(self._top, self._max_top())
+            self._render_window()
         else:
-            self.text.insert(tk.END, self._last_sql)
-            self._apply_syntax_highlighting()
-        self.text.configure(state="disabled")
+            self._patch_window(previous, document)
 
-    def _apply_syntax_highlighting(self) -> None:
-        """Apply syntax highlighting to the SQL text."""
-        content = self.text.get("1.0", tk.END)
-        
-        # SQL Keywords
-        keywords = r'\b(SELECT|FROM|WHERE|INSERT|INTO|VALUES|UPDATE|SET|DELETE|CREATE|TABLE|DATABASE|IF|NOT|EXISTS|USE|GO|BEGIN|END|PRIMARY|KEY|IDENTITY|AUTO_INCREMENT|SERIAL|BIGSERIAL|NULL|DEFAULT|CONSTRAINT|FOREIGN|REFERENCES|INDEX|UNIQUE|CHECK|AS|ON|AND|OR|IN|LIKE|BETWEEN|ORDER|BY|GROUP|HAVING|JOIN|LEFT|RIGHT|INNER|OUTER|UNION|CASE|WHEN|THEN|ELSE|DROP|ALTER|ADD|MODIFY|COLUMN|VARCHAR|INT|BIGINT|SMALLINT|DECIMAL|FLOAT|DATETIME|TIMESTAMP|DATE|TEXT|BIT|BOOLEAN|CHAR|NVARCHAR|PROCEDURE|FUNCTION|RETURN|DECLARE|EXEC|EXECUTE)\b'
-        for match in re.finditer(keywords, content, re.IGNORECASE):
-            start_idx = f"1.0+{match.start()}c"
-            end_idx = f"1.0+{match.end()}c"
-            self.text.tag_add("keyword", start_idx, end_idx)
-        
-        # Comments (-- style)
-        for match in re.finditer(r'--[^\n]*', content):
-            start_idx = f"1.0+{match.start()}c"
-            end_idx = f"1.0+{match.end()}c"
-            self.text.tag_add("comment", start_idx, end_idx)
-        
-        # Strings (single quotes)
-        for match in re.finditer(r"'[^']*'", content):
-            start_idx = f"1.0+{match.start()}c"
-            end_idx = f"1.0+{match.end()}c"
-            self.text.tag_add("string", start_idx, end_idx)
-        
-        # Numbers
-        for match in re.finditer(r'\b\d+\b', content):
-            start_idx = f"1.0+{match.start()}c"
-            end_idx = f"1.0+{match.end()}c"
-            self.text.tag_add("number", start_idx, end_idx)
-        
-        # Square brackets, backticks, or quotes for identifiers
-        for match in re.finditer(r'(\[[^\]]+\]|`[^`]+`|"[^"]+")', content):
-            start_idx = f"1.0+{match.start()}c"
-            end_idx = f"1.0+{match.end()}c"
-            self.text.tag_add("identifier", start_idx, end_idx)
+    # --- Virtual window ---
+    def _visible_line_count(self) -> int:
+        if self._line_height is None:
+            self._line_height = max(1, tkfont.Font(font=self.text.cget("font")).metrics("linespace"))
+        return max(1, self.text.winfo_height() // self._line_height)
+
+    def _max_top(self) -> int:
+        return max(0, self._document.line_count - self._visible_line_count())
+
+    def _render_window(self) -> None:
+        """Fill the widget with the lines around ``_top``."""
+        self._cancel_highlighting()
+        if self._recenter_after is not None:
+            self.after_cancel(self._recenter_after)
+            self._recenter_after = None
+        document = self._document
+        first = max(0, self._top - WINDOW_MARGIN_LINES)
+        last = min(document.line_count, self._top + self._visible_line_count() + WINDOW_MARGIN_LINES)
+        self._rendering = True
+        try:
+            self.text.configure(state="normal")
+            self.text.delete("1.0", tk.END)
+            if document.is_empty:
+                self.text.insert(tk.END, "Aucune table définie pour le moment.\n")
+                first = last = 0
+            else:
+                # Every line ends with a newline so _patch_window can replace whole lines
+                content = document.lines(first, last) + "\n"
+                with profiling.span("preview.text_insert", chars=len(content)):
+                    self.text.insert("1.0", content)
+            self._window = (first, last)
+            self.text.yview(f"{self._top - first + 1}.0")
+            if not document.is_empty:
+                with profiling.span("preview.highlight"):
+                    self._apply_syntax_highlighting(highlight_ranges(content))
+            self.text.configure(state="disabled")
+        finally:
+            self._rendering = False
+        self._update_scrollbar()
+
+    def _patch_window(self, previous: PreviewDocument, document: PreviewDocument) -> None:
+        """Replace only the changed lines of the window, keeping the view on the same content."""
+        if self._recenter_after is not None:
+            self.after_cancel(self._recenter_after)
+            self._recenter_after = None
+        changes = document.changes if document.base_revision == previous.revision else diff_lines(previous, document)
+        first, last = self._window
+        if previous.line_count == document.line_count and all(tag == "equal" for tag, *_ in changes):
+            return
+        # The top line follows its block; the window keeps its size and margin above the top.
+        top = min(map_line(changes, self._top), self._max_top())
+        new_first = max(0, top - (self._top - first))
+        new_last = min(document.line_count, max(new_first + last - first, top + self._visible_line_count() + WINDOW_MARGIN_LINES))
+        old_lines = previous.lines(first, last).split("\n")
+        new_lines = document.lines(new_first, new_last).split("\n")
+        edits = [op for op in SequenceMatcher(None, old_lines, new_lines, autojunk=False).get_opcodes() if op[0] != "equal"]
+        self._rendering = True
+        try:
+            with profiling.span("preview.patch_window", edits=len(edits)):
+                self.text.configure(state="normal")
+                # Bottom-up, so the rows of the edits still to do do not move
+                for _tag, i1, i2, j1, j2 in reversed(edits):
+                    if i2 > i1:
+                        self.text.delete(f"{i1 + 1}.0", f"{i2 + 1}.0")
+                    if j2 > j1:
+                        chunk = "\n".join(new_lines[j1:j2]) + "\n"
+                        # Empty tag list: do not inherit the tags around the insertion point
+                        self.text.insert(f"{i1 + 1}.0", chunk, ())
+                        self._tag_ranges(highlight_ranges(chunk, first_line=i1 + 1))
+                self.text.configure(state="disabled")
+            self._window = (new_first, new_last)
+            self._top = top
+            self.text.yview(f"{top - new_first + 1}.0")
+        finally:
+            self._rendering = False
+        self._update_scrollbar()
+
+    def _scroll_to(self, line: int) -> None:
+        self._top = max(0, min(line, self._max_top()))
+        first, last = self._window
+        whole = first == 0 and last == self._document.line_count
+        if whole or (first <= self._top and self._top + self._visible_line_count() <= last):
+            self._rendering = True
+            try:
+                self.text.yview(f"{self._top - first + 1}.0")
+            finally:
+                self._rendering = False
+            self._update_scrollbar()
+        else:
+            self._render_window()
+
+    def _update_scrollbar(self) -> None:
+        total = self._document.line_count
+        if total <= 0:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        self.scrollbar.set(self._top / total, min(1.0, (self._top + self._visible_line_count()) / total))
+
+    def _on_scrollbar(self, action, *args) -> None:
+        if action == "moveto":
+            self._scroll_to(int(float(args[0]) * self._document.line_count))
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1]
+            step = self._visible_line_count() if unit == "pages" else 1
+            self._scroll_to(self._top + amount * step)
+
+    def _on_text_scrolled(self, *args) -> None:
+        """The Text moved its own view (wheel, keys, selection drag): follow it."""
+        if self._rendering or self._document.is_empty:
+            return
+        row = int(self.text.index("@0,0").split(".")[0]) - 1
+        self._top = self._window[0] + row
+        self._update_scrollbar()
+        first, last = self._window
+        edge = WINDOW_MARGIN_LINES // 4
+        near_top = first > 0 and self._top - first < edge
+        near_bottom = last < self._document.line_count and last - (self._top + self._visible_line_count()) < edge
+        if (near_top or near_bottom) and self._recenter_after is None:
+            self._recenter_after = self.after_idle(self._recenter)
+
+    def _recenter(self) -> None:
+        self._recenter_after = None
+        self._render_window()
+
+    def _on_resize(self, event) -> None:
+        if self._top + self._visible_line_count() > self._window[1] and self._window[1] < self._document.line_count:
+            self._render_window()
+        else:
+            self._update_scrollbar()
+
+    def _jump_to_table(self, event=None) -> None:
+        line = self._table_lines.get(self.table_nav.get())
+        if line is not None:
+            self._scroll_to(line)
+
+    def _apply_syntax_highlighting(self, ranges: list) -> None:
+        """Tag the visible lines now and the rest of the window at idle time."""
+        first = int(self.text.index("@0,0").split(".")[0]) - HIGHLIGHT_MARGIN_LINES
+        last = int(self.text.index(f"@0,{self.text.winfo_height()}").split(".")[0]) + HIGHLIGHT_MARGIN_LINES
+        # Ranges are sorted by line: (line,) sorts before every range on that line.
+        lo = bisect_left(ranges, (first,))
+        hi = bisect_left(ranges, (last + 1,))
+        self._tag_ranges(ranges[lo:hi])
+        rest = ranges[hi:] + ranges[:lo]
+        if rest:
+            self._highlight_after = self.after(1, self._highlight_step, rest, 0)
+
+    def _highlight_step(self, ranges: list, start: int) -> None:
+        end = start + HIGHLIGHT_BATCH
+        self._tag_ranges(ranges[start:end])
+        self._highlight_after = self.after(1, self._highlight_step, ranges, end) if end < len(ranges) else None
+
+    def _tag_ranges(self, ranges: list) -> None:
+        """One ``tag_add`` call per tag for the whole batch."""
+        by_tag: dict[str, list[str]] = {}
+        for _line, tag, start, end in ranges:
+            indices = by_tag.get(tag)
+            if indices is None:
+                indices = by_tag[tag] = []
+            indices.append(start)
+            indices.append(end)
+        for tag, indices in by_tag.items():
+            self.text.tag_add(tag, *indices)
+
+    def _cancel_highlighting(self) -> None:
+        if self._highlight_after is not None:
+            self.after_cancel(self._highlight_after)
+            self._highlight_after = None
 
     def _save_to_history(self) -> None:
-        if not self.controller.is_activated():
+        if not self.controller.activated:
             messagebox.showinfo("Premium Requis", "La sauvegarde de s'historique est une fonctionnalité Premium.")
             return
 
-        if not self._last_sql.strip():
+        self._flush()
+        script = self.script
+        if not script.strip():
             return
         if self.on_save_history:
-            self.on_save_history(self._last_sql)
+            self.on_save_history(script)
             messagebox.showinfo("Historique", "Script sauvegardé dans l'historique.")
 
     def copy_all(self) -> None:
-        if not self._last_sql.strip():
+        self._flush()
+        script = self.script
+        if not script.strip():
             return
         self.clipboard_clear()
-        self.clipboard_append(self._last_sql)
+        self.clipboard_append(script)
         messagebox.showinfo("Copié", "SQL copié dans le presse-papiers.")
 
     def export_sql(self) -> None:
-        if not self.controller.is_activated():
+        if not self.controller.activated:
             messagebox.showinfo("Premium Requis", "L'exportation en fichier .sql est réservée aux utilisateurs Premium.\n\nVous pouvez copier le code dans le presse-papier gratuitement.")
             return
 
-        if not self._last_sql.strip():
+        self._flush()
+        script = self.script
+        if not script.strip():
             return
         path = filedialog.asksaveasfilename(
             defaultextension=".sql",
@@ -157,5 +368,9 @@ class SQLPreviewFrame(ttk.LabelFrame):
         if not path:
             return
         with open(path, "w", encoding="utf-8") as f:
-            f.write(self._last_sql)
+            f.write(script)
         messagebox.showinfo("Export", f"Fichier exporté :\n{path}")
+
+    def _flush(self) -> None:
+        if self.flush_pending:
+            self.flush_pending()
@@ -136,10 +136,12 @@ class TableDefinitionFrame(ttk.LabelFrame):
 
     def load_from_project(self, db_name: str, tables: list[models.TableModel], dbms: str = "sqlserver") -> None:
         """Populate the frame with existing project data."""
+        # Swap the tables first: setting the vars below pushes self.tables to the
+        # controller, and the old form must not be persisted into the new tables.
+        self._active_index = None
+        self.tables = list(tables)  # shallow copy list
         self.db_name_var.set(db_name)
         self.dbms_var.set(dbms)
-        # Clear existing
-        self.tables = list(tables)  # shallow copy list
         self.table_list.delete(0, "end")
         
         # Repopulate listbox
@@ -210,7 +212,7 @@ class TableDefinitionFrame(ttk.LabelFrame):
                 count = 1
 
             # 2. Premium Check
-            if not initial and count > 1 and not self.controller.is_activated():
+            if not initial and count > 1 and not self.controller.activated:
                 messagebox.showinfo("Premium Requis", "L'ajout groupé est limité à 1 table en version Standard.")
                 count = 1
                 self.bulk_count.set(1)
@@ -394,7 +396,10 @@ class TableDefinitionFrame(ttk.LabelFrame):
                 self.table_name_var.set(clean_name)
             
             new_name = clean_name or self.tables[idx].name
-            self.tables[idx] = models.TableModel(name=new_name, columns=cols, rows=self.tables[idx].rows)
+            # Update in place: keeps the rows and their storage bookkeeping attached
+            table = self.tables[idx]
+            table.name = new_name
+            table.columns = cols
             
             # Update listbox text only if changed
             current_text = self.table_list.get(idx)
@@ -0,0 +1,100 @@
+"""Startup diagnostics: ``-X importtime`` summary and time to first frame.
+
+Run with ``python main.py --diagnostics``.
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+
+# Target for process start -> first interactive frame of the main window.
+TARGET_FIRST_FRAME_MS = 1000
+ENV_PROBE = "SQLGEN_STARTUP_PROBE"
+# Modules loaded before the first frame: the entry point, then the main window.
+STARTUP_MODULES = ("main", "ui.main_window")
+_PROBE_PREFIX = "FIRST_FRAME_MS="
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_time_report(module: str = "main", top: int = 15) -> dict:
+    """Import ``module`` in a fresh interpreter with ``-X importtime`` and summarise it."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=_APP_DIR,
+    )
+    entries = _parse_importtime(proc.stderr)
+    total_us = next((e["cumulative_us"] for e in entries if e["module"] == module), None)
+    slowest = sorted(entries, key=lambda e: e["cumulative_us"], reverse=True)[:top]
+    return {"module": module, "total_us": total_us, "slowest": slowest, "ok": proc.returncode == 0}
+
+
+def measure_first_frame(timeout: float = 60.0) -> float | None:
+    """Launch the app with the startup probe and return ms to first frame (None if unavailable)."""
+    env = dict(os.environ, **{ENV_PROBE: "1"})
+    try:
+        proc = subprocess.run(
+            [sys.executable, os.path.join(_APP_DIR, "main.py")],
+            capture_output=True, text=True, cwd=_APP_DIR, env=env, timeout=timeout,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    for line in proc.stdout.splitlines():
+        if line.startswith(_PROBE_PREFIX):
+            return float(line[len(_PROBE_PREFIX):])
+    return None
+
+
+def install_first_frame_probe(root, process_start: float) -> None:
+    """Record the time to the first idle main loop iteration (window drawn, input accepted)."""
+
+    def on_first_idle() -> None:
+        elapsed_ms = (time.perf_counter() - process_start) * 1000
+        from utils import profiling
+        with profiling.span("startup.first_frame", first_frame_ms=round(elapsed_ms, 1)):
+            pass
+        if os.getenv(ENV_PROBE):
+            print(f"{_PROBE_PREFIX}{elapsed_ms:.1f}", flush=True)
+            root.destroy()
+
+    root.after_idle(on_first_idle)
+
+
+def run_diagnostics() -> int:
+    for module in STARTUP_MODULES:
+        report = import_time_report(module)
+        print(f"== Import time (python -X importtime -c 'import {module}') ==")
+        if report["total_us"] is not None:
+            print(f"Total: {report['total_us'] / 1000:.1f} ms")
+        print(f"{'cumulative':>12} {'self':>10}  module")
+        for entry in report["slowest"]:
+            print(f"{entry['cumulative_us'] / 1000:>9.1f} ms {entry['self_us'] / 1000:>7.1f} ms  {entry['module']}")
+        print()
+
+    print("== Time to first interactive frame ==")
+    first_frame = measure_first_frame()
+    if first_frame is None:
+        print("Unavailable (no display, no license activated or the application failed to start).")
+        return 0
+    status = "OK" if first_frame <= TARGET_FIRST_FRAME_MS else "OVER TARGET"
+    print(f"{first_frame:.0f} ms (target {TARGET_FIRST_FRAME_MS} ms) {status}")
+    return 0 if first_frame <= TARGET_FIRST_FRAME_MS else 1
+
+
+def _parse_importtime(stderr: str) -> list[dict]:
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            entries.append({
+                "module": name.strip(),
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+            })
+        except ValueError:
+            continue
+    return entries
@@ -1,4 +1,6 @@
 import hashlib
+import hmac
+import json
 import platform
 import subprocess
 import uuid
@@ -6,9 +8,15 @@ import re
 
 
 _cached_machine_code = None
+_INTERNAL_SALT = "B7-A1-C9-D4"
+# Records of an earlier format may hold a code derived differently: recompute them.
+_RECORD_VERSION = 2
+
 
 def get_cpu_id():
     """Get CPU identifier based on platform"""
+    # Machine codes (and the license keys issued for them) derive from these
+    # exact commands and fallbacks: do not change what they return.
     try:
         if platform.system() == "Windows":
             result = subprocess.run(['wmic', 'cpu', 'get', 'ProcessorId'], capture_output=True, text=True, shell=True)
@@ -50,6 +58,55 @@ def generate_machine_code():
     return _cached_machine_code
 
 
+def stable_inputs():
+    """Digest of identifiers that are cheap to read (no subprocess).
+
+    Used to check that a persisted machine code still belongs to this machine.
+    """
+    parts = [platform.system(), platform.machine(), platform.node(), str(uuid.getnode())]
+    if platform.system() == "Windows":
+        try:
+            import winreg
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Cryptography") as key:
+                parts.append(winreg.QueryValueEx(key, "MachineGuid")[0])
+        except Exception:
+            pass
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+def make_fingerprint_record(machine_code, inputs=None):
+    """Serialize a machine code with an HMAC binding it to the stable inputs."""
+    inputs = inputs or stable_inputs()
+    return json.dumps({
+        "v": _RECORD_VERSION, "code": machine_code, "inputs": inputs,
+        "sig": _record_signature(machine_code, inputs),
+    })
+
+
+def read_fingerprint_record(record, inputs=None):
+    """Return the machine code stored in ``record`` if it is authentic and matches this machine."""
+    if not record:
+        return None
+    try:
+        data = json.loads(record)
+        code, stored_inputs, sig = data["code"], data["inputs"], data["sig"]
+    except Exception:
+        return None
+    if data.get("v") != _RECORD_VERSION:
+        return None
+    inputs = inputs or stable_inputs()
+    if stored_inputs != inputs:
+        return None
+    if not hmac.compare_digest(sig, _record_signature(code, inputs)):
+        return None
+    return code
+
+
+def _record_signature(machine_code, inputs):
+    key = hashlib.sha256((_INTERNAL_SALT + inputs).encode()).digest()
+    return hmac.new(key, machine_code.encode(), hashlib.sha256).hexdigest()
+
+
 def verify_activation_key(machine_code, activation_key, secret_phrase):
     """Verify if the activation key matches the current machine"""
     expected_key = generate_activation_key(machine_code, secret_phrase)
@@ -64,8 +121,7 @@ def generate_activation_key(machine_code, secret_phrase):
         return ""
         
     # Adding an internal salt for extra security
-    internal_salt = "B7-A1-C9-D4"
-    combined = clean_code + secret_phrase + internal_salt
+    combined = clean_code + secret_phrase + _INTERNAL_SALT
     hashed = hashlib.sha256(combined.encode()).hexdigest()
     formatted_key = "{0}-{1}-{2}-{3}-{4}".format(
         hashed[:4].upper(), 
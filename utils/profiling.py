@@ -0,0 +1,262 @@
+"""Opt-in timing spans, JSONL timing log and cProfile dumps.
+
+Disabled by default. Enable with ``SQLGEN_PROFILE=1`` in the environment or
+at runtime via ``set_enabled(True)`` (menu "Aide > Mode diagnostic").
+``SQLGEN_TRACEMALLOC=1`` additionally records memory per span and dumps
+tracemalloc snapshots at generation stages.
+Output goes to ``%APPDATA%/SQL_GENERATOR/profiling`` unless
+``SQLGEN_PROFILE_DIR`` is set.
+"""
+from __future__ import annotations
+
+import cProfile
+import functools
+import glob
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+ENV_FLAG = "SQLGEN_PROFILE"
+ENV_DIR = "SQLGEN_PROFILE_DIR"
+ENV_MEMORY = "SQLGEN_TRACEMALLOC"
+TIMINGS_FILE = "timings.jsonl"
+MAX_PROFILE_DUMPS = 50
+MAX_SNAPSHOTS = 20
+_FLUSH_EVERY = 500
+
+_TRUTHY = ("1", "true", "yes", "on")
+_enabled = os.getenv(ENV_FLAG, "").strip().lower() in _TRUTHY
+_memory = False
+_lock = threading.Lock()
+_local = threading.local()
+_pending: list[str] = []
+_listeners: list = []
+_last_durations: dict[str, float] = {}
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(value: bool) -> None:
+    global _enabled
+    _enabled = bool(value)
+    if not _enabled:
+        flush()
+
+
+def is_memory_tracing() -> bool:
+    return _memory
+
+
+def set_memory_tracing(value: bool) -> None:
+    """Toggle tracemalloc accounting. Implies ``set_enabled(True)`` when turned on."""
+    global _memory
+    _memory = bool(value)
+    if _memory:
+        set_enabled(True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+    elif tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def output_dir() -> str:
+    path = os.getenv(ENV_DIR)
+    if not path:
+        base = os.getenv("APPDATA") or os.path.expanduser("~")
+        path = os.path.join(base, "SQL_GENERATOR", "profiling")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def add_listener(callback) -> None:
+    """Register ``callback(name, duration_ms, parent)``, called after each finished span."""
+    if callback not in _listeners:
+        _listeners.append(callback)
+
+
+def remove_listener(callback) -> None:
+    if callback in _listeners:
+        _listeners.remove(callback)
+
+
+def last_duration_ms(name: str) -> float | None:
+    return _last_durations.get(name)
+
+
+class _Span:
+    __slots__ = ("name", "attrs", "profile", "snapshot", "_start", "_parent", "_profiler", "_mem_start")
+
+    def __init__(self, name: str, attrs: dict, profile: bool, snapshot: bool = False) -> None:
+        self.name = name
+        self.attrs = attrs
+        self.profile = profile
+        self.snapshot = snapshot
+        self._profiler = None
+        self._mem_start = None
+
+    def __enter__(self) -> "_Span":
+        stack = _stack()
+        self._parent = stack[-1] if stack else None
+        stack.append(self.name)
+        # cProfile cannot nest, so only the outermost profiled span records.
+        if self.profile and not getattr(_local, "profiling", False):
+            self._profiler = cProfile.Profile()
+            _local.profiling = True
+            self._profiler.enable()
+        if _memory and tracemalloc.is_tracing():
+            # Peak is process-wide, so only the outermost span resets it.
+            if self._parent is None:
+                tracemalloc.reset_peak()
+            self._mem_start = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        elapsed_ms = (time.perf_counter() - self._start) * 1000
+        if self._profiler is not None:
+            self._profiler.disable()
+            _local.profiling = False
+            _dump_profile(self.name, self._profiler)
+        attrs = self.attrs
+        if self._mem_start is not None and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            attrs = dict(attrs, mem_delta_kb=round((current - self._mem_start) / 1024, 1))
+            if self._parent is None:
+                attrs["mem_peak_kb"] = round((peak - self._mem_start) / 1024, 1)
+            if self.snapshot:
+                attrs["top_allocations"] = _dump_snapshot(self.name)
+        stack = _stack()
+        stack.pop()
+        _record(self.name, elapsed_ms, self._parent, attrs, failed=exc_type is not None)
+        if not stack:
+            flush()
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str, profile: bool = False, snapshot: bool = False, **attrs):
+    """Context manager timing a block. Costs a single flag check when disabled.
+
+    ``profile`` writes a cProfile dump, ``snapshot`` a tracemalloc snapshot
+    (memory tracing only).
+    """
+    if not _enabled:
+        return _NOOP
+    return _Span(name, attrs, profile, snapshot)
+
+
+def timed(name: str | None = None, profile: bool = False, snapshot: bool = False):
+    """Decorator variant of ``span``; defaults to the function's qualified name."""
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(span_name, {}, profile, snapshot):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def flush() -> None:
+    """Append buffered timing records to the JSONL log."""
+    with _lock:
+        if not _pending:
+            return
+        lines = "".join(_pending)
+        _pending.clear()
+    try:
+        with open(os.path.join(output_dir(), TIMINGS_FILE), "a", encoding="utf-8") as f:
+            f.write(lines)
+    except Exception as e:
+        print(f"WARN: Failed to write timing log: {e}")
+
+
+def _stack() -> list[str]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _record(name: str, elapsed_ms: float, parent: str | None, attrs: dict, failed: bool) -> None:
+    entry = {
+        "ts": round(time.time(), 3),
+        "name": name,
+        "ms": round(elapsed_ms, 3),
+        "parent": parent,
+        "thread": threading.current_thread().name,
+    }
+    if failed:
+        entry["error"] = True
+    if attrs:
+        entry.update(attrs)
+    line = json.dumps(entry, ensure_ascii=False) + "\n"
+    with _lock:
+        _pending.append(line)
+        _last_durations[name] = elapsed_ms
+        should_flush = len(_pending) >= _FLUSH_EVERY
+    if should_flush:
+        flush()
+    for callback in list(_listeners):
+        try:
+            callback(name, elapsed_ms, parent)
+        except Exception:
+            pass
+
+
+def _dump_profile(name: str, profiler: cProfile.Profile) -> None:
+    try:
+        directory = output_dir()
+        profiler.dump_stats(os.path.join(directory, f"{name}-{_stamp()}.prof"))
+        _prune(directory, "*.prof", MAX_PROFILE_DUMPS)
+    except Exception as e:
+        print(f"WARN: Failed to write profile dump: {e}")
+
+
+def _dump_snapshot(name: str, top: int = 5) -> list[str]:
+    """Dump a tracemalloc snapshot and return its largest allocation sites."""
+    try:
+        snapshot = tracemalloc.take_snapshot()
+        directory = output_dir()
+        snapshot.dump(os.path.join(directory, f"{name}-{_stamp()}.snapshot"))
+        _prune(directory, "*.snapshot", MAX_SNAPSHOTS)
+        return [str(stat) for stat in snapshot.statistics("lineno")[:top]]
+    except Exception as e:
+        print(f"WARN: Failed to write memory snapshot: {e}")
+        return []
+
+
+def _stamp() -> str:
+    return time.strftime("%Y%m%d-%H%M%S") + f"-{int(time.time() * 1000) % 1000:03d}"
+
+
+def _prune(directory: str, pattern: str, keep: int) -> None:
+    # Keep the directory bounded: drop the oldest files.
+    files = sorted(glob.glob(os.path.join(directory, pattern)), key=os.path.getmtime)
+    for old in files[:-keep]:
+        os.remove(old)
+
+
+if os.getenv(ENV_MEMORY, "").strip().lower() in _TRUTHY:
+    set_memory_tracing(True)
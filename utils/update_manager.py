@@ -1,6 +1,4 @@
-import urllib.request
 import json
-import webbrowser
 import threading
 from tkinter import messagebox
 
@@ -14,6 +12,9 @@ def check_for_updates(current_version):
     thread.start()
 
 def _perform_check(current_version):
+    # Imported here: urllib/http.client are only needed once the check runs
+    import urllib.request
+    import webbrowser
     try:
         # Request with a User-Agent to avoid being blocked by some servers
         req = urllib.request.Request(